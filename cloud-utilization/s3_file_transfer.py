@@ -17,6 +17,10 @@ S3 호환 스토리지와 로컬 파일 시스템 간 파일 업로드/다운로
    $ python s3_file_transfer.py upload --local-path ./workers \
        --s3-path project/output \
        --folders folder1 folder2 folder3
+   
+   # 8개 워커로 동시 업로드
+   $ python s3_file_transfer.py upload --local-path ./my_folder --s3-path my-project/data \
+       --workers 8
 
 2. 다운로드 (Download)
    
@@ -25,14 +29,67 @@ S3 호환 스토리지와 로컬 파일 시스템 간 파일 업로드/다운로
    
    # 특정 파일만 다운로드
    $ python s3_file_transfer.py download --s3-path my-project/data/file.txt --local-path ./downloads
+   
+   # 목록 조회와 다운로드를 겹쳐서 16개 워커로 다운로드
+   $ python s3_file_transfer.py download --s3-path my-project/data --local-path ./downloads \
+       --workers 16
+
+   # 작은 매니페스트는 tar 샤드로 묶어서 업로드 (다운로드 시 자동으로 풀림)
+   $ python s3_file_transfer.py upload --local-path ./my_folder --s3-path my-project/data \
+       --pack-small-files --pack-threshold 64KB --shard-size 64MB
+   
+   # 계획만 만들어 확인하고(dry-run) 나중에 실행 (큰 파일부터 전송)
+   $ python s3_file_transfer.py upload --local-path ./my_folder --s3-path my-project/data \
+       --order largest --plan-file plan.jsonl --dry-run
+   $ python s3_file_transfer.py execute-plan --plan plan.jsonl --workers 8
+   
+   # 다른 upload_* 폴더에 이미 올린 같은 파일은 업로드 대신 서버 측 복사
+   $ python s3_file_transfer.py upload --local-path ./workers --s3-path project/output \
+       --folders upload_20250102_001 --dedup-index transfer_results/dedup.db
+   
+   # 업로드 후 무결성 검증 (멀티파트 ETag를 로컬에서 계산해 비교)
+   $ python s3_file_transfer.py upload --local-path ./my_folder --s3-path my-project/data --verify
+   
+   # 이미 업로드된 폴더 검증 (업로드 때와 같은 파트 크기 설정 사용)
+   $ python s3_file_transfer.py verify --local-path ./my_folder --s3-path my-project/data \
+       --multipart-chunksize 64MB
+   
+   # 중단되어도 이어서 진행할 수 있도록 저널 기록 (같은 명령으로 재실행하면 이어서 진행)
+   $ python s3_file_transfer.py upload --local-path ./my_folder --s3-path my-project/data --resume
 
-3. 목록 조회 (List)
+   # 서버 측 복사/이동 (데이터가 로컬을 거치지 않음, 이동은 원본을 1000개씩 묶어 삭제)
+   $ python s3_file_transfer.py copy --s3-path project/uploads/20250106 --dest-path archive/20250106 \
+       --workers 16
+   $ python s3_file_transfer.py move --s3-path project/uploads/20250106 --dest-path archive/20250106 \
+       --workers 16
+
+   # S3 경로 아래 객체 일괄 삭제 (delete_objects로 1000개씩, 워커 수만큼 동시에)
+   $ python s3_file_transfer.py delete --s3-path my-project/stale --dry-run
+   $ python s3_file_transfer.py delete --s3-path my-project/stale --workers 8
+
+3. 증분 동기화 (Sync)
+   
+   # 새로 생겼거나 변경된 파일만 업로드
+   $ python s3_file_transfer.py sync --local-path ./my_folder --s3-path my-project/data
+   
+   # S3에서 변경된 파일만 다운로드 (크기가 같으면 ETag로 비교)
+   $ python s3_file_transfer.py sync --direction download --checksum \
+       --s3-path my-project/data --local-path ./downloads
+
+   # 로컬과 똑같이 맞추기 (로컬에 없는 S3 객체 삭제, 먼저 --dry-run으로 확인 권장)
+   $ python s3_file_transfer.py sync --local-path ./my_folder --s3-path my-project/data --delete
+
+4. 목록 조회 (List)
    
    # S3 경로의 파일/폴더 목록 출력
    $ python s3_file_transfer.py list --s3-path my-project/data
    
    # 재귀적으로 모든 파일 출력
    $ python s3_file_transfer.py list --s3-path my-project/data --recursive
+   
+   # 기계 판독용 목록 (JSON Lines / CSV, 객체 수와 관계없이 일정한 메모리)
+   $ python s3_file_transfer.py list --s3-path my-project/data --recursive --format jsonl > objects.jsonl
+   $ python s3_file_transfer.py list --s3-path my-project/data --recursive --format csv --output objects.csv
 
 설정 (Configuration)
 --------------------
@@ -57,10 +114,67 @@ Naver Cloud Platform 사용 시:
   --endpoint-url URL    S3 엔드포인트 (환경변수로 설정 권장)
   --region REGION       리전 이름 (기본값: us-east-1)
   --bucket BUCKET       버킷 이름 (환경변수로 설정 권장)
-  --local-path PATH     로컬 파일/폴더 경로
+  --local-path PATH     로컬 파일/폴더 경로 (-이면 upload는 표준 입력, download는 표준 출력)
   --s3-path PATH        S3 경로 (버킷 내 경로)
-  --folders NAMES       선택적 업로드할 폴더명 (공백으로 구분)
+  --folders NAMES       선택적 업로드할 폴더명 (공백으로 구분, 폴더를 번갈아 가며 함께 업로드)
   --recursive           재귀적으로 모든 파일 처리
+  --workers N           동시 전송 워커(스레드) 수 (기본값: 1)
+  --list-workers N      하위 프리픽스별 동시 목록 조회 스레드 수 (기본값: 1)
+  --fanout-depth N      목록 조회를 나눌 폴더 깊이 (기본값: 1)
+  --cache FILE          인벤토리 캐시(SQLite) 경로. 목록 조회와 dry-run은 유효 시간 내 캐시로 응답
+  --cache-ttl SECONDS   캐시 유효 시간 (기본값: 3600)
+  --refresh-cache       캐시를 무시하고 목록을 다시 조회해 갱신
+  --max-bandwidth SIZE  모든 전송을 합친 초당 최대 바이트 (예: 50MB = 50 MB/s)
+  --max-requests N      모든 스레드를 합친 초당 최대 요청 수 (SlowDown 시 자동 감속/회복)
+  --retry-mode MODE     요청 재시도 모드: standard, adaptive, legacy (기본값: standard)
+  --max-attempts N      요청 하나당 최대 시도 횟수 (기본값: 5)
+  --connect-timeout SEC 연결 타임아웃 (기본값: 60)
+  --read-timeout SEC    읽기 타임아웃 (기본값: 60)
+  --retry-failed N      전송이 끝난 뒤 실패한 파일만 다시 시도할 횟수 (기본값: 1)
+  -v, --verbose         전송한 파일마다 한 줄씩 출력 (기본: 진행 상황 요약 줄만 갱신)
+  --progress-interval SEC  진행 상황(files/s, MB/s, ETA) 갱신 간격 (기본값: 1, 0=표시 안 함)
+  --dest-path PATH      [copy/move] 대상 S3 경로 (원본은 --s3-path)
+  --direction DIR       [sync] 동기화 방향: upload 또는 download
+  --checksum            [sync] 크기가 같으면 MD5/ETag로 변경 여부 비교
+  --delete              [sync] 로컬에 없는 S3 객체 삭제 (upload 방향 미러링)
+  --resume              체크포인트 저널을 기록하고 중단된 작업을 이어서 진행
+  --output-dir DIR      저널 저장 디렉토리 (기본값: transfer_results)
+  --transfer-profile P  멀티파트 전송 프로필: default, large-video, small-files
+  --multipart-threshold SIZE  멀티파트 전송 기준 크기 (예: 64MB)
+  --multipart-chunksize SIZE  멀티파트 파트 크기 (예: 64MB)
+  --max-concurrency N   파일 하나당 동시 파트 전송 수
+  --max-io-queue N      다운로드 시 디스크 쓰기 대기 큐 크기
+  --format FORMAT       [list] 출력 형식: text, jsonl, csv
+  --output FILE         [list] jsonl/csv 결과 파일 (기본값: 표준 출력)
+  --adaptive-chunksize  파일 크기에 따라 파트 크기 자동 선택 (10,000 파트 제한 준수)
+  --ranged-threshold SIZE  이 크기 이상 객체는 바이트 범위 병렬 다운로드 (기본값: 1GB, 0=사용 안 함)
+  --metrics-json FILE   객체별 전송 시간/첫 바이트 지연/처리량 지표를 JSON으로 저장
+  --prometheus-textfile FILE  Prometheus textfile collector 형식(.prom)으로 지표 저장
+  --order ORDER         [upload/execute-plan] 전송 순서: scan, largest, smallest (기본값: scan)
+  --plan-file FILE      [upload] 전송 계획(키, 크기, 수정 시각, 동작)을 파일로 저장
+  --plan FILE           [execute-plan] 실행할 전송 계획 파일
+  --verify              [upload/execute-plan] 업로드 후 로컬 계산 ETag(멀티파트 포함)와 S3 ETag 비교
+  --dedup-index FILE    [upload/sync] 중복 제거 인덱스(SQLite). 같은 내용이 이미 있으면 업로드 대신 서버 측 복사
+  --dedup-min-size SIZE [upload/sync] 중복 확인할 최소 파일 크기 (기본값: 1MB)
+  --compress CODEC      [upload/sync/watch] 조건에 맞는 파일을 gzip 또는 zstd(zstandard 필요)로 압축해서 업로드
+  --compress-ext EXTS   압축할 확장자, 쉼표로 구분 (기본값: .json,.jsonl)
+  --compress-min-size SIZE  이보다 작은 파일은 압축 안 함 (기본값: 4KB)
+  --pack-small-files    [upload] 작은 파일을 tar 샤드로 묶어서 업로드 (_packed/ 아래)
+  --pack-threshold SIZE [upload] 묶을 파일 크기 기준 (기본값: 64KB)
+  --shard-size SIZE     [upload] tar 샤드 최대 크기 (기본값: 64MB)
+  --no-unpack           [download] tar 샤드를 풀지 않고 그대로 다운로드
+  --shard-index I       [upload/download/sync] 이 호스트가 맡을 샤드 번호 (0부터)
+  --shard-count N       [upload/download/sync] 전체 샤드 수 (키의 MD5 해시로 나눔, 조정 서비스 불필요)
+  --report FILE         [upload/download/sync] merge-reports로 합칠 결과 파일
+  --include GLOB        [download/list] 받을 상대 경로 glob (여러 번 지정 가능, *는 /도 포함)
+  --exclude GLOB        [download/list] 제외할 상대 경로 glob (여러 번 지정 가능)
+  --ext EXTS            [download/list] 받을 확장자, 쉼표로 구분 (예: json,jsonl)
+  --min-size/--max-size SIZE  [download/list] 객체 크기 범위
+  --modified-after/--modified-before DATE  [download/list] LastModified 범위 (예: 2025-01-01)
+  --debounce SEC        [watch] 마지막 파일이 들어온 뒤 업로드까지 기다릴 시간 (기본값: 2)
+  --polling             [watch] inotify 대신 주기적 탐색으로 감시
+  --poll-interval SEC   [watch] 주기적 탐색 간격 (기본값: 5)
+  --state-file FILE     [watch] high-water mark 상태 파일 (기본값: {output-dir}/watch_<작업ID>.json)
   --dry-run             실제 전송 없이 미리보기만 수행
   -h, --help            도움말 출력
 
@@ -88,19 +202,93 @@ $ python s3_file_transfer.py upload \
 # 4. S3 목록 조회
 $ python s3_file_transfer.py list --s3-path project/data --recursive
 
+# 5. 날짜별 폴더가 많은 프리픽스를 폴더 단위로 나눠 동시에 목록 조회 후 다운로드
+$ python s3_file_transfer.py download --s3-path project/uploads --local-path ./restore \
+    --list-workers 16 --workers 16
+
+# 6. 인벤토리 캐시로 반복 목록 조회/dry-run 계획을 즉시 응답 (1시간 유효)
+$ python s3_file_transfer.py list --s3-path project/uploads --recursive --cache s3_inventory.db
+$ python s3_file_transfer.py download --s3-path project/uploads --local-path ./restore \
+    --dry-run --cache s3_inventory.db --cache-ttl 3600
+
+# 7. 주간에는 대역폭 50 MB/s, 초당 200 요청으로 제한해서 업로드
+$ python s3_file_transfer.py upload --local-path ./ingest --s3-path project/uploads \
+    --workers 16 --max-bandwidth 50MB --max-requests 200
+
+# 8. 워커 수/파트 크기 튜닝용 지표 저장 (p50/p95/p99 지연, 초당 MB, 느린 객체)
+$ python s3_file_transfer.py upload --local-path ./videos --s3-path project/videos \
+    --workers 8 --metrics-json metrics.json \
+    --prometheus-textfile /var/lib/node_exporter/textfile/s3_transfer.prom
+
+# 9. 대용량 MP4 업로드 (큰 파트 + 파일 크기별 적응형 파트 크기)
+$ python s3_file_transfer.py upload --local-path ./videos --s3-path project/videos \
+    --transfer-profile large-video --adaptive-chunksize --max-concurrency 32
+
+# 10. 임시 파일 없이 파이프로 업로드/다운로드 (안내 메시지는 stderr로 출력)
+$ tar cf - ./manifests | zstd | python s3_file_transfer.py upload --local-path - \
+    --s3-path project/archive/manifests.tar.zst --multipart-chunksize 64MB
+$ python s3_file_transfer.py download --s3-path project/archive/manifests.tar.zst --local-path - \
+    | zstd -d | tar xf -
+$ python s3_file_transfer.py download --s3-path project/uploads/20250101 --local-path - | ./validate
+
+# 11. JSON 매니페스트를 gzip으로 압축해서 업로드 (다운로드 시 자동으로 풀림, 절감량 출력)
+$ python s3_file_transfer.py upload --local-path ./manifests --s3-path project/manifests \
+    --compress gzip --compress-ext .json,.jsonl --workers 16
+
+# 12. MP4는 빼고 매니페스트 JSON만 받기 (목록 정보로 거르므로 필요 없는 객체는 GET하지 않음)
+$ python s3_file_transfer.py download --s3-path project/uploads --local-path ./analysis \
+    --include "*/manifests/*.json" --modified-after 2025-01-01 --workers 16
+$ python s3_file_transfer.py list --s3-path project/uploads --recursive --ext json --max-size 10MB
+
+# 13. 호스트 4대가 같은 프리픽스를 나눠서 이전 (호스트마다 --shard-index만 다르게)
+host0$ python s3_file_transfer.py download --s3-path project/uploads --local-path /data \
+    --shard-index 0 --shard-count 4 --workers 16
+  ...
+host3$ python s3_file_transfer.py download --s3-path project/uploads --local-path /data \
+    --shard-index 3 --shard-count 4 --workers 16
+$ python s3_file_transfer.py merge-reports transfer_results/report_download_shard*.json
+
+# 14. cron으로 매번 전체를 다시 올리는 대신 폴더를 감시하며 새 파일만 바로 업로드
+$ python s3_file_transfer.py watch --local-path ./ingest --s3-path project/uploads --workers 8
+
 Author: [Your Name]
 License: MIT
 """
 
 import os
 import sys
+import csv
+import json
+import hashlib
+import queue
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
 import boto3
 from botocore.config import Config
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, FIRST_EXCEPTION
 import argparse
+import collections
+import contextlib
+import sqlite3
+import mmap
+import ctypes
+import ctypes.util
+import errno
+import select
+import struct
+import gzip
+import zlib
+import fnmatch
+import socket
 
 try:
     from dotenv import load_dotenv
@@ -108,380 +296,5014 @@ try:
 except ImportError:
     pass  # .env 파일이 없어도 환경변수로 설정 가능
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # zstd 압축은 zstandard 패키지가 설치된 경우에만 사용 가능
 
-class S3FileTransfer:
-    """S3 호환 스토리지와 로컬 파일 시스템 간 파일 전송"""
+
+MB = 1024 * 1024
+GB = 1024 * MB
+
+# 멀티파트 전송 프로필 (TransferConfig 설정)
+#   default:     boto3 기본값
+#   large-video: 수 GB~수십 GB MP4를 고대역폭 링크로 전송
+#   small-files: 작은 매니페스트 위주 (파일 단위 워커 수를 늘려서 사용)
+TRANSFER_PROFILES = {
+    "default": {
+        "multipart_threshold": 8 * MB,
+        "multipart_chunksize": 8 * MB,
+        "max_concurrency": 10,
+        "max_io_queue": 100
+    },
+    "large-video": {
+        "multipart_threshold": 64 * MB,
+        "multipart_chunksize": 64 * MB,
+        "max_concurrency": 16,
+        "max_io_queue": 1000
+    },
+    "small-files": {
+        "multipart_threshold": 64 * MB,
+        "multipart_chunksize": 16 * MB,
+        "max_concurrency": 4,
+        "max_io_queue": 100
+    }
+}
+
+# S3 멀티파트 제한
+MAX_MULTIPART_PARTS = 10000
+MIN_PART_SIZE = 5 * MB
+MAX_PART_SIZE = 5 * GB
+
+# 적응형 파트 크기: 파일을 대략 이 개수의 파트로 나눔
+ADAPTIVE_TARGET_PARTS = 500
+
+# 이 크기 이상인 객체는 바이트 범위를 나눠 병렬로 다운로드 (0이면 사용 안 함)
+DEFAULT_RANGED_THRESHOLD = 1 * GB
+RANGED_WRITE_CHUNK = 1 * MB
+# 스트림 다운로드(표준 출력)에서 한 번에 쓰는 크기
+STREAM_WRITE_CHUNK = 1 * MB
+
+# SlowDown(503) 응답 시 요청 속도 조절 (AIMD: 절반으로 줄이고 천천히 회복)
+SLOWDOWN_BACKOFF_FACTOR = 0.5
+RATE_RECOVERY_STEP = 0.1
+RATE_RECOVERY_INTERVAL = 1.0
+MIN_REQUEST_RATE = 1.0
+
+# 인벤토리 캐시 기본 유효 시간 (초)
+DEFAULT_CACHE_TTL = 3600
+
+# list --format csv 컬럼
+LIST_FIELDS = ["type", "key", "size", "last_modified", "etag"]
+
+# 작은 파일 묶음(tar 샤드) 업로드 설정
+PACK_DIR_NAME = "_packed"
+PACK_INDEX_NAME = "index.json"
+PACK_SHARD_PATTERN = re.compile(r"^shard-\d+\.tar$")
+DEFAULT_PACK_THRESHOLD = 64 * 1024
+DEFAULT_SHARD_SIZE = 64 * MB
+
+# 중복 제거 인덱스를 확인할 최소 파일 크기 (작은 파일은 해시 계산보다 그냥 업로드가 빠름)
+DEFAULT_DEDUP_MIN_SIZE = 1 * MB
+
+# 업로드 시 압축 (Content-Encoding으로 표시하고 다운로드할 때 자동으로 풀기)
+COMPRESSION_CODECS = ("gzip", "zstd")
+COMPRESSION_MAGIC = {"gzip": b"\x1f\x8b", "zstd": b"\x28\xb5\x2f\xfd"}
+DEFAULT_COMPRESS_EXTENSIONS = ".json,.jsonl"
+DEFAULT_COMPRESS_MIN_SIZE = 4 * 1024
+COMPRESS_READ_CHUNK = 1 * MB
+
+# delete_objects 요청 하나에 담을 수 있는 최대 키 수
+DELETE_BATCH_SIZE = 1000
+
+# 업로드 계획의 전송 순서 (scan: 경로순, largest: 큰 파일부터, smallest: 작은 파일부터)
+PLAN_ORDERS = ("scan", "largest", "smallest")
+
+# watch: 마지막 이벤트 후 이 시간(초) 동안 새 파일이 없으면 모아 둔 파일을 업로드
+DEFAULT_WATCH_DEBOUNCE = 2.0
+# 파일이 쉬지 않고 들어와도 이 시간(초)이 지나거나 이 개수가 모이면 업로드
+WATCH_MAX_DELAY = 30.0
+WATCH_MAX_BATCH = 1000
+# inotify를 쓸 수 없을 때 폴더를 다시 탐색하는 간격 (초)
+DEFAULT_WATCH_POLL_INTERVAL = 5.0
+
+# S3 LastModified는 초 단위이므로 수정 시각 비교 시 허용 오차 (초)
+SYNC_MTIME_TOLERANCE = 1.0
+
+# 진행 상황 갱신 간격 (초). 터미널이 아니면(로그 파일 등) 더 긴 간격으로 한 줄씩 출력
+PROGRESS_INTERVAL = 1.0
+PROGRESS_LOG_INTERVAL = 30.0
+
+_print_lock = threading.Lock()
+_status_line = {"active": False}  # 화면에 진행 상황 줄이 떠 있는지 (_print_lock으로 보호)
+_STOP = object()
+
+
+def parse_size(value: str) -> int:
+    """
+    "64MB", "1.5GB", "512K" 같은 크기 문자열을 바이트로 변환 (1 MB = 1024 KB)
+    
+    Args:
+        value: 크기 문자열 (단위 생략 시 바이트)
+        
+    Returns:
+        바이트 수
+    """
+    text = str(value).strip().upper().replace("IB", "").rstrip("B")
+    units = {"K": 1024, "M": MB, "G": GB, "T": 1024 * GB}
+    
+    try:
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(float(text))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"크기 형식이 올바르지 않습니다: {value}")
+
+
+def parse_datetime(value: str) -> datetime:
+    """
+    "2025-01-01", "2025-01-01T09:30" 같은 ISO 형식 날짜를 시간대가 있는 datetime으로 변환
+    
+    시간대가 없으면 로컬 시간으로 봅니다 (S3 LastModified는 UTC).
+    """
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"날짜 형식이 올바르지 않습니다 (예: 2025-01-01, 2025-01-01T09:30): {value}")
+    return parsed if parsed.tzinfo is not None else parsed.astimezone()
+
+
+def parse_extensions(value: str) -> tuple:
+    """"json,.JSONL" 같은 쉼표 구분 확장자 목록을 (".json", ".jsonl")로 변환"""
+    extensions = []
+    for ext in value.split(","):
+        ext = ext.strip().lower()
+        if ext:
+            extensions.append(ext if ext.startswith(".") else f".{ext}")
+    return tuple(extensions)
+
+
+def shard_for_key(s3_key: str, shard_count: int) -> int:
+    """
+    키가 속한 샤드 번호 (0 ~ shard_count-1)
+    
+    Python hash()와 달리 프로세스/호스트와 관계없이 항상 같은 값이 나오도록 MD5를 사용합니다.
+    """
+    digest = hashlib.md5(s3_key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def merge_reports(paths: List[str], output: Optional[str] = None) -> dict:
+    """
+    샤드별 결과 파일(--report)을 합쳐서 전체 결과 출력
+    
+    개수/크기는 더하고, 샤드들은 동시에 실행되므로 소요시간은 가장 오래 걸린 샤드를
+    기준으로 합니다. 빠지거나 중복된 샤드 번호도 함께 알려줍니다.
+    
+    Args:
+        paths: 샤드별 결과 파일 경로
+        output: 합친 결과를 저장할 JSON 파일 (None이면 출력만)
+        
+    Returns:
+        합친 결과
+    """
+    loaded = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            loaded.append((path, json.load(f)))
+    loaded.sort(key=lambda item: item[1].get("shard_index", 0))
+    reports = [report for _, report in loaded]
+    
+    # 가장 많은 파일이 가진 값을 작업 정보로 삼아야 섞여 들어온 파일 쪽을 알려줄 수 있음
+    job = {}
+    for field in ("operation", "bucket", "s3_path", "shard_count"):
+        job[field] = collections.Counter(report.get(field) for report in reports).most_common(1)[0][0]
+        for path, report in loaded:
+            if report.get(field) != job[field]:
+                print(f"⚠️  다른 작업의 결과 파일이 섞여 있습니다 ({field}: {report.get(field)}): {path}")
+    
+    shard_count = job.get("shard_count") or 1
+    seen = collections.Counter(report.get("shard_index", 0) for report in reports)
+    missing = [index for index in range(shard_count) if index not in seen]
+    duplicated = sorted(index for index, count in seen.items() if count > 1)
+    
+    totals = {}
+    for report in reports:
+        for name, value in report.get("result", {}).items():
+            if name != "elapsed_time" and isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals[name] = totals.get(name, 0) + value
+    elapsed = max((report.get("result", {}).get("elapsed_time") or 0) for report in reports)
+    retries = 0
+    backoff_seconds = 0.0
+    errors = collections.Counter()
+    for report in reports:
+        stats = report.get("errors", {})
+        retries += stats.get("retries", 0)
+        backoff_seconds += stats.get("backoff_seconds", 0.0)
+        errors.update(stats.get("errors", {}))
+    
+    print(f"\n{'='*70}")
+    print(f"🧩 샤드 결과 합치기: {job.get('operation')} s3://{job.get('bucket')}/{job.get('s3_path')}")
+    print(f"{'='*70}")
+    for report in reports:
+        result = report.get("result", {})
+        counts = ", ".join(
+            f"{name.replace('_count', '')} {value}"
+            for name, value in result.items() if name.endswith("_count") and value
+        )
+        print(f"   shard {report.get('shard_index', 0)}/{shard_count} ({report.get('host', '?')}): "
+              f"{counts or '0'}, {result.get('total_size', 0) / (1024*1024*1024):.2f} GB, "
+              f"{timedelta(seconds=round(result.get('elapsed_time') or 0))}")
+    
+    print(f"\n📊 합계: " + ", ".join(f"{name} {value}" for name, value in totals.items() if name != "total_size"))
+    print(f"📦 총 크기: {totals.get('total_size', 0) / (1024*1024*1024):.2f} GB")
+    if elapsed:
+        print(f"⏱️  소요시간 (가장 느린 샤드): {timedelta(seconds=round(elapsed))}, "
+              f"전체 {totals.get('total_size', 0) / (1024*1024) / elapsed:.2f} MB/s")
+    if retries or errors:
+        print(f"🔁 요청 재시도: {retries}회 (백오프 대기 {backoff_seconds:.1f}초)")
+    if errors:
+        print(f"   오류 종류: " + ", ".join(f"{name} {count}회" for name, count in errors.most_common()))
+    if missing:
+        print(f"⚠️  결과 파일이 없는 샤드: {', '.join(map(str, missing))}")
+    for index in duplicated:
+        names = ", ".join(path for path, report in loaded if report.get("shard_index", 0) == index)
+        print(f"⚠️  결과 파일이 중복된 샤드 {index}: {names}")
+    print()
+    
+    merged = {
+        "operation": job.get("operation"),
+        "bucket": job.get("bucket"),
+        "s3_path": job.get("s3_path"),
+        "shard_count": shard_count,
+        "shards": [report.get("shard_index", 0) for report in reports],
+        "missing_shards": missing,
+        "duplicated_shards": duplicated,
+        "result": dict(totals, elapsed_time=elapsed),
+        "errors": {
+            "retries": retries,
+            "backoff_seconds": round(backoff_seconds, 3),
+            "errors": dict(errors)
+        }
+    }
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+        print(f"💾 합친 결과 저장: {output}")
+    return merged
+
+
+def run_bounded(func, items, max_in_flight: int):
+    """
+    items 각각에 func를 실행하되 동시에 최대 max_in_flight개만 진행
+    
+    작업을 한꺼번에 제출하지 않고 하나가 끝날 때마다 다음 작업을 제출합니다.
+    하나라도 실패하면 나머지 작업은 제출하지 않고(시작 전인 작업은 취소) 그 예외를
+    그대로 올립니다. 이미 실행 중인 작업은 끝날 때까지 기다립니다.
+    """
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        pending = set()
+        try:
+            for item in items:
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(func, item))
+            done, pending = wait(pending, return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+
+def _log(message: str):
+    """여러 워커 스레드에서 호출해도 줄이 섞이지 않도록 출력"""
+    with _print_lock:
+        _clear_status_line()
+        print(message)
+
+
+def _clear_status_line():
+    """제자리 갱신 중인 진행 상황 줄 지우기 (_print_lock을 잡은 상태에서 호출)"""
+    if _status_line["active"]:
+        sys.stdout.write("\r\033[K")
+        _status_line["active"] = False
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressReporter:
+    """
+    파일마다 한 줄씩 출력하는 대신 일정 간격으로 진행 상황을 요약해서 출력
+    
+    워커 스레드는 카운터만 갱신하고, 출력은 별도 스레드가 interval마다 한 번 합니다.
+    터미널이면 한 줄을 제자리에서 갱신하고, 파일/파이프로 출력 중이면
+    PROGRESS_LOG_INTERVAL마다 한 줄씩 남깁니다. verbose면 파일별 줄도 출력합니다.
+    """
+    
+    def __init__(self, interval: float = PROGRESS_INTERVAL, verbose: bool = False):
+        """
+        Args:
+            interval: 진행 상황 갱신 간격 (초, 0이면 진행 상황을 출력하지 않음)
+            verbose: True면 파일별 결과도 한 줄씩 출력
+        """
+        self.interval = interval
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._reset()
+    
+    def _reset(self):
+        self.started = time.monotonic()
+        self.total_files = 0
+        self.total_bytes = 0
+        self.done_files = 0
+        self.failed_files = 0
+        self.skipped_bytes = 0
+        self.transferred_bytes = 0
+        self.scan_complete = False
+    
+    def start(self):
+        """카운터를 초기화하고 주기적 출력 시작"""
+        with self._lock:
+            self._reset()
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="progress", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """주기적 출력을 멈추고 진행 상황 줄 지우기"""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        with _print_lock:
+            _clear_status_line()
+    
+    def queued(self, nbytes: int):
+        """전송할 파일 하나가 추가됨"""
+        with self._lock:
+            self.total_files += 1
+            self.total_bytes += nbytes
+    
+    def set_total(self, files: int, nbytes: int):
+        """전송 계획으로 전체 개수/크기를 미리 알고 있을 때 지정 (처음부터 ETA 표시)"""
+        with self._lock:
+            self.total_files += files
+            self.total_bytes += nbytes
+        self.scan_complete = True
+    
+    def queue_complete(self):
+        """파일 탐색이 끝나 전체 개수/크기가 확정됨 (이후 ETA 표시)"""
+        self.scan_complete = True
+    
+    def add_bytes(self, nbytes: int):
+        """전송된 바이트 (boto3 Callback)"""
+        with self._lock:
+            self.transferred_bytes += nbytes
+    
+    def finished(self, success: Optional[bool], nbytes: int):
+        """파일 하나 처리 완료 (success가 None이면 건너뜀)"""
+        with self._lock:
+            self.done_files += 1
+            if success is None:
+                self.skipped_bytes += nbytes
+            elif not success:
+                self.failed_files += 1
+    
+    def retrying(self, count: int):
+        """실패한 파일 count개를 다시 시도하므로 완료/실패 집계에서 제외"""
+        with self._lock:
+            self.done_files -= count
+            self.failed_files -= count
+    
+    def item(self, message: str):
+        """파일별 결과 줄 (verbose일 때만 출력)"""
+        if self.verbose:
+            _log(message)
+    
+    def status(self) -> str:
+        """현재 진행 상황 한 줄"""
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-6)
+            speed = self.transferred_bytes / elapsed
+            line = (
+                f"⏳ {self.done_files}/{self.total_files}개"
+                f"{'' if self.scan_complete else '+'}, "
+                f"{self.transferred_bytes / MB:.1f} MB, "
+                f"{self.done_files / elapsed:.1f} files/s, {speed / MB:.2f} MB/s"
+            )
+            if self.failed_files:
+                line += f", 실패 {self.failed_files}개"
+            remaining = self.total_bytes - self.skipped_bytes - self.transferred_bytes
+            if self.scan_complete and speed > 0 and remaining > 0:
+                line += f", ETA {_format_duration(remaining / speed)}"
+        return line
+    
+    def _loop(self):
+        interactive = sys.stdout.isatty()
+        interval = self.interval if interactive else max(self.interval, PROGRESS_LOG_INTERVAL)
+        while not self._stop_event.wait(interval):
+            line = self.status()
+            with _print_lock:
+                if interactive:
+                    sys.stdout.write("\r\033[K" + line)
+                    sys.stdout.flush()
+                    _status_line["active"] = True
+                else:
+                    print(line, flush=True)
+
+
+class WorkerStats:
+    """워커(스레드)별 전송 통계를 스레드 안전하게 집계"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.success_count = 0
+        self.failed_count = 0
+        self.skipped_count = 0
+        self.retried_count = 0
+        self.total_bytes = 0
+        self.per_worker = {}
+    
+    def record(self, success: Optional[bool], nbytes: int, seconds: float):
+        """
+        작업 하나의 결과를 기록
+        
+        Args:
+            success: 성공 여부 (None이면 이미 완료되어 건너뛴 작업)
+            nbytes: 전송한 바이트 수
+            seconds: 작업에 걸린 시간 (초)
+        """
+        name = threading.current_thread().name
+        with self._lock:
+            if success is None:
+                self.skipped_count += 1
+                return
+            worker = self.per_worker.setdefault(
+                name, {"files": 0, "failed": 0, "bytes": 0, "busy": 0.0}
+            )
+            worker["busy"] += seconds
+            if success:
+                worker["files"] += 1
+                worker["bytes"] += nbytes
+                self.success_count += 1
+                self.total_bytes += nbytes
+            else:
+                worker["failed"] += 1
+                self.failed_count += 1
+    
+    def start_retry(self, count: int):
+        """실패한 작업 count개를 다시 시도하므로 실패 집계에서 제외"""
+        with self._lock:
+            self.failed_count -= count
+            self.retried_count += count
+    
+    def print_summary(self):
+        """워커별 처리량 출력"""
+        print(f"👷 워커별 처리량:")
+        for name in sorted(self.per_worker, key=lambda n: (len(n), n)):
+            worker = self.per_worker[name]
+            size_mb = worker["bytes"] / (1024*1024)
+            speed = size_mb / worker["busy"] if worker["busy"] > 0 else 0.0
+            print(
+                f"   {name}: {worker['files']}개 성공 / {worker['failed']}개 실패, "
+                f"{size_mb:.2f} MB, {speed:.2f} MB/s"
+            )
+
+
+class TransferPool:
+    """
+    크기가 제한된 작업 큐를 공유하는 워커 스레드 풀
+    
+    submit()은 큐가 가득 차면 대기하므로 폴더 탐색과 전송이 일정한 메모리로
+    동시에 진행됩니다. num_workers가 1 이하이면 스레드 없이 호출한 스레드에서
+    바로 실행합니다. retry_passes를 지정하면 join() 시 실패한 작업만 모아
+    그 횟수만큼 다시 시도합니다.
+    """
     
     def __init__(
         self,
-        endpoint_url: Optional[str] = None,
-        region: str = "us-east-1",
-        access_key: Optional[str] = None,
-        secret_key: Optional[str] = None,
-        bucket_name: Optional[str] = None
+        handler,
+        num_workers: int = 1,
+        queue_size: Optional[int] = None,
+        retry_passes: int = 0,
+        progress: Optional[ProgressReporter] = None
     ):
         """
         Args:
-            endpoint_url: S3 엔드포인트 URL (AWS S3는 None)
-            region: 리전 이름
-            access_key: Access Key
-            secret_key: Secret Key
-            bucket_name: 버킷 이름
+            handler: 작업 하나를 처리하는 함수. (성공 여부, 바이트 수)를 반환
+            num_workers: 워커 스레드 수
+            queue_size: 대기 작업 큐 크기 (기본값: 워커 수의 4배)
+            retry_passes: 모든 작업이 끝난 뒤 실패한 작업을 다시 시도할 횟수
+            progress: 진행 상황을 집계할 ProgressReporter (join() 시 출력 종료)
         """
-        self.endpoint_url = endpoint_url or os.getenv("S3_ENDPOINT_URL")
-        self.region = region or os.getenv("S3_REGION", "us-east-1")
-        self.bucket_name = bucket_name or os.getenv("S3_BUCKET_NAME")
+        self.handler = handler
+        self.num_workers = max(1, num_workers)
+        self.retry_passes = retry_passes
+        self.progress = progress
+        self.stats = WorkerStats()
+        self._queue = queue.Queue(maxsize=queue_size or self.num_workers * 4)
+        self._threads = []
+        self._failed = []
+        self._failed_lock = threading.Lock()
+        if self.progress is not None:
+            self.progress.start()
+        self._start_workers()
+    
+    def _start_workers(self):
+        if self.num_workers > 1:
+            for i in range(self.num_workers):
+                thread = threading.Thread(
+                    target=self._worker_loop, name=f"worker-{i + 1}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+    
+    def _stop_workers(self):
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+    
+    def submit(self, item, size: Optional[int] = None):
+        """
+        작업 추가 (큐가 가득 차면 빈 자리가 생길 때까지 대기)
         
-        access_key = access_key or os.getenv("S3_ACCESS_KEY")
-        secret_key = secret_key or os.getenv("S3_SECRET_KEY")
+        Args:
+            item: handler에 넘길 작업
+            size: 진행 상황 집계용 작업 크기 (None이면 이미 set_total()로 집계됨)
+        """
+        if self.progress is not None and size is not None:
+            self.progress.queued(size)
+        self._dispatch(item)
+    
+    def _dispatch(self, item):
+        if not self._threads:
+            self._run(item)
+            return
+        self._queue.put(item)
+    
+    def join(self) -> WorkerStats:
+        """남은 작업을 모두 처리하고(실패 작업 재시도 포함) 워커를 종료한 뒤 통계 반환"""
+        if self.progress is not None:
+            self.progress.queue_complete()
+        self._stop_workers()
         
-        if not all([access_key, secret_key, self.bucket_name]):
-            raise ValueError(
-                "S3 설정이 필요합니다. 환경변수 또는 .env 파일에 "
-                "S3_ACCESS_KEY, S3_SECRET_KEY, S3_BUCKET_NAME을 설정하세요."
-            )
+        for attempt in range(1, self.retry_passes + 1):
+            with self._failed_lock:
+                items, self._failed = self._failed, []
+            if not items:
+                break
+            
+            _log(f"\n🔁 실패한 작업 {len(items)}개 다시 시도 ({attempt}/{self.retry_passes})")
+            self.stats.start_retry(len(items))
+            if self.progress is not None:
+                self.progress.retrying(len(items))
+            self._start_workers()
+            for item in items:
+                self._dispatch(item)
+            self._stop_workers()
         
-        # S3 클라이언트 생성
-        client_config = {
-            "service_name": "s3",
-            "region_name": self.region,
-            "aws_access_key_id": access_key,
-            "aws_secret_access_key": secret_key,
-            "config": Config(s3={"addressing_style": "path"})
+        if self.progress is not None:
+            self.progress.stop()
+        return self.stats
+    
+    def _worker_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            self._run(item)
+    
+    def _run(self, item):
+        start = time.monotonic()
+        try:
+            success, nbytes = self.handler(item)
+        except Exception as e:
+            _log(f"   ❌ {e}")
+            success, nbytes = False, 0
+        if success is False and self.retry_passes:
+            with self._failed_lock:
+                self._failed.append(item)
+        self.stats.record(success, nbytes, time.monotonic() - start)
+        if self.progress is not None:
+            self.progress.finished(success, nbytes)
+
+
+class TransferJournal:
+    """
+    전송 진행 상황을 기록하는 추가 전용(append-only) 체크포인트 저널
+    
+    JSON Lines 형식으로 이벤트를 한 줄씩 기록하고 매번 flush하므로 프로세스가
+    중간에 종료되어도 그때까지 완료된 내용은 남습니다. 마지막 줄이 잘린 경우
+    해당 줄만 무시합니다. 완료 기록의 version은 업로드면 로컬 파일의 수정 시각,
+    다운로드면 객체의 ETag입니다.
+    
+    이벤트 형식:
+        {"event": "done", "key": ..., "size": ..., "version": ...}
+        {"event": "mpu_start", "key": ..., "upload_id": ..., "size": ..., "mtime": ..., "part_size": ...}
+        {"event": "part", "key": ..., "upload_id": ..., "part": 번호, "etag": ...}
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 저널 파일 경로 (있으면 이어서 사용)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+        self.completed: Dict[str, tuple] = {}
+        self.multipart: Dict[str, dict] = {}
+        
+        if self.path.exists():
+            self._load()
+    
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                
+                key = record.get("key")
+                event = record.get("event")
+                if event == "done":
+                    self.completed[key] = (record.get("size"), record.get("version"))
+                    self.multipart.pop(key, None)
+                elif event == "mpu_start":
+                    self.multipart[key] = {
+                        "upload_id": record["upload_id"],
+                        "size": record["size"],
+                        "mtime": record.get("mtime"),
+                        "part_size": record["part_size"],
+                        "parts": {}
+                    }
+                elif event == "part":
+                    state = self.multipart.get(key)
+                    if state and state["upload_id"] == record["upload_id"]:
+                        state["parts"][record["part"]] = record["etag"]
+    
+    def _append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+    
+    def is_done(self, key: str, size: int, version) -> bool:
+        """
+        이전 실행에서 같은 크기/버전(수정 시각 또는 ETag)으로 완료된 키인지 확인
+        
+        크기가 같아도 그 뒤에 다시 쓴 파일(객체)은 완료되지 않은 것으로 봅니다.
+        버전이 없는 예전 기록은 다시 전송합니다.
+        """
+        return version is not None and self.completed.get(key) == (size, version)
+    
+    def mark_done(self, key: str, size: int, version):
+        """키 전송 완료 기록 (version: 업로드면 로컬 수정 시각, 다운로드면 ETag)"""
+        self.completed[key] = (size, version)
+        self.multipart.pop(key, None)
+        self._append({"event": "done", "key": key, "size": size, "version": version})
+    
+    def start_multipart(self, key: str, upload_id: str, size: int, mtime: float, part_size: int):
+        """멀티파트 업로드 시작 기록 (이어서 올릴 때 파일이 그대로인지 크기/수정 시각으로 확인)"""
+        self.multipart[key] = {
+            "upload_id": upload_id, "size": size, "mtime": mtime, "part_size": part_size, "parts": {}
         }
+        self._append({
+            "event": "mpu_start", "key": key, "upload_id": upload_id,
+            "size": size, "mtime": mtime, "part_size": part_size
+        })
+    
+    def record_part(self, key: str, upload_id: str, part_number: int, etag: str):
+        """멀티파트 업로드의 파트 하나 완료 기록"""
+        state = self.multipart.get(key)
+        if state and state["upload_id"] == upload_id:
+            state["parts"][part_number] = etag
+        self._append({
+            "event": "part", "key": key, "upload_id": upload_id,
+            "part": part_number, "etag": etag
+        })
+    
+    def close(self, remove: bool = False):
+        """
+        저널 닫기
         
-        if self.endpoint_url:
-            client_config["endpoint_url"] = self.endpoint_url
+        Args:
+            remove: True면 저널 파일 삭제 (모든 전송이 성공한 경우)
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if remove and self.path.exists():
+            self.path.unlink()
+
+
+class TransferPlan:
+    """
+    전송 전에 한 번 탐색해서 만든 업로드 계획 (키, 크기, 수정 시각, 동작)
+    
+    JSON Lines 파일로 저장/불러오기할 수 있어 dry-run으로 계획을 확인한 뒤
+    execute-plan으로 나중에 그대로 실행할 수 있습니다. 첫 줄은 로컬/S3 경로 등
+    계획 정보이고, 이후 한 줄에 항목 하나씩 기록합니다.
+    
+    항목 형식:
+        {"action": "upload" | "pack", "key": ..., "path": 상대경로, "size": ..., "mtime": ...}
+    """
+    
+    def __init__(
+        self,
+        local_root: str,
+        s3_prefix: str,
+        entries: Optional[List[dict]] = None,
+        order: str = "scan",
+        pack_threshold: Optional[int] = None
+    ):
+        """
+        Args:
+            local_root: 로컬 폴더 경로
+            s3_prefix: 업로드할 S3 경로
+            entries: 계획 항목 목록
+            order: 전송 순서 (scan, largest, smallest)
+            pack_threshold: 계획을 만들 때 사용한 tar 샤드 기준 크기
+        """
+        self.local_root = local_root
+        self.s3_prefix = s3_prefix
+        self.entries = entries or []
+        self.order = order
+        self.pack_threshold = pack_threshold
+    
+    @property
+    def total_files(self) -> int:
+        return len(self.entries)
+    
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry["size"] for entry in self.entries)
+    
+    def sort(self, order: str):
+        """
+        전송 순서 정렬
         
-        self.s3 = boto3.client(**client_config)
+        largest는 큰 파일부터 시작해 마지막에 큰 파일 하나만 남아 늦어지는 것을 줄이고,
+        smallest는 작은 파일을 먼저 끝내 완료 개수를 빨리 늘립니다.
+        tar 샤드에 묶는 항목은 샤드 구성이 바뀌지 않도록 경로 순서를 유지합니다.
+        """
+        sign = {"largest": -1, "smallest": 1}.get(order, 0)
         
-        print(f"🔗 S3 연결:")
-        if self.endpoint_url:
-            print(f"   Endpoint: {self.endpoint_url}")
-        print(f"   Region: {self.region}")
-        print(f"   Bucket: {self.bucket_name}\n")
+        def sort_key(entry: dict):
+            if entry["action"] != "upload":
+                return (1, 0, entry["path"])
+            return (0, sign * entry["size"], entry["path"])
+        
+        self.entries.sort(key=sort_key)
+        self.order = order
+    
+    def local_path(self, entry: dict) -> str:
+        """항목의 로컬 파일 경로"""
+        return os.path.join(self.local_root, *entry["path"].split("/"))
+    
+    def refresh(self) -> tuple:
+        """
+        실행 직전에 항목마다 파일 크기/수정 시각을 다시 조회해서 계획과 맞추기
+        
+        계획 이후 바뀐 항목은 새 크기/수정 시각으로 고치고(tar 샤드 기준 크기를 넘으면
+        upload 항목으로 바꿈), 사라진 파일은 계획에서 뺍니다.
+        
+        Returns:
+            (바뀐 항목 수, 사라진 항목 목록)
+        """
+        changed = 0
+        entries = []
+        missing = []
+        for entry in self.entries:
+            try:
+                stat = os.stat(self.local_path(entry))
+            except FileNotFoundError:
+                missing.append(entry)
+                continue
+            if stat.st_size != entry["size"] or stat.st_mtime != entry["mtime"]:
+                entry["size"], entry["mtime"] = stat.st_size, stat.st_mtime
+                if entry["action"] == "pack" and stat.st_size >= (self.pack_threshold or 0):
+                    entry["action"] = "upload"
+                changed += 1
+            entries.append(entry)
+        
+        self.entries = entries
+        if changed:
+            self.sort(self.order)
+        return changed, missing
+    
+    def save(self, path: str):
+        """계획을 JSON Lines 파일로 저장"""
+        header = {
+            "plan": 1,
+            "local_root": os.path.abspath(self.local_root),
+            "s3_prefix": self.s3_prefix,
+            "order": self.order,
+            "pack_threshold": self.pack_threshold,
+            "total_files": self.total_files,
+            "total_bytes": self.total_bytes,
+            "created_at": datetime.now().isoformat()
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    
+    @classmethod
+    def load(cls, path: str) -> "TransferPlan":
+        """저장된 계획 파일 읽기"""
+        with open(path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get("plan") != 1:
+                raise ValueError(f"전송 계획 파일이 아닙니다: {path}")
+            entries = [json.loads(line) for line in f if line.strip()]
+        return cls(
+            header["local_root"], header["s3_prefix"], entries,
+            header.get("order", "scan"), header.get("pack_threshold")
+        )
+    
+    def print_plan(self):
+        """계획 항목 출력"""
+        for entry in self.entries:
+            print(f"   {entry['action']:<6} {entry['size'] / (1024*1024):>10.2f} MB  {entry['key']}")
+
+
+class TarShardPacker:
+    """
+    작은 파일들을 tar 샤드로 묶어 업로드 작업으로 넘겨주는 클래스
+    
+    파일은 임시 디렉토리의 tar 파일에 바로 기록되므로 메모리 사용량은 일정하며,
+    샤드가 shard_size를 넘으면 닫아서 TransferPool에 일반 업로드 작업으로
+    제출합니다. 마지막에 어떤 파일이 어느 샤드에 들어 있는지 기록한 JSON 인덱스를
+    {s3_base_path}/_packed/index.json으로 업로드합니다.
+    """
+    
+    def __init__(self, pool: TransferPool, s3_base_path: str, shard_size: int, work_dir: str, dry_run: bool = False):
+        """
+        Args:
+            pool: 샤드 업로드 작업을 제출할 TransferPool
+            s3_base_path: S3 기본 경로 (샤드는 {s3_base_path}/_packed/ 아래에 저장)
+            shard_size: 샤드 하나의 최대 크기 (바이트)
+            work_dir: 샤드 임시 파일을 만들 디렉토리
+            dry_run: True면 샤드를 만들지 않고 구성만 출력
+        """
+        self.pool = pool
+        self.s3_pack_path = f"{s3_base_path}/{PACK_DIR_NAME}"
+        self.shard_size = shard_size
+        self.work_dir = work_dir
+        self.dry_run = dry_run
+        self.shards = []
+        self.packed_count = 0
+        self._tar = None
+        self._current = None
+    
+    def add(self, local_path: str, relative_path: str, file_size: int):
+        """파일 하나를 현재 샤드에 추가 (샤드가 가득 차면 업로드 제출)"""
+        if self._current is None:
+            index = len(self.shards)
+            self._current = {
+                "key": f"{self.s3_pack_path}/shard-{index:05d}.tar",
+                "path": os.path.join(self.work_dir, f"shard-{index:05d}.tar"),
+                "size": 0,
+                "files": []
+            }
+            if not self.dry_run:
+                self._tar = tarfile.open(self._current["path"], "w")
+        
+        arcname = relative_path.replace(os.sep, "/")
+        if self._tar is not None:
+            self._tar.add(local_path, arcname=arcname, recursive=False)
+        self._current["files"].append({"path": arcname, "size": file_size})
+        # tar 헤더(512바이트)와 블록 패딩을 포함한 대략적인 크기
+        self._current["size"] += 512 + -(-file_size // 512) * 512
+        self.packed_count += 1
+        
+        if self._current["size"] >= self.shard_size:
+            self.flush()
+    
+    def flush(self):
+        """현재 샤드를 닫고 업로드 작업으로 제출"""
+        if self._current is None:
+            return
+        
+        shard = self._current
+        self._current = None
+        self.shards.append(shard)
+        
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+            shard["size"] = os.path.getsize(shard["path"])
+            self.pool.submit((shard["path"], shard["key"], shard["size"]), shard["size"])
+        else:
+            _log(f"   [DRY-RUN] 작은 파일 {len(shard['files'])}개 -> {shard['key']}")
+    
+    def finish(self, transfer: "S3FileTransfer"):
+        """
+        남은 샤드를 제출하고 인덱스 업로드
+        
+        pool.join() 이후에 호출해야 인덱스가 샤드보다 나중에 올라갑니다.
+        """
+        if not self.shards or self.dry_run:
+            return
+        
+        index = {
+            "version": 1,
+            "created_at": datetime.now().isoformat(),
+            "shards": [
+                {"key": shard["key"], "size": shard["size"], "files": shard["files"]}
+                for shard in self.shards
+            ]
+        }
+        transfer.s3.put_object(
+            Bucket=transfer.bucket_name,
+            Key=f"{self.s3_pack_path}/{PACK_INDEX_NAME}",
+            Body=json.dumps(index, ensure_ascii=False).encode('utf-8'),
+            ContentType="application/json"
+        )
+
+
+class InventoryCache:
+    """
+    S3 목록(키, 크기, ETag, LastModified)을 로컬 SQLite에 저장하는 인벤토리 캐시
+    
+    프리픽스 단위로 갱신 시각을 기록하므로 목록을 다시 조회한 프리픽스만
+    갱신됩니다. 조회한 프리픽스 또는 그 상위 프리픽스가 TTL 안에 갱신되었으면
+    S3에 요청하지 않고 캐시에서 바로 답합니다.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite 파일 경로
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS objects (
+                bucket TEXT NOT NULL,
+                key TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified REAL NOT NULL,
+                PRIMARY KEY (bucket, key)
+            );
+            CREATE TABLE IF NOT EXISTS prefixes (
+                bucket TEXT NOT NULL,
+                prefix TEXT NOT NULL,
+                refreshed_at REAL NOT NULL,
+                PRIMARY KEY (bucket, prefix)
+            );
+            CREATE INDEX IF NOT EXISTS objects_etag ON objects (bucket, etag);
+            CREATE TEMP TABLE staging (
+                token INTEGER NOT NULL,
+                bucket TEXT NOT NULL,
+                key TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified REAL NOT NULL
+            );
+            CREATE INDEX temp.staging_token ON staging (token);
+        """)
+        # record() 호출마다 staging 항목을 구분하는 번호
+        self._last_token = 0
+    
+    @staticmethod
+    def _key_range(prefix: str) -> tuple:
+        """프리픽스로 시작하는 키의 범위 [lower, upper) (인덱스를 타도록 범위 조건 사용)"""
+        if not prefix:
+            return "", None
+        return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    
+    def is_fresh(self, bucket: str, prefix: str, ttl: float) -> bool:
+        """프리픽스(또는 상위 프리픽스)가 ttl초 안에 갱신되었는지 확인"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT prefix, refreshed_at FROM prefixes WHERE bucket = ?", (bucket,)
+            ).fetchall()
+        now = time.time()
+        return any(prefix.startswith(p) and now - refreshed_at <= ttl for p, refreshed_at in rows)
+    
+    def iter_objects(self, bucket: str, prefix: str):
+        """
+        캐시에서 프리픽스 아래 객체를 키 순서로 반환 (list_objects_v2 Contents 형식)
+        
+        1000개씩 나눠 읽으므로 프리픽스가 커도 메모리 사용량은 일정합니다.
+        """
+        lower, upper = self._key_range(prefix)
+        query = "SELECT key, size, etag, last_modified FROM objects WHERE bucket = ? AND key >= ?"
+        params = [bucket, lower]
+        if upper is not None:
+            query += " AND key < ?"
+            params.append(upper)
+        
+        with self._lock:
+            cursor = self._conn.execute(query + " ORDER BY key", params)
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for key, size, etag, last_modified in rows:
+                    yield {
+                        "Key": key,
+                        "Size": size,
+                        "ETag": etag,
+                        "LastModified": datetime.fromtimestamp(last_modified, timezone.utc)
+                    }
+        finally:
+            with self._lock:
+                cursor.close()
+    
+    def iter_children(self, bucket: str, prefix: str):
+        """캐시에서 Delimiter='/' 목록 조회를 흉내내어 바로 아래 폴더와 파일 반환"""
+        last_folder = None
+        for obj in self.iter_objects(bucket, prefix):
+            rest = obj["Key"][len(prefix):]
+            if "/" in rest:
+                folder = prefix + rest.split("/", 1)[0] + "/"
+                if folder != last_folder:
+                    last_folder = folder
+                    yield "folder", {"Prefix": folder}
+            else:
+                yield "file", obj
+    
+    def record(self, bucket: str, prefix: str, objects):
+        """
+        실제 목록 조회 결과를 그대로 반환하면서 캐시에 기록
+        
+        조회하는 동안에는 항목을 임시 테이블(staging)에 1000개씩 넣고 바로 커밋하므로
+        호출한 쪽이 목록을 천천히 소비해도 트랜잭션이나 파일 잠금을 잡고 있지 않습니다.
+        끝까지 조회된 경우에만 짧은 트랜잭션 하나로 프리픽스의 기존 항목을 교체하고
+        갱신 시각을 남깁니다. 중간에 멈추면 캐시는 바뀌지 않습니다.
+        """
+        lower, upper = self._key_range(prefix)
+        with self._lock:
+            self._last_token += 1
+            token = self._last_token
+        batch = []
+        
+        completed = False
+        try:
+            for obj in objects:
+                batch.append((
+                    token, bucket, obj["Key"], obj["Size"], obj.get("ETag"),
+                    obj["LastModified"].timestamp()
+                ))
+                if len(batch) >= 1000:
+                    self._stage(batch)
+                    batch = []
+                yield obj
+            self._stage(batch)
+            completed = True
+        finally:
+            with self._lock:
+                if completed:
+                    if upper is None:
+                        self._conn.execute("DELETE FROM objects WHERE bucket = ?", (bucket,))
+                    else:
+                        self._conn.execute(
+                            "DELETE FROM objects WHERE bucket = ? AND key >= ? AND key < ?",
+                            (bucket, lower, upper)
+                        )
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO objects "
+                        "SELECT bucket, key, size, etag, last_modified FROM staging WHERE token = ?",
+                        (token,)
+                    )
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO prefixes VALUES (?, ?, ?)",
+                        (bucket, prefix, time.time())
+                    )
+                    self._conn.commit()
+                self._conn.execute("DELETE FROM staging WHERE token = ?", (token,))
+                self._conn.commit()
+    
+    def _stage(self, batch: list):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO staging VALUES (?, ?, ?, ?, ?, ?)", batch
+            )
+            self._conn.commit()
+    
+    def find_by_etag(self, bucket: str, etag: str, size: int) -> Optional[str]:
+        """ETag와 크기가 같은 객체의 키 (중복 업로드 확인용, 없으면 None)"""
+        etag = etag.strip('"')
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key FROM objects WHERE bucket = ? AND etag IN (?, ?) AND size = ? LIMIT 1",
+                (bucket, etag, f'"{etag}"', size)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def invalidate(self, bucket: str, prefix: str):
+        """프리픽스와 겹치는 갱신 기록을 지워 다음 조회 때 다시 목록을 받도록 함"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT prefix FROM prefixes WHERE bucket = ?", (bucket,)
+            ).fetchall()
+            for (cached_prefix,) in rows:
+                if cached_prefix.startswith(prefix) or prefix.startswith(cached_prefix):
+                    self._conn.execute(
+                        "DELETE FROM prefixes WHERE bucket = ? AND prefix = ?",
+                        (bucket, cached_prefix)
+                    )
+            self._conn.commit()
+
+
+class DedupIndex:
+    """
+    파일 내용(예상 ETag) -> 이미 업로드된 S3 키를 기록하는 로컬 SQLite 인덱스
+    
+    내용 식별자로 업로드 설정의 파트 크기로 계산한 S3 ETag를 사용하므로,
+    복사할 때 CopySourceIfMatch로 원본 객체가 아직 같은 내용인지 서버에서
+    확인할 수 있습니다. 경로/크기/수정 시각이 같은 파일은 해시를 다시 계산하지
+    않도록 계산 결과도 함께 저장합니다.
+    """
+    
+    def __init__(self, path: str, min_size: int = DEFAULT_DEDUP_MIN_SIZE):
+        """
+        Args:
+            path: SQLite 파일 경로
+            min_size: 이보다 작은 파일은 중복 확인 없이 업로드
+        """
+        self.path = path
+        self.min_size = min_size
+        self.copied_count = 0
+        self.saved_bytes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS contents (
+                bucket TEXT NOT NULL,
+                etag TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (bucket, etag, size)
+            );
+            CREATE TABLE IF NOT EXISTS digests (
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                part_size INTEGER NOT NULL,
+                etag TEXT NOT NULL,
+                PRIMARY KEY (path, size, mtime_ns, part_size)
+            );
+        """)
+    
+    def file_etag(self, local_path: str, file_size: int, part_size: Optional[int]) -> str:
+        """로컬 파일의 예상 ETag (같은 파일은 저장된 계산 결과 사용)"""
+        path = os.path.abspath(local_path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        row_key = (path, file_size, mtime_ns, part_size or 0)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag FROM digests WHERE path = ? AND size = ? AND mtime_ns = ? AND part_size = ?",
+                row_key
+            ).fetchone()
+        if row:
+            return row[0]
+        
+        etag = S3FileTransfer._file_etag(path, file_size, part_size)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?)", row_key + (etag,))
+            self._conn.commit()
+        return etag
+    
+    def lookup(self, bucket: str, etag: str, size: int) -> Optional[str]:
+        """같은 내용으로 업로드된 키 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key FROM contents WHERE bucket = ? AND etag = ? AND size = ?",
+                (bucket, etag, size)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def record(self, bucket: str, etag: str, size: int, key: str):
+        """업로드한 키 기록"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO contents VALUES (?, ?, ?, ?)", (bucket, etag, size, key)
+            )
+            self._conn.commit()
+    
+    def forget(self, bucket: str, etag: str, size: int):
+        """원본 객체가 없어졌거나 바뀐 항목 삭제"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM contents WHERE bucket = ? AND etag = ? AND size = ?", (bucket, etag, size)
+            )
+            self._conn.commit()
+    
+    def record_copy(self, size: int):
+        """서버 측 복사로 업로드를 대신한 파일 집계"""
+        with self._lock:
+            self.copied_count += 1
+            self.saved_bytes += size
+    
+    def print_summary(self):
+        """중복 제거 결과 출력"""
+        if self.copied_count:
+            print(f"♻️  중복 파일 서버 측 복사: {self.copied_count}개 "
+                  f"({self.saved_bytes / (1024*1024*1024):.2f} GB 전송 절약)")
+
+
+class CompressedReader:
+    """
+    파일을 읽는 대로 압축해서 내주는 읽기 전용 스트림 (upload_fileobj용)
+    
+    요청한 크기만큼만 읽고 압축하므로 큰 파일도 메모리를 일정하게 사용합니다.
+    """
+    
+    def __init__(self, local_path: str, codec: str):
+        self._file = open(local_path, 'rb')
+        if codec == "zstd":
+            self._compressor = zstandard.ZstdCompressor().compressobj()
+        else:
+            # wbits 31: gzip 헤더/트레일러 포함
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        self._buffer = bytearray()
+        self._eof = False
+        self.compressed_bytes = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size is None or size < 0 or len(self._buffer) < size):
+            chunk = self._file.read(COMPRESS_READ_CHUNK)
+            if chunk:
+                self._buffer += self._compressor.compress(chunk)
+            else:
+                self._buffer += self._compressor.flush()
+                self._eof = True
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self.compressed_bytes += len(data)
+        return data
+    
+    def close(self):
+        self._file.close()
+
+
+class Compressor:
+    """
+    업로드할 때 확장자/크기 조건에 맞는 파일을 압축하고 절감량을 집계
+    
+    압축한 객체는 키를 바꾸지 않고 Content-Encoding과 원본 크기 메타데이터
+    (x-amz-meta-uncompressed-size)를 설정합니다. 다운로드할 때는 download_file과
+    download_stream이 Content-Encoding을 보고 자동으로 풉니다.
+    """
+    
+    def __init__(self, codec: str, extensions: str = DEFAULT_COMPRESS_EXTENSIONS,
+                 min_size: int = DEFAULT_COMPRESS_MIN_SIZE):
+        """
+        Args:
+            codec: gzip 또는 zstd
+            extensions: 압축할 확장자 (쉼표로 구분, 빈 문자열이면 모든 파일)
+            min_size: 이보다 작은 파일은 압축하지 않음
+        """
+        if codec not in COMPRESSION_CODECS:
+            raise ValueError(f"지원하지 않는 압축 방식: {codec} (사용 가능: {', '.join(COMPRESSION_CODECS)})")
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("zstd 압축에는 zstandard 패키지가 필요합니다 (pip install zstandard)")
+        self.codec = codec
+        self.extensions = parse_extensions(extensions)
+        self.min_size = min_size
+        self._lock = threading.Lock()
+        self.compressed_count = 0
+        self.original_bytes = 0
+        self.compressed_bytes = 0
+    
+    def should_compress(self, path: str, file_size: int) -> bool:
+        """압축해서 업로드할 파일인지 (path는 로컬 경로 또는 S3 키)"""
+        if file_size < self.min_size:
+            return False
+        return not self.extensions or path.lower().endswith(self.extensions)
+    
+    def record(self, original_size: int, compressed_size: int):
+        with self._lock:
+            self.compressed_count += 1
+            self.original_bytes += original_size
+            self.compressed_bytes += compressed_size
+    
+    def print_summary(self):
+        """압축 결과 출력"""
+        if self.compressed_count:
+            saved = 1 - self.compressed_bytes / self.original_bytes if self.original_bytes else 0.0
+            print(f"🗜️  {self.codec} 압축: {self.compressed_count}개 파일, "
+                  f"{self.original_bytes / (1024*1024):.2f} MB -> {self.compressed_bytes / (1024*1024):.2f} MB "
+                  f"({saved:.1%} 절감)")
+    
+    @staticmethod
+    def open_decompressed(fileobj, codec: str):
+        """압축된 바이트 스트림(파일, GET 응답 본문)을 읽는 대로 풀어 주는 읽기 스트림"""
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstd로 압축된 객체입니다. zstandard 패키지를 설치하세요")
+            return zstandard.ZstdDecompressor().stream_reader(fileobj)
+        return gzip.GzipFile(fileobj=fileobj)
+    
+    @staticmethod
+    def decompress_file(local_path: str, codec: str):
+        """압축된 채로 받은 파일을 같은 경로에 풀기 (임시 파일에 푼 뒤 이름 변경)"""
+        tmp_path = f"{local_path}.decompress"
+        try:
+            with open(local_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                with Compressor.open_decompressed(src, codec) as reader:
+                    shutil.copyfileobj(reader, dst, COMPRESS_READ_CHUNK)
+            os.replace(tmp_path, local_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+
+class ObjectFilter:
+    """
+    목록 조회 결과(키, 크기, LastModified)만으로 받을 객체를 고르는 필터
+    
+    GET 요청 전에 적용하므로 조건에 맞지 않는 큰 객체는 전혀 내려받지 않습니다.
+    glob은 다운로드할 프리픽스 기준 상대 경로에 fnmatch로 적용하며 *는 /도 포함합니다
+    (예: "*/manifests/*.json"). include가 있으면 그중 하나에 맞아야 하고, exclude에
+    하나라도 맞으면 제외합니다.
+    """
+    
+    def __init__(
+        self,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        extensions: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        modified_after: Optional[datetime] = None,
+        modified_before: Optional[datetime] = None
+    ):
+        """
+        Args:
+            include: 받을 상대 경로 glob 목록
+            exclude: 제외할 상대 경로 glob 목록
+            extensions: 받을 확장자 (쉼표로 구분)
+            min_size: 이보다 작은 객체 제외
+            max_size: 이보다 큰 객체 제외
+            modified_after: 이 시각 이전에 수정된 객체 제외
+            modified_before: 이 시각 이후에 수정된 객체 제외
+        """
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self.extensions = parse_extensions(extensions) if extensions else ()
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        self._lock = threading.Lock()
+        self.skipped_count = 0
+        self.skipped_bytes = 0
+    
+    @property
+    def active(self) -> bool:
+        return bool(
+            self.include or self.exclude or self.extensions
+            or self.min_size is not None or self.max_size is not None
+            or self.modified_after is not None or self.modified_before is not None
+        )
+    
+    def matches(self, relative_path: str, size: int, last_modified: Optional[datetime] = None) -> bool:
+        """조건에 맞으면 True, 아니면 제외 집계 후 False"""
+        if self._matches(relative_path, size, last_modified):
+            return True
+        with self._lock:
+            self.skipped_count += 1
+            self.skipped_bytes += size
+        return False
+    
+    def _matches(self, relative_path: str, size: int, last_modified: Optional[datetime]) -> bool:
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if last_modified is not None:
+            if self.modified_after is not None and last_modified < self.modified_after:
+                return False
+            if self.modified_before is not None and last_modified >= self.modified_before:
+                return False
+        if self.extensions and not relative_path.lower().endswith(self.extensions):
+            return False
+        if self.include and not any(fnmatch.fnmatchcase(relative_path, pattern) for pattern in self.include):
+            return False
+        return not any(fnmatch.fnmatchcase(relative_path, pattern) for pattern in self.exclude)
+    
+    def describe(self) -> str:
+        """필터 조건 한 줄 요약"""
+        conditions = []
+        if self.include:
+            conditions.append(f"include {', '.join(self.include)}")
+        if self.exclude:
+            conditions.append(f"exclude {', '.join(self.exclude)}")
+        if self.extensions:
+            conditions.append(f"확장자 {', '.join(self.extensions)}")
+        if self.min_size is not None or self.max_size is not None:
+            def size_text(size):
+                if size is None:
+                    return ""
+                return f"{size / MB:g} MB" if size >= MB else f"{size / 1024:g} KB"
+            conditions.append(f"크기 {size_text(self.min_size)}~{size_text(self.max_size)}")
+        if self.modified_after is not None or self.modified_before is not None:
+            after = self.modified_after.isoformat() if self.modified_after else ""
+            before = self.modified_before.isoformat() if self.modified_before else ""
+            conditions.append(f"수정 시각 {after}~{before}")
+        return " | ".join(conditions)
+    
+    def print_summary(self):
+        """필터로 제외한 객체 출력"""
+        if self.skipped_count:
+            print(f"🔎 필터로 제외: {self.skipped_count}개 "
+                  f"({self.skipped_bytes / (1024*1024*1024):.2f} GB)")
+
+
+class BatchDeleter:
+    """
+    삭제할 키를 모았다가 delete_objects 요청 하나에 최대 1000개씩 삭제
+    
+    add()를 호출한 스레드가 배치가 찰 때마다 바로 삭제 요청을 보내므로
+    여러 워커가 함께 쓰면 삭제 요청도 그만큼 동시에 진행됩니다.
+    이미 묶은 배치는 delete_batch()로 바로 삭제할 수 있습니다.
+    """
+    
+    def __init__(self, s3, bucket: str, batch_size: int = DELETE_BATCH_SIZE):
+        """
+        Args:
+            s3: boto3 S3 클라이언트
+            bucket: 버킷 이름
+            batch_size: 요청 하나에 담을 키 수 (최대 1000)
+        """
+        self.s3 = s3
+        self.bucket = bucket
+        self.batch_size = min(batch_size, DELETE_BATCH_SIZE)
+        self.deleted_count = 0
+        self.failed = []
+        self._lock = threading.Lock()
+        self._pending = []
+    
+    def add(self, key: str):
+        """삭제할 키 추가 (배치가 차면 바로 삭제)"""
+        with self._lock:
+            self._pending.append(key)
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+        self.delete_batch(batch)
+    
+    def flush(self):
+        """남은 키 삭제"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self.delete_batch(batch)
+    
+    def delete_batch(self, keys: List[str]) -> int:
+        """
+        키 목록을 delete_objects 요청 하나로 삭제
+        
+        Returns:
+            삭제에 실패한 키 수
+        """
+        try:
+            response = self.s3.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True}
+            )
+            errors = response.get("Errors", [])
+        except ClientError as e:
+            errors = [{"Key": key, "Message": str(e)} for key in keys]
+        
+        for error in errors:
+            _log(f"   ❌ 삭제 실패 {error.get('Key')}: {error.get('Message', error.get('Code'))}")
+        with self._lock:
+            self.deleted_count += len(keys) - len(errors)
+            self.failed.extend(error.get("Key") for error in errors)
+        return len(errors)
+
+
+class InotifyWatcher:
+    """
+    Linux inotify(ctypes)로 폴더 아래에서 쓰기가 끝난 파일 감지
+    
+    IN_CLOSE_WRITE(쓰기 후 닫힘)와 IN_MOVED_TO(다른 곳에서 이동해 옴)만 완료된 파일로
+    보므로 아직 쓰는 중인 파일은 반환하지 않습니다. 새 하위 폴더에는 감시를 추가하고,
+    감시를 추가하기 전에 이미 들어온 파일도 함께 반환합니다 (쓰는 중이었다면 닫힐 때
+    한 번 더 반환). 커널 이벤트 큐가 넘치면
+    이벤트가 빠졌을 수 있으므로 needs_rescan을 설정합니다.
+    
+    이벤트를 기다리는 동안은 select()로 잠들어 있으므로 유휴 비용이 거의 없습니다.
+    """
+    
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    
+    # struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+    _EVENT = struct.Struct("iIII")
+    
+    def __init__(self, local_root: str):
+        """
+        Args:
+            local_root: 감시할 로컬 폴더
+            
+        Raises:
+            OSError: inotify를 쓸 수 없는 플랫폼이거나 감시 개수 한도를 넘은 경우
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify를 지원하지 않는 플랫폼입니다")
+        
+        self._libc = libc
+        self.local_root = local_root
+        self.needs_rescan = False
+        self._dirs = {}  # watch descriptor -> 폴더 경로
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 실패: {os.strerror(error)}")
+        try:
+            self._add_tree(local_root, initial=True)
+        except OSError:
+            os.close(self._fd)
+            raise
+    
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self.local_root).replace(os.sep, "/")
+    
+    def _add_tree(self, top: str, initial: bool = False) -> List[str]:
+        """top과 그 하위 폴더에 감시를 추가하고 이미 있는 파일의 상대 경로 반환"""
+        found = []
+        stack = [top]
+        while stack:
+            current = stack.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(current), self.WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error == errno.ENOSPC:
+                    message = "inotify 감시 개수 한도 초과 (sysctl fs.inotify.max_user_watches)"
+                    if initial:
+                        raise OSError(error, message)
+                    _log(f"⚠️  {message}: {current}")
+                # 그 사이 삭제된 폴더는 무시
+                continue
+            self._dirs[wd] = current
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif not initial and entry.is_file():
+                            found.append(self._relative(entry.path))
+            except OSError:
+                continue
+        return found
+    
+    def read(self, timeout: float) -> set:
+        """
+        이벤트를 최대 timeout초 기다렸다가 쓰기가 끝난 파일들의 상대 경로 반환
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        
+        paths = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                start = offset + self._EVENT.size
+                name = os.fsdecode(data[start:start + length].rstrip(b"\0"))
+                offset = start + length
+                
+                if mask & self.IN_Q_OVERFLOW:
+                    self.needs_rescan = True
+                    continue
+                if mask & self.IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                
+                path = os.path.join(directory, name)
+                if mask & self.IN_ISDIR:
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        paths.update(self._add_tree(path))
+                elif mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO):
+                    paths.add(self._relative(path))
+        return paths
+    
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """
+    inotify를 쓸 수 없을 때 주기적으로 폴더를 다시 탐색해 변경된 파일 감지
+    
+    크기나 수정 시각이 바뀐 파일은 다음 탐색까지 그대로일 때 쓰기가 끝난 것으로
+    보고 반환하므로, 감지 지연은 탐색 간격의 1~2배입니다.
+    """
+    
+    def __init__(self, local_root: str, interval: float, baseline: Optional[dict] = None):
+        """
+        Args:
+            local_root: 감시할 로컬 폴더
+            interval: 다시 탐색하는 간격 (초)
+            baseline: 이미 처리한 파일 정보 (_scan_local 결과). 여기 있는 그대로면 반환하지 않음
+        """
+        self.local_root = local_root
+        self.interval = interval
+        self.needs_rescan = False
+        self._known = {path: (info["size"], info["mtime"]) for path, info in (baseline or {}).items()}
+        self._changing = {}
+        self._next_scan = time.monotonic() + interval
+    
+    def read(self, timeout: float) -> set:
+        """다음 탐색 시각까지 최대 timeout초 기다렸다가 쓰기가 끝난 파일들의 상대 경로 반환"""
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(max(0.0, wait))
+        self._next_scan = time.monotonic() + self.interval
+        
+        ready = set()
+        current = S3FileTransfer._scan_local(self.local_root)
+        for path, info in current.items():
+            signature = (info["size"], info["mtime"])
+            if self._known.get(path) == signature:
+                self._changing.pop(path, None)
+            elif self._changing.get(path) == signature:
+                ready.add(path)
+                self._known[path] = signature
+                del self._changing[path]
+            else:
+                self._changing[path] = signature
+        
+        for path in list(self._known):
+            if path not in current:
+                del self._known[path]
+        for path in list(self._changing):
+            if path not in current:
+                del self._changing[path]
+        return ready
+    
+    def close(self):
+        pass
+
+
+class WatchState:
+    """
+    watch 명령어의 진행 상태 (다시 시작할 때 이어서 업로드)
+    
+    high_water는 업로드에 성공한 파일 중 가장 늦은 수정 시각입니다. pending에는
+    업로드를 시작했지만 성공을 확인하지 못한 파일이 남으므로, 다시 시작하면
+    high_water보다 새 파일과 pending 파일만 업로드합니다.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.high_water = 0.0
+        self.pending = set()
+        self.uploaded_count = 0
+        
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.high_water = state.get("high_water", 0.0)
+            self.pending = set(state.get("pending", []))
+            self.uploaded_count = state.get("uploaded_count", 0)
+    
+    def needs_upload(self, relative_path: str, mtime: float) -> bool:
+        return mtime > self.high_water or relative_path in self.pending
+    
+    def save(self):
+        """임시 파일에 쓴 뒤 이름을 바꿔서 중간에 종료되어도 파일이 깨지지 않게 저장"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "high_water": self.high_water,
+                "high_water_time": datetime.fromtimestamp(self.high_water).isoformat() if self.high_water else None,
+                "pending": sorted(self.pending),
+                "uploaded_count": self.uploaded_count,
+                "updated_at": datetime.now().isoformat()
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class TokenBucket:
+    """
+    여러 스레드가 공유하는 토큰 버킷
+    
+    요청한 양만큼 토큰을 먼저 빼고 부족한 만큼(빚)을 채울 시간 동안 잠들기 때문에
+    버킷 용량보다 큰 요청도 막히지 않고 전체 평균 속도가 rate를 넘지 않습니다.
+    """
+    
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: 초당 토큰 수 (용량은 1초 분량)
+        """
+        self._lock = threading.Lock()
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+    
+    def set_rate(self, rate: float):
+        """속도 변경"""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self._tokens = min(self._tokens, rate)
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def consume(self, amount: float):
+        """토큰 amount개 사용 (부족하면 채워질 때까지 대기)"""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """
+    모든 전송 스레드가 공유하는 대역폭(바이트/초)과 요청 수(요청/초) 제한
+    
+    SlowDown(503) 응답을 받으면 요청 속도를 절반으로 줄이고, 이후 정상 응답이
+    이어지면 RATE_RECOVERY_INTERVAL마다 조금씩 원래 한도까지 되돌립니다.
+    요청 한도를 지정하지 않은 경우에는 SlowDown을 받은 시점의 실제 요청 속도를
+    기준으로 제한을 시작하고, 충분히 회복되면 제한을 다시 해제합니다.
+    """
+    
+    def __init__(self, bytes_per_sec: Optional[float] = None, requests_per_sec: Optional[float] = None):
+        """
+        Args:
+            bytes_per_sec: 초당 최대 전송 바이트 (None이면 제한 없음)
+            requests_per_sec: 초당 최대 요청 수 (None이면 제한 없음)
+        """
+        self.bytes_bucket = TokenBucket(bytes_per_sec) if bytes_per_sec else None
+        self.request_bucket = TokenBucket(requests_per_sec) if requests_per_sec else None
+        self.request_ceiling = requests_per_sec
+        self.slowdown_count = 0
+        self._lock = threading.Lock()
+        self._recent_requests = collections.deque(maxlen=10000)
+        self._last_adjusted = 0.0
+        self._adaptive_ceiling = None
+    
+    def throttle_bytes(self, nbytes: int):
+        """전송한(할) 바이트만큼 대역폭 토큰 사용. boto3 Callback으로도 사용"""
+        if self.bytes_bucket is not None and nbytes > 0:
+            self.bytes_bucket.consume(nbytes)
+    
+    def throttle_request(self, **kwargs):
+        """HTTP 요청 하나를 보내기 전에 호출 (botocore before-send 이벤트)"""
+        now = time.monotonic()
+        with self._lock:
+            self._recent_requests.append(now)
+            bucket = self.request_bucket
+        if bucket is not None:
+            bucket.consume(1)
+    
+    def _observed_rate(self, now: float) -> float:
+        """최근 1초 동안 보낸 요청 수"""
+        return float(sum(1 for t in self._recent_requests if now - t <= 1.0))
+    
+    def on_response(self, response=None, **kwargs):
+        """
+        응답마다 호출 (botocore needs-retry 이벤트)
+        
+        재시도 여부는 botocore가 결정하도록 항상 None을 반환합니다.
+        """
+        if response is None:
+            return None
+        
+        http_response, parsed = response
+        error_code = parsed.get('Error', {}).get('Code') if isinstance(parsed, dict) else None
+        if error_code == 'SlowDown' or http_response.status_code == 503:
+            self._on_slowdown()
+        elif http_response.status_code < 400:
+            self._on_success()
+        return None
+    
+    def _on_slowdown(self):
+        now = time.monotonic()
+        with self._lock:
+            self.slowdown_count += 1
+            if self.request_bucket is None:
+                # 한도가 없었으면 현재 실제 속도를 기준으로 제한 시작
+                observed = max(self._observed_rate(now), MIN_REQUEST_RATE)
+                self._adaptive_ceiling = observed
+                self.request_bucket = TokenBucket(observed)
+            if now - self._last_adjusted < RATE_RECOVERY_INTERVAL:
+                return
+            self._last_adjusted = now
+            new_rate = max(self.request_bucket.rate * SLOWDOWN_BACKOFF_FACTOR, MIN_REQUEST_RATE)
+            self.request_bucket.set_rate(new_rate)
+        _log(f"   🐢 SlowDown 응답 - 요청 속도를 {new_rate:.1f} req/s로 낮춤")
+    
+    def _on_success(self):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self.request_bucket
+            if bucket is None or now - self._last_adjusted < RATE_RECOVERY_INTERVAL:
+                return
+            ceiling = self.request_ceiling or self._adaptive_ceiling
+            if bucket.rate >= ceiling:
+                if self.request_ceiling is None:
+                    # 원래 제한이 없었으므로 완전히 회복되면 제한 해제
+                    self.request_bucket = None
+                return
+            self._last_adjusted = now
+            bucket.set_rate(min(ceiling, bucket.rate + max(1.0, ceiling * RATE_RECOVERY_STEP)))
+    
+    def attach(self, client):
+        """boto3 클라이언트의 모든 요청에 제한을 적용하도록 이벤트 핸들러 등록"""
+        client.meta.events.register('before-send.s3.*', self.throttle_request)
+        client.meta.events.register('needs-retry.s3.*', self.on_response)
+
+
+class ErrorStats:
+    """
+    실행 중 발생한 재시도 횟수, 백오프 대기 시간, 오류 종류별 개수 집계
+    
+    botocore 이벤트로 HTTP 요청 재시도(attempt 2 이상)를 세고, 직전 응답을
+    받은 시각부터 재시도 요청을 만들기까지의 시간을 백오프 시간으로 합산합니다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.errors = collections.Counter()
+    
+    @staticmethod
+    def error_key(error: Exception) -> str:
+        """오류 분류 이름 (ClientError는 오류 코드까지 포함)"""
+        if isinstance(error, ClientError):
+            return f"ClientError:{error.response.get('Error', {}).get('Code', 'Unknown')}"
+        return type(error).__name__
+    
+    def record_error(self, error: Exception):
+        """최종적으로 실패한 작업의 오류 기록"""
+        with self._lock:
+            self.errors[self.error_key(error)] += 1
+    
+    def on_needs_retry(self, **kwargs):
+        """응답(또는 연결 오류)마다 호출 (botocore needs-retry 이벤트)"""
+        self._local.responded_at = time.monotonic()
+        return None
+    
+    def on_request_created(self, request=None, **kwargs):
+        """요청을 만들 때마다 호출 (botocore request-created 이벤트)"""
+        context = getattr(request, 'context', None) or {}
+        if context.get('retries', {}).get('attempt', 1) > 1:
+            waited = time.monotonic() - getattr(self._local, 'responded_at', time.monotonic())
+            with self._lock:
+                self.retries += 1
+                self.backoff_seconds += max(waited, 0.0)
+    
+    def attach(self, client):
+        """boto3 클라이언트에 이벤트 핸들러 등록"""
+        client.meta.events.register('needs-retry.s3.*', self.on_needs_retry)
+        client.meta.events.register('request-created.s3.*', self.on_request_created)
+    
+    def to_dict(self) -> dict:
+        return {
+            "retries": self.retries,
+            "backoff_seconds": round(self.backoff_seconds, 3),
+            "errors": dict(self.errors)
+        }
+    
+    def print_summary(self, retried_items: int = 0):
+        """재시도/오류 요약 출력 (아무 일도 없었으면 출력하지 않음)"""
+        if not (self.retries or self.errors or retried_items):
+            return
+        print(f"🔁 요청 재시도: {self.retries}회 (백오프 대기 {self.backoff_seconds:.1f}초)")
+        if retried_items:
+            print(f"🔁 실패 후 다시 시도한 작업: {retried_items}개")
+        if self.errors:
+            print(f"⚠️  오류 종류별 횟수:")
+            for name, count in self.errors.most_common():
+                print(f"   {name}: {count}회")
+
+
+class ObjectTimer:
+    """객체 하나의 전송 시간과 첫 바이트 지연을 재는 타이머 (TransferMetrics.start()로 생성)"""
+    
+    __slots__ = ("metrics", "key", "direction", "start", "first_byte")
+    
+    def __init__(self, metrics: "TransferMetrics", key: str, direction: str):
+        self.metrics = metrics
+        self.key = key
+        self.direction = direction
+        self.start = time.monotonic()
+        self.first_byte = None
+    
+    def on_bytes(self, nbytes: int):
+        """바이트가 오갈 때마다 호출 (boto3 Callback)"""
+        if nbytes <= 0:
+            return
+        if self.first_byte is None:
+            self.first_byte = time.monotonic() - self.start
+        self.metrics.add_bytes(nbytes)
+    
+    def finish(self, nbytes: int, success: bool):
+        """전송 종료 기록"""
+        self.metrics.record(
+            self.key, self.direction, nbytes,
+            time.monotonic() - self.start, self.first_byte, success
+        )
+
+
+class TransferMetrics:
+    """
+    객체별 전송 시간/크기/첫 바이트 지연과 초 단위 전송량을 수집
+    
+    전송마다 튜플 하나를 추가하고 바이트는 초 단위 칸에 더하기만 하므로
+    수집 비용은 작고, 백분위수 등은 실행이 끝난 뒤 한 번에 계산합니다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.objects = []
+        self.timeline = collections.Counter()
+    
+    def start(self, key: str, direction: str) -> ObjectTimer:
+        """객체 전송 시작"""
+        return ObjectTimer(self, key, direction)
+    
+    def add_bytes(self, nbytes: int):
+        second = int(time.monotonic() - self._started)
+        with self._lock:
+            self.timeline[second] += nbytes
+    
+    def record(self, key: str, direction: str, nbytes: int, duration: float,
+               first_byte: Optional[float], success: bool):
+        with self._lock:
+            self.objects.append((key, direction, nbytes, duration, first_byte, success))
+    
+    @staticmethod
+    def _percentile(sorted_values: list, percent: float) -> float:
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, max(0, int(round(percent / 100 * len(sorted_values))) - 1))
+        return sorted_values[index]
+    
+    def summary(self, slowest: int = 5) -> dict:
+        """백분위 지연, 구간별 처리량, 가장 느린 객체 등 요약 계산"""
+        with self._lock:
+            objects = list(self.objects)
+            timeline = dict(self.timeline)
+        
+        succeeded = [o for o in objects if o[5]]
+        durations = sorted(o[3] for o in succeeded)
+        first_bytes = sorted(o[4] for o in succeeded if o[4] is not None)
+        total_bytes = sum(o[2] for o in succeeded)
+        elapsed = max(timeline) + 1 if timeline else 0
+        
+        return {
+            "objects": len(objects),
+            "succeeded": len(succeeded),
+            "failed": len(objects) - len(succeeded),
+            "bytes": total_bytes,
+            "latency_seconds": {
+                f"p{p}": round(self._percentile(durations, p), 4) for p in (50, 95, 99)
+            },
+            "first_byte_seconds": {
+                f"p{p}": round(self._percentile(first_bytes, p), 4) for p in (50, 95, 99)
+            },
+            "throughput_mb_per_second": [
+                round(timeline.get(second, 0) / MB, 3) for second in range(elapsed)
+            ],
+            "slowest": [
+                {"key": o[0], "direction": o[1], "bytes": o[2], "seconds": round(o[3], 3)}
+                for o in sorted(succeeded, key=lambda o: o[3], reverse=True)[:slowest]
+            ]
+        }
+    
+    def print_summary(self):
+        """지연 백분위수, 시간대별 MB/s, 가장 느린 객체 출력"""
+        summary = self.summary()
+        if not summary["succeeded"]:
+            return
+        
+        latency = summary["latency_seconds"]
+        first_byte = summary["first_byte_seconds"]
+        print(f"⏲️  객체별 소요시간: p50 {latency['p50']:.3f}s / p95 {latency['p95']:.3f}s / p99 {latency['p99']:.3f}s")
+        if first_byte["p50"]:
+            print(f"⏲️  첫 바이트 지연: p50 {first_byte['p50']:.3f}s / p95 {first_byte['p95']:.3f}s / p99 {first_byte['p99']:.3f}s")
+        
+        series = summary["throughput_mb_per_second"]
+        if series:
+            # 최대 10개 구간으로 묶어서 평균 MB/s 출력
+            width = max(1, -(-len(series) // 10))
+            windows = [
+                f"{sum(series[i:i + width]) / len(series[i:i + width]):.1f}"
+                for i in range(0, len(series), width)
+            ]
+            print(f"📈 MB/s ({width}초 간격): {' → '.join(windows)}")
+        
+        if summary["slowest"]:
+            print(f"🐌 가장 느린 객체:")
+            for item in summary["slowest"]:
+                print(f"   {item['seconds']:.2f}s  {item['bytes'] / MB:.2f} MB  {item['key']}")
+    
+    def write_json(self, path: str, extra: Optional[dict] = None):
+        """요약과 객체별 기록을 JSON 파일로 저장"""
+        data = {"generated_at": datetime.now().isoformat(), "summary": self.summary()}
+        if extra:
+            data.update(extra)
+        with self._lock:
+            data["objects"] = [
+                {"key": o[0], "direction": o[1], "bytes": o[2], "seconds": round(o[3], 4),
+                 "first_byte_seconds": None if o[4] is None else round(o[4], 4), "success": o[5]}
+                for o in self.objects
+            ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    def write_prometheus(self, path: str, error_stats: Optional["ErrorStats"] = None):
+        """
+        node_exporter textfile collector 형식으로 저장
+        
+        수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다.
+        """
+        summary = self.summary()
+        with self._lock:
+            objects = list(self.objects)
+        
+        lines = [
+            "# HELP s3_transfer_objects_total Transferred objects by direction and status.",
+            "# TYPE s3_transfer_objects_total counter"
+        ]
+        counts = collections.Counter((o[1], "success" if o[5] else "failed") for o in objects)
+        for (direction, status), count in sorted(counts.items()):
+            lines.append(f's3_transfer_objects_total{{direction="{direction}",status="{status}"}} {count}')
+        
+        lines += [
+            "# HELP s3_transfer_bytes_total Bytes transferred by successful objects.",
+            "# TYPE s3_transfer_bytes_total counter"
+        ]
+        byte_counts = collections.Counter()
+        for o in objects:
+            if o[5]:
+                byte_counts[o[1]] += o[2]
+        for direction, nbytes in sorted(byte_counts.items()):
+            lines.append(f's3_transfer_bytes_total{{direction="{direction}"}} {nbytes}')
+        
+        lines += [
+            "# HELP s3_transfer_object_duration_seconds Per-object transfer duration.",
+            "# TYPE s3_transfer_object_duration_seconds summary"
+        ]
+        for name, value in summary["latency_seconds"].items():
+            lines.append(f's3_transfer_object_duration_seconds{{quantile="0.{name[1:]}"}} {value}')
+        lines.append(f"s3_transfer_object_duration_seconds_count {summary['succeeded']}")
+        
+        series = summary["throughput_mb_per_second"]
+        lines += [
+            "# HELP s3_transfer_throughput_bytes_per_second Average throughput of the last run.",
+            "# TYPE s3_transfer_throughput_bytes_per_second gauge",
+            f"s3_transfer_throughput_bytes_per_second {summary['bytes'] / len(series) if series else 0:.0f}",
+            "# HELP s3_transfer_last_run_timestamp_seconds Time the metrics were written.",
+            "# TYPE s3_transfer_last_run_timestamp_seconds gauge",
+            f"s3_transfer_last_run_timestamp_seconds {time.time():.0f}"
+        ]
+        
+        if error_stats is not None:
+            lines += [
+                "# HELP s3_transfer_retries_total HTTP request retries.",
+                "# TYPE s3_transfer_retries_total counter",
+                f"s3_transfer_retries_total {error_stats.retries}",
+                "# HELP s3_transfer_backoff_seconds_total Time spent waiting before retries.",
+                "# TYPE s3_transfer_backoff_seconds_total counter",
+                f"s3_transfer_backoff_seconds_total {error_stats.backoff_seconds:.3f}",
+                "# HELP s3_transfer_errors_total Failed operations by error class.",
+                "# TYPE s3_transfer_errors_total counter"
+            ]
+            for name, count in sorted(error_stats.errors.items()):
+                lines.append(f's3_transfer_errors_total{{error="{name}"}} {count}')
+        
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
+
+
+class S3FileTransfer:
+    """S3 호환 스토리지와 로컬 파일 시스템 간 파일 전송"""
+    
+    def __init__(
+        self,
+        endpoint_url: Optional[str] = None,
+        region: str = "us-east-1",
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        bucket_name: Optional[str] = None,
+        max_workers: int = 1,
+        transfer_profile: str = "default",
+        transfer_options: Optional[dict] = None,
+        adaptive_chunksize: bool = False,
+        ranged_threshold: int = DEFAULT_RANGED_THRESHOLD,
+        list_workers: int = 1,
+        fanout_depth: int = 1,
+        cache_path: Optional[str] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        refresh_cache: bool = False,
+        max_bandwidth: Optional[float] = None,
+        max_requests_per_sec: Optional[float] = None,
+        retry_mode: str = "standard",
+        max_attempts: int = 5,
+        connect_timeout: float = 60,
+        read_timeout: float = 60,
+        retry_passes: int = 1,
+        verbose: bool = False,
+        progress_interval: float = PROGRESS_INTERVAL,
+        dedup_index: Optional[str] = None,
+        dedup_min_size: int = DEFAULT_DEDUP_MIN_SIZE,
+        compress: Optional[str] = None,
+        compress_extensions: str = DEFAULT_COMPRESS_EXTENSIONS,
+        compress_min_size: int = DEFAULT_COMPRESS_MIN_SIZE,
+        object_filter: Optional[ObjectFilter] = None,
+        shard_index: int = 0,
+        shard_count: int = 1
+    ):
+        """
+        Args:
+            endpoint_url: S3 엔드포인트 URL (AWS S3는 None)
+            region: 리전 이름
+            access_key: Access Key
+            secret_key: Secret Key
+            bucket_name: 버킷 이름
+            max_workers: 폴더 전송 시 동시에 처리할 파일 수 (워커 스레드 수)
+            transfer_profile: TRANSFER_PROFILES의 프로필 이름
+            transfer_options: 프로필 값을 덮어쓸 설정 (multipart_threshold,
+                multipart_chunksize, max_concurrency, max_io_queue)
+            adaptive_chunksize: True면 파일 크기에 따라 파트 크기를 자동 선택
+            ranged_threshold: 이 크기 이상인 객체는 범위 분할 병렬 다운로드 (0이면 사용 안 함)
+            list_workers: 2 이상이면 하위 프리픽스를 나눠 동시에 목록 조회
+            fanout_depth: 하위 프리픽스를 나눌 깊이 (1이면 바로 아래 폴더 단위)
+            cache_path: 인벤토리 캐시(SQLite) 파일 경로 (None이면 캐시 사용 안 함)
+            cache_ttl: 캐시를 그대로 사용할 유효 시간 (초)
+            refresh_cache: True면 유효 시간과 관계없이 목록을 다시 조회해 캐시 갱신
+            max_bandwidth: 모든 전송을 합친 초당 최대 바이트 (None이면 제한 없음)
+            max_requests_per_sec: 모든 스레드를 합친 초당 최대 요청 수 (None이면 제한 없음)
+            retry_mode: botocore 재시도 모드 (standard, adaptive, legacy)
+            max_attempts: 요청 하나당 최대 시도 횟수 (첫 시도 포함)
+            connect_timeout: 연결 타임아웃 (초)
+            read_timeout: 읽기 타임아웃 (초)
+            retry_passes: 폴더 전송이 끝난 뒤 실패한 파일만 다시 시도할 횟수
+            verbose: True면 전송한 파일마다 한 줄씩 출력
+            progress_interval: 폴더 전송 중 진행 상황 갱신 간격 (초, 0이면 표시 안 함)
+            dedup_index: 중복 제거 인덱스(SQLite) 경로. 지정하면 같은 내용이 이미 있는
+                파일은 업로드 대신 서버 측 복사
+            dedup_min_size: 이보다 작은 파일은 중복 확인 없이 업로드
+            compress: 업로드 시 압축 방식 (gzip, zstd, None이면 압축 안 함)
+            compress_extensions: 압축할 확장자 (쉼표로 구분, 빈 문자열이면 모든 파일)
+            compress_min_size: 이보다 작은 파일은 압축하지 않음
+            object_filter: 다운로드/목록 조회 시 목록 정보로 객체를 고르는 필터
+            shard_index: 이 호스트가 맡을 샤드 번호 (0부터)
+            shard_count: 전체 샤드 수. 2 이상이면 키 해시가 shard_index인 키만 전송
+        """
+        self.endpoint_url = endpoint_url or os.getenv("S3_ENDPOINT_URL")
+        self.region = region or os.getenv("S3_REGION", "us-east-1")
+        self.bucket_name = bucket_name or os.getenv("S3_BUCKET_NAME")
+        self.max_workers = max(1, max_workers)
+        self.journal: Optional[TransferJournal] = None
+        
+        if transfer_profile not in TRANSFER_PROFILES:
+            raise ValueError(
+                f"알 수 없는 전송 프로필: {transfer_profile} "
+                f"(사용 가능: {', '.join(TRANSFER_PROFILES)})"
+            )
+        self.transfer_profile = transfer_profile
+        self.transfer_settings = dict(TRANSFER_PROFILES[transfer_profile])
+        self.transfer_settings.update(
+            {k: v for k, v in (transfer_options or {}).items() if v is not None}
+        )
+        # 저널 멀티파트 업로드는 파트를 메모리에 읽어 올리므로 워커 전체에서 동시에 들고 있는 파트 수 제한
+        self._part_slots = threading.BoundedSemaphore(self.transfer_settings["max_concurrency"])
+        self.adaptive_chunksize = adaptive_chunksize
+        self.ranged_threshold = ranged_threshold
+        self.list_workers = max(1, list_workers)
+        self.fanout_depth = max(1, fanout_depth)
+        self.inventory = InventoryCache(cache_path) if cache_path else None
+        self.cache_ttl = cache_ttl
+        self.refresh_cache = refresh_cache
+        self.retry_passes = max(0, retry_passes)
+        self.error_stats = ErrorStats()
+        self.metrics = TransferMetrics()
+        self.progress = ProgressReporter(progress_interval, verbose)
+        self.dedup = DedupIndex(dedup_index, dedup_min_size) if dedup_index else None
+        self.compressor = Compressor(compress, compress_extensions, compress_min_size) if compress else None
+        self.object_filter = object_filter if object_filter is not None and object_filter.active else None
+        if not 0 <= shard_index < max(1, shard_count):
+            raise ValueError(f"샤드 번호는 0 ~ {shard_count - 1} 사이여야 합니다: {shard_index}")
+        self.shard_index = shard_index
+        self.shard_count = max(1, shard_count)
+        
+        access_key = access_key or os.getenv("S3_ACCESS_KEY")
+        secret_key = secret_key or os.getenv("S3_SECRET_KEY")
+        
+        if not all([access_key, secret_key, self.bucket_name]):
+            raise ValueError(
+                "S3 설정이 필요합니다. 환경변수 또는 .env 파일에 "
+                "S3_ACCESS_KEY, S3_SECRET_KEY, S3_BUCKET_NAME을 설정하세요."
+            )
+        
+        # S3 클라이언트 생성 (모든 워커가 하나의 클라이언트를 공유)
+        # 워커마다 파일 하나에 최대 max_concurrency개 연결을 사용하므로
+        # 연결 풀이 부족해 대기하지 않도록 크기를 맞춤
+        max_pool_connections = max(
+            10,
+            self.max_workers * self.transfer_settings["max_concurrency"] + self.list_workers
+        )
+        client_config = {
+            "service_name": "s3",
+            "region_name": self.region,
+            "aws_access_key_id": access_key,
+            "aws_secret_access_key": secret_key,
+            "config": Config(
+                s3={"addressing_style": "path"},
+                max_pool_connections=max_pool_connections,
+                retries={"mode": retry_mode, "max_attempts": max_attempts},
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout
+            )
+        }
+        
+        if self.endpoint_url:
+            client_config["endpoint_url"] = self.endpoint_url
+        
+        self.s3 = boto3.client(**client_config)
+        
+        # 대역폭/요청 수 제한 (SlowDown 응답에 따른 자동 조절은 항상 동작)
+        self.limiter = RateLimiter(max_bandwidth, max_requests_per_sec)
+        self.limiter.attach(self.s3)
+        self.error_stats.attach(self.s3)
+        
+        print(f"🔗 S3 연결:")
+        if self.endpoint_url:
+            print(f"   Endpoint: {self.endpoint_url}")
+        print(f"   Region: {self.region}")
+        print(f"   Bucket: {self.bucket_name}")
+        if self.max_workers > 1:
+            print(f"   Workers: {self.max_workers}")
+        if self.list_workers > 1:
+            print(f"   List workers: {self.list_workers} (fan-out depth {self.fanout_depth})")
+        if self.inventory is not None:
+            print(f"   Cache: {cache_path} (TTL {cache_ttl:g}s)")
+        if self.dedup is not None:
+            print(f"   Dedup: {dedup_index} ({dedup_min_size / MB:g} MB 이상)")
+        if self.compressor is not None:
+            extensions = ", ".join(self.compressor.extensions) or "모든 파일"
+            print(f"   Compress: {compress} ({extensions}, {compress_min_size / 1024:g} KB 이상)")
+        if self.object_filter is not None:
+            print(f"   Filter: {self.object_filter.describe()}")
+        if self.shard_count > 1:
+            print(f"   Shard: {self.shard_index}/{self.shard_count} (키 해시 기준)")
+        if max_bandwidth or max_requests_per_sec:
+            bandwidth = f"{max_bandwidth / MB:.1f} MB/s" if max_bandwidth else "제한 없음"
+            requests = f"{max_requests_per_sec:g} req/s" if max_requests_per_sec else "제한 없음"
+            print(f"   Rate limit: {bandwidth}, {requests}")
+        if retry_mode != "standard" or max_attempts != 5:
+            print(f"   Retry: {retry_mode}, 최대 {max_attempts}회")
+        if self.transfer_settings != TRANSFER_PROFILES["default"] or adaptive_chunksize:
+            settings = self.transfer_settings
+            print(
+                f"   Transfer: {transfer_profile} "
+                f"(threshold {settings['multipart_threshold'] // MB} MB, "
+                f"chunk {settings['multipart_chunksize'] // MB} MB"
+                f"{' adaptive' if adaptive_chunksize else ''}, "
+                f"concurrency {settings['max_concurrency']}, "
+                f"io queue {settings['max_io_queue']})"
+            )
+        print()
+    
+    def part_size_for(self, file_size: int) -> int:
+        """
+        파일 크기에 맞는 멀티파트 파트 크기 계산
+        
+        적응형 모드에서는 파일을 약 ADAPTIVE_TARGET_PARTS개로 나누되 설정된
+        chunksize보다 작아지지 않게 하여 작은 파트가 너무 많아지지 않도록 합니다.
+        어느 경우든 10,000 파트 제한을 넘지 않도록 MB 단위로 올림합니다.
+        
+        Args:
+            file_size: 파일 크기 (바이트)
+            
+        Returns:
+            파트 크기 (바이트)
+        """
+        part_size = self.transfer_settings["multipart_chunksize"]
+        if self.adaptive_chunksize:
+            part_size = max(part_size, -(-file_size // ADAPTIVE_TARGET_PARTS))
+        part_size = max(part_size, -(-file_size // MAX_MULTIPART_PARTS), MIN_PART_SIZE)
+        part_size = -(-part_size // MB) * MB
+        return min(part_size, MAX_PART_SIZE)
+    
+    def _byte_callback(self, timer: Optional[ObjectTimer] = None):
+        """전송 바이트마다 호출할 함수 (계측 + 진행 상황 + 대역폭 제한). 할 일이 없으면 None"""
+        callbacks = []
+        if timer is not None:
+            callbacks.append(timer.on_bytes)
+            callbacks.append(self.progress.add_bytes)
+        if self.limiter.bytes_bucket is not None:
+            callbacks.append(self.limiter.throttle_bytes)
+        
+        if not callbacks:
+            return None
+        if len(callbacks) == 1:
+            return callbacks[0]
+        
+        def callback(nbytes: int):
+            for func in callbacks:
+                func(nbytes)
+        return callback
+    
+    def _transfer_kwargs(self, file_size: Optional[int] = None, timer: Optional[ObjectTimer] = None) -> dict:
+        """boto3 관리형 전송(upload_file/download_file 등)에 넘길 Config, Callback"""
+        kwargs = {"Config": self.transfer_config(file_size)}
+        callback = self._byte_callback(timer)
+        if callback is not None:
+            kwargs["Callback"] = callback
+        return kwargs
+    
+    def transfer_config(self, file_size: Optional[int] = None) -> TransferConfig:
+        """
+        boto3 관리형 전송에 사용할 TransferConfig 생성
+        
+        Args:
+            file_size: 파일 크기 (적응형 모드에서 파트 크기 계산에 사용)
+            
+        Returns:
+            TransferConfig
+        """
+        settings = self.transfer_settings
+        chunksize = settings["multipart_chunksize"]
+        if self.adaptive_chunksize and file_size:
+            chunksize = self.part_size_for(file_size)
+        
+        return TransferConfig(
+            multipart_threshold=settings["multipart_threshold"],
+            multipart_chunksize=chunksize,
+            max_concurrency=settings["max_concurrency"],
+            max_io_queue=settings["max_io_queue"]
+        )
+    
+    def upload_file(
+        self,
+        local_path: str,
+        s3_key: str,
+        dry_run: bool = False,
+        file_size: Optional[int] = None
+    ) -> bool:
+        """
+        단일 파일을 S3에 업로드
+        
+        Args:
+            local_path: 로컬 파일 경로
+            s3_key: S3 키 (버킷 내 경로)
+            dry_run: True면 실제 업로드 없이 미리보기만
+            file_size: 이미 알고 있는 파일 크기 (None이면 직접 조회)
+            
+        Returns:
+            성공 여부
+        """
+        timer = None
+        try:
+            if file_size is None:
+                file_size = os.path.getsize(local_path)
+            
+            compress = self.compressor is not None and self.compressor.should_compress(local_path, file_size)
+            if dry_run:
+                suffix = f" ({self.compressor.codec} 압축)" if compress else ""
+                _log(f"   [DRY-RUN] {local_path} -> s3://{self.bucket_name}/{s3_key}{suffix}")
+                return True
+            
+            if compress:
+                timer = self.metrics.start(s3_key, "upload")
+                compressed_size = self._upload_compressed(local_path, s3_key, file_size, timer)
+                timer.finish(compressed_size, True)
+                self.progress.item(
+                    f"   ✓ {os.path.basename(local_path)} ({file_size / (1024*1024):.2f} MB -> "
+                    f"{compressed_size / (1024*1024):.2f} MB {self.compressor.codec})"
+                )
+                return True
+            
+            etag = None
+            if self.dedup is not None and file_size >= self.dedup.min_size:
+                etag = self.dedup.file_etag(local_path, file_size, self._upload_part_size(file_size))
+                if self._copy_duplicate(etag, file_size, s3_key):
+                    return True
+            
+            timer = self.metrics.start(s3_key, "upload")
+            if (self.journal is not None
+                    and file_size >= self.transfer_settings["multipart_threshold"]):
+                file_size = self._resumable_multipart_upload(local_path, s3_key, timer)
+            else:
+                self.s3.upload_file(
+                    local_path, self.bucket_name, s3_key,
+                    **self._transfer_kwargs(file_size, timer)
+                )
+            timer.finish(file_size, True)
+            if etag is not None:
+                self.dedup.record(self.bucket_name, etag, file_size, s3_key)
+            self.progress.item(f"   ✓ {os.path.basename(local_path)} ({file_size / (1024*1024):.2f} MB)")
+            return True
+            
+        except Exception as e:
+            if timer is not None:
+                timer.finish(0, False)
+            self.error_stats.record_error(e)
+            _log(f"   ❌ {os.path.basename(local_path)}: {e}")
+            return False
+    
+    def upload_stream(self, stream, s3_key: str, dry_run: bool = False) -> dict:
+        """
+        크기를 모르는 바이트 스트림(표준 입력, 파이프)을 임시 파일 없이 멀티파트 업로드
+        
+        boto3 관리형 전송이 스트림을 파트 크기만큼씩 읽어 올리므로 메모리에는 최대
+        max_in_memory_upload_chunks개 파트만 들고 있습니다. 스트림이 파트 하나보다 작으면
+        단일 PUT으로 올립니다. 파트 수 제한(10,000)이 있으므로 파트 크기 × 10,000보다
+        큰 스트림은 --multipart-chunksize를 늘려야 합니다.
+        
+        Args:
+            stream: 읽을 바이너리 스트림 (예: sys.stdin.buffer)
+            s3_key: 업로드할 S3 키
+            dry_run: True면 스트림을 읽지 않고 대상만 출력
+            
+        Returns:
+            업로드 통계 (uploaded_count, failed_count, total_size, elapsed_time)
+        """
+        config = self.transfer_config()
+        upload_start_time = datetime.now()
+        
+        print(f"\n{'='*70}")
+        print(f"📤 {'[DRY-RUN] ' if dry_run else ''}스트림 업로드")
+        print(f"{'='*70}")
+        print(f"☁️  S3:   s3://{self.bucket_name}/{s3_key}")
+        print(f"💾 메모리 버퍼: 최대 {config.max_in_memory_upload_chunks * config.multipart_chunksize / (1024*1024):.0f} MB "
+              f"(파트 {config.multipart_chunksize / (1024*1024):.0f} MB, "
+              f"최대 스트림 크기 {config.multipart_chunksize * MAX_MULTIPART_PARTS / (1024*1024*1024):.0f} GB)\n")
+        
+        if dry_run:
+            return {"uploaded_count": 0, "failed_count": 0, "total_size": 0}
+        
+        timer = self.metrics.start(s3_key, "upload")
+        uploaded = {"bytes": 0}
+        callback = self._byte_callback(timer)
+        
+        def count_bytes(nbytes: int):
+            uploaded["bytes"] += nbytes
+            callback(nbytes)
+        
+        self.progress.start()
+        try:
+            self.s3.upload_fileobj(stream, self.bucket_name, s3_key, Config=config, Callback=count_bytes)
+            timer.finish(uploaded["bytes"], True)
+            success = True
+        except Exception as e:
+            timer.finish(0, False)
+            self.error_stats.record_error(e)
+            _log(f"   ❌ 스트림 업로드 실패: {e}")
+            success = False
+        finally:
+            self.progress.stop()
+        
+        if success:
+            self._invalidate_cache(s3_key)
+        elapsed = datetime.now() - upload_start_time
+        seconds = max(elapsed.total_seconds(), 1e-6)
+        
+        if success:
+            print(f"✅ 업로드 완료: {uploaded['bytes'] / (1024*1024):.2f} MB "
+                  f"({uploaded['bytes'] / (1024*1024) / seconds:.2f} MB/s, {elapsed})")
+        self.error_stats.print_summary(0)
+        print()
+        
+        return {
+            "uploaded_count": 1 if success else 0,
+            "failed_count": 0 if success else 1,
+            "total_size": uploaded["bytes"],
+            "elapsed_time": elapsed
+        }
+    
+    def _upload_compressed(self, local_path: str, s3_key: str, file_size: int, timer: ObjectTimer) -> int:
+        """
+        파일을 읽는 대로 압축하면서 업로드
+        
+        압축 후 크기를 미리 알 수 없으므로 크기를 모르는 스트림처럼 upload_fileobj로
+        올립니다 (큰 파일은 멀티파트). 같은 내용이어도 압축 결과의 ETag가 로컬 파일과
+        다르므로 중복 제거와 저널 멀티파트 재개는 사용하지 않습니다.
+        
+        Returns:
+            압축 후 크기 (실제로 전송한 바이트)
+        """
+        codec = self.compressor.codec
+        reader = CompressedReader(local_path, codec)
+        try:
+            self.s3.upload_fileobj(
+                reader, self.bucket_name, s3_key,
+                ExtraArgs={
+                    "ContentEncoding": codec,
+                    "Metadata": {"uncompressed-size": str(file_size)}
+                },
+                **self._transfer_kwargs(file_size, timer)
+            )
+        finally:
+            reader.close()
+        self.compressor.record(file_size, reader.compressed_bytes)
+        return reader.compressed_bytes
+    
+    def _copy_duplicate(self, etag: str, file_size: int, s3_key: str) -> bool:
+        """
+        같은 내용의 객체가 이미 있으면 업로드 대신 서버 측 복사
+        
+        중복 제거 인덱스에 없으면 인벤토리 캐시에서 ETag가 같은 객체를 찾습니다.
+        CopySourceIfMatch로 원본이 아직 같은 내용일 때만 복사하고, 원본이 없어졌거나
+        바뀌었으면 인덱스에서 지운 뒤 False를 반환해 일반 업로드로 진행합니다.
+        
+        Returns:
+            복사했으면 True
+        """
+        source_key = self.dedup.lookup(self.bucket_name, etag, file_size)
+        if source_key is None and self.inventory is not None:
+            source_key = self.inventory.find_by_etag(self.bucket_name, etag, file_size)
+        if source_key is None or source_key == s3_key:
+            return False
+        
+        try:
+            self._server_copy(source_key, s3_key, file_size, etag)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code not in ("404", "NoSuchKey", "412", "PreconditionFailed"):
+                raise
+            self.dedup.forget(self.bucket_name, etag, file_size)
+            return False
+        
+        self.dedup.record(self.bucket_name, etag, file_size, s3_key)
+        self.dedup.record_copy(file_size)
+        self.progress.item(f"   ♻️  {os.path.basename(s3_key)} -> {source_key} 복사 (중복, {file_size / (1024*1024):.2f} MB)")
+        return True
+    
+    def _server_copy(self, source_key: str, dest_key: str, file_size: int, etag: Optional[str] = None):
+        """
+        버킷 안에서 서버 측 복사 (데이터가 이 호스트를 거치지 않음)
+        
+        multipart_threshold보다 작은 객체는 copy_object 한 번으로, 큰 객체는
+        관리형 복사로 upload_part_copy 파트를 max_concurrency개씩 동시에 복사합니다.
+        etag를 지정하면 원본이 그 내용일 때만 복사합니다 (CopySourceIfMatch).
+        """
+        timer = self.metrics.start(dest_key, "copy")
+        source = {"Bucket": self.bucket_name, "Key": source_key}
+        if_match = {}
+        if etag:
+            if_match["CopySourceIfMatch"] = '"' + etag.strip('"') + '"'
+        try:
+            if file_size < self.transfer_settings["multipart_threshold"]:
+                self.s3.copy_object(CopySource=source, Bucket=self.bucket_name, Key=dest_key, **if_match)
+            else:
+                self.s3.copy(
+                    source, self.bucket_name, dest_key,
+                    ExtraArgs=if_match or None,
+                    Config=self.transfer_config(file_size)
+                )
+        except Exception:
+            timer.finish(0, False)
+            raise
+        timer.finish(0, True)
+    
+    def copy_object(
+        self,
+        source_key: str,
+        dest_key: str,
+        dry_run: bool = False,
+        file_size: Optional[int] = None,
+        etag: Optional[str] = None
+    ) -> bool:
+        """
+        단일 객체 서버 측 복사
+        
+        Args:
+            source_key: 원본 S3 키
+            dest_key: 대상 S3 키
+            dry_run: True면 실제 복사 없이 미리보기만
+            file_size: 이미 알고 있는 객체 크기 (None이면 HEAD로 조회)
+            etag: 목록 조회에서 받은 원본 ETag (복사 중 원본이 바뀌면 실패 처리)
+            
+        Returns:
+            성공 여부
+        """
+        try:
+            if dry_run:
+                _log(f"   [DRY-RUN] s3://{self.bucket_name}/{source_key} -> {dest_key}")
+                return True
+            
+            if file_size is None:
+                head = self.s3.head_object(Bucket=self.bucket_name, Key=source_key)
+                file_size, etag = head['ContentLength'], head.get('ETag')
+            
+            self._server_copy(source_key, dest_key, file_size, etag)
+            self.progress.item(f"   ✓ {source_key} -> {dest_key} ({file_size / (1024*1024):.2f} MB)")
+            return True
+        
+        except Exception as e:
+            self.error_stats.record_error(e)
+            _log(f"   ❌ {source_key}: {e}")
+            return False
+    
+    def _resumable_multipart_upload(
+        self,
+        local_path: str,
+        s3_key: str,
+        timer: Optional[ObjectTimer] = None
+    ) -> int:
+        """
+        저널에 진행 상황을 기록하며 멀티파트 업로드
+        
+        파일 크기와 수정 시각은 연 파일에서 직접 조회하므로 계획/목록 조회 이후 파일이
+        바뀌어도 잘린 객체를 만들지 않습니다. 저널에 크기와 수정 시각이 같은 진행 중
+        업로드가 있으면 list_parts로 서버에 남아 있는 파트를 확인하고 나머지 파트만
+        업로드합니다. 파트는 읽은 뒤 메모리에 들고 올리므로 모든 워커를 통틀어 동시에
+        올리는 파트 수를 max_concurrency개로 제한합니다. 업로드 중에 파일이 바뀌면
+        완료하지 않고 실패 처리합니다.
+        
+        Returns:
+            업로드한 크기
+        """
+        with open(local_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+        file_size, mtime = stat.st_size, stat.st_mtime
+        part_size = self.part_size_for(file_size)
+        parts = {}
+        upload_id = None
+        
+        state = self.journal.multipart.get(s3_key)
+        if state and state["size"] == file_size and state.get("mtime") == mtime:
+            try:
+                paginator = self.s3.get_paginator('list_parts')
+                for page in paginator.paginate(
+                    Bucket=self.bucket_name, Key=s3_key, UploadId=state["upload_id"]
+                ):
+                    for part in page.get('Parts', []):
+                        parts[part['PartNumber']] = part['ETag']
+                upload_id = state["upload_id"]
+                part_size = state["part_size"]
+                self.progress.item(f"   ↻ {os.path.basename(local_path)}: 완료된 파트 {len(parts)}개를 제외하고 이어서 업로드")
+            except ClientError:
+                parts = {}
+        elif state:
+            # 파일이 바뀌었으므로 이전 업로드는 버림
+            self.progress.item(f"   ↻ {os.path.basename(local_path)}: 이전 업로드 이후 파일이 바뀌어 처음부터 업로드")
+            try:
+                self.s3.abort_multipart_upload(
+                    Bucket=self.bucket_name, Key=s3_key, UploadId=state["upload_id"]
+                )
+            except ClientError:
+                pass
+        
+        if upload_id is None:
+            response = self.s3.create_multipart_upload(Bucket=self.bucket_name, Key=s3_key)
+            upload_id = response['UploadId']
+            self.journal.start_multipart(s3_key, upload_id, file_size, mtime, part_size)
+        
+        part_count = -(-file_size // part_size)
+        on_bytes = self._byte_callback(timer)
+        
+        def upload_part(part_number: int):
+            offset = (part_number - 1) * part_size
+            expected = min(part_size, file_size - offset)
+            with self._part_slots:
+                with open(local_path, 'rb') as f:
+                    f.seek(offset)
+                    body = f.read(part_size)
+                if len(body) != expected:
+                    raise IOError(f"업로드 중 파일이 바뀌었습니다: {local_path} (파트 {part_number})")
+                if on_bytes is not None:
+                    on_bytes(len(body))
+                response = self.s3.upload_part(
+                    Bucket=self.bucket_name, Key=s3_key, UploadId=upload_id,
+                    PartNumber=part_number, Body=body
+                )
+            parts[part_number] = response['ETag']
+            self.journal.record_part(s3_key, upload_id, part_number, response['ETag'])
+        
+        missing = (n for n in range(1, part_count + 1) if n not in parts)
+        run_bounded(upload_part, missing, self.transfer_settings["max_concurrency"])
+        
+        stat = os.stat(local_path)
+        if (stat.st_size, stat.st_mtime) != (file_size, mtime):
+            raise IOError(f"업로드 중 파일이 바뀌었습니다: {local_path}")
+        
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket_name, Key=s3_key, UploadId=upload_id,
+            MultipartUpload={"Parts": [
+                {"PartNumber": n, "ETag": parts[n]} for n in range(1, part_count + 1)
+            ]}
+        )
+        return file_size
+    
+    def open_journal(self, operation: str, local_root: str, s3_path: str, output_dir: str) -> TransferJournal:
+        """
+        작업별 체크포인트 저널 열기 (있으면 이어서 사용)
+        
+        같은 작업(명령, 로컬 경로, 버킷/S3 경로)은 항상 같은 저널 파일을 사용하므로
+        중단된 작업을 같은 인자로 다시 실행하면 완료된 키는 건너뜁니다.
+        
+        Args:
+            operation: 작업 이름 (upload, download, sync 등)
+            local_root: 로컬 경로
+            s3_path: S3 경로
+            output_dir: 저널을 저장할 디렉토리
+            
+        Returns:
+            TransferJournal
+        """
+        job = f"{operation}|{os.path.abspath(local_root)}|{self.bucket_name}/{s3_path}"
+        if self.shard_count > 1:
+            # 같은 호스트에서 여러 샤드를 동시에 돌려도 저널이 겹치지 않도록
+            job += f"|shard {self.shard_index}/{self.shard_count}"
+        job_id = hashlib.md5(job.encode('utf-8')).hexdigest()[:12]
+        self.journal = TransferJournal(os.path.join(output_dir, f"journal_{operation}_{job_id}.jsonl"))
+        
+        if self.journal.completed or self.journal.multipart:
+            print(f"📒 저널에서 이어서 진행: {self.journal.path}")
+            print(f"   완료된 키: {len(self.journal.completed)}개, "
+                  f"진행 중 멀티파트: {len(self.journal.multipart)}개\n")
+        return self.journal
+    
+    def in_shard(self, s3_key: str) -> bool:
+        """이 호스트가 맡은 샤드의 키인지 (샤드를 나누지 않으면 항상 True)"""
+        return self.shard_count <= 1 or shard_for_key(s3_key, self.shard_count) == self.shard_index
+    
+    def write_report(self, path: str, operation: str, local_root: str, s3_path: str, result: dict):
+        """
+        작업 결과를 merge-reports로 합칠 수 있는 JSON 파일로 저장
+        
+        Args:
+            path: 결과 파일 경로
+            operation: 작업 이름 (upload, download, sync)
+            local_root: 로컬 경로
+            s3_path: S3 경로
+            result: upload_folder 등이 반환한 통계
+        """
+        scalars = {}
+        for name, value in result.items():
+            if isinstance(value, timedelta):
+                scalars[name] = value.total_seconds()
+            elif isinstance(value, (int, float, str, bool)):
+                scalars[name] = value
+        
+        report = {
+            "operation": operation,
+            "bucket": self.bucket_name,
+            "s3_path": s3_path,
+            "local_path": os.path.abspath(local_root),
+            "shard_index": self.shard_index,
+            "shard_count": self.shard_count,
+            "host": socket.gethostname(),
+            "finished_at": datetime.now().isoformat(),
+            "result": scalars,
+            "errors": self.error_stats.to_dict()
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        print(f"💾 결과 저장: {path}")
+    
+    def write_metrics(self, json_path: Optional[str] = None, prometheus_path: Optional[str] = None):
+        """
+        수집한 전송 지표 저장
+        
+        Args:
+            json_path: 요약과 객체별 기록을 저장할 JSON 파일 경로
+            prometheus_path: node_exporter textfile collector용 .prom 파일 경로
+        """
+        if json_path:
+            self.metrics.write_json(json_path, {
+                "bucket": self.bucket_name,
+                "workers": self.max_workers,
+                "transfer_profile": self.transfer_profile,
+                "transfer_settings": self.transfer_settings,
+                "adaptive_chunksize": self.adaptive_chunksize,
+                "retries": self.error_stats.to_dict()
+            })
+            print(f"💾 지표 저장: {json_path}")
+        if prometheus_path:
+            self.metrics.write_prometheus(prometheus_path, self.error_stats)
+            print(f"💾 Prometheus 지표 저장: {prometheus_path}")
+    
+    def close_journal(self, completed: bool):
+        """
+        저널 닫기
+        
+        Args:
+            completed: True면 작업이 모두 끝난 것이므로 저널 파일 삭제
+        """
+        if self.journal is None:
+            return
+        self.journal.close(remove=completed)
+        if not completed and self.journal.path.exists():
+            print(f"📒 같은 명령을 --resume으로 다시 실행하면 이어서 진행합니다: {self.journal.path}")
+        self.journal = None
+    
+    def _new_pool(self, handler, dry_run: bool = False) -> TransferPool:
+        """설정된 워커 수와 실패 재시도 횟수로 TransferPool 생성 (dry-run이 아니면 진행 상황 표시)"""
+        return TransferPool(
+            handler, self.max_workers, retry_passes=self.retry_passes,
+            progress=None if dry_run else self.progress
+        )
+    
+    def _upload_handler(self, dry_run: bool):
+        """TransferPool용 업로드 작업 함수 생성. 작업은 (로컬 경로, S3 키, 크기)"""
+        def handle(item):
+            local_path, s3_key, file_size = item
+            mtime = None
+            if self.journal is not None:
+                # 크기가 같아도 다시 쓴 파일은 올려야 하므로 수정 시각도 함께 확인
+                with contextlib.suppress(OSError):
+                    stat = os.stat(local_path)
+                    file_size, mtime = stat.st_size, stat.st_mtime
+                if self.journal.is_done(s3_key, file_size, mtime):
+                    return None, 0
+            success = self.upload_file(local_path, s3_key, dry_run, file_size=file_size)
+            if success and not dry_run and self.journal is not None:
+                self.journal.mark_done(s3_key, file_size, mtime)
+            return success, file_size
+        return handle
+    
+    def plan_upload(
+        self,
+        local_root: str,
+        s3_base_path: str,
+        pack_threshold: Optional[int] = None,
+        order: str = "scan"
+    ) -> TransferPlan:
+        """
+        os.scandir로 폴더를 한 번 탐색해서 업로드 계획 생성
+        
+        탐색하면서 크기/수정 시각을 함께 수집하므로 이후 업로드 중에는 파일 정보를
+        다시 조회하지 않고, 전체 개수와 크기를 전송 전에 알 수 있습니다.
+        샤드를 나눈 경우에는 이 호스트가 맡은 키만 계획에 넣습니다.
+        
+        Args:
+            local_root: 로컬 폴더 경로
+            s3_base_path: S3 기본 경로
+            pack_threshold: 지정하면 이보다 작은 파일은 tar 샤드로 묶는 pack 항목
+            order: 전송 순서 (scan: 경로순, largest: 큰 파일부터, smallest: 작은 파일부터)
+            
+        Returns:
+            TransferPlan
+        """
+        entries = []
+        for relative_path, local in self._scan_local(local_root).items():
+            if not self.in_shard(f"{s3_base_path}/{relative_path}"):
+                continue
+            entries.append({
+                "action": "pack" if pack_threshold and local["size"] < pack_threshold else "upload",
+                "key": f"{s3_base_path}/{relative_path}",
+                "path": relative_path,
+                "size": local["size"],
+                "mtime": local["mtime"]
+            })
+        
+        plan = TransferPlan(local_root, s3_base_path, entries, order, pack_threshold)
+        plan.sort(order)
+        return plan
+    
+    def _submit_plan(self, pool: TransferPool, plan: TransferPlan, packer: Optional[TarShardPacker] = None):
+        """계획 항목을 업로드 작업으로 제출 (pack 항목은 packer의 tar 샤드에 추가)"""
+        uploads = [entry for entry in plan.entries if packer is None or entry["action"] == "upload"]
+        if pool.progress is not None:
+            pool.progress.set_total(len(uploads), sum(entry["size"] for entry in uploads))
+        
+        for entry in plan.entries:
+            if packer is not None and entry["action"] == "pack":
+                packer.add(plan.local_path(entry), entry["path"], entry["size"])
+            else:
+                pool.submit((plan.local_path(entry), entry["key"], entry["size"]))
+        
+        if packer is not None:
+            packer.flush()
+    
+    def upload_folder(
+        self,
+        local_root: str,
+        s3_base_path: str,
+        dry_run: bool = False,
+        pack_threshold: Optional[int] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        order: str = "scan",
+        plan_path: Optional[str] = None,
+        verify: bool = False
+    ) -> dict:
+        """
+        폴더 전체를 S3에 업로드 (계획 생성 후 실행)
+        
+        Args:
+            local_root: 로컬 폴더 경로
+            s3_base_path: S3 기본 경로
+            dry_run: True면 실제 업로드 없이 계획만 출력
+            pack_threshold: 지정하면 이보다 작은 파일은 tar 샤드로 묶어서 업로드
+            shard_size: tar 샤드 하나의 최대 크기
+            order: 전송 순서 (scan, largest, smallest)
+            plan_path: 지정하면 계획을 이 파일로 저장 (execute-plan으로 실행 가능)
+            verify: True면 업로드 후 로컬에서 계산한 ETag와 S3 ETag 비교
+            
+        Returns:
+            업로드 통계 (uploaded_count, total_size, elapsed_time)
+        """
+        if not os.path.exists(local_root):
+            print(f"❌ 경로가 존재하지 않습니다: {local_root}")
+            return {"uploaded_count": 0, "total_size": 0}
+        
+        plan = self.plan_upload(local_root, s3_base_path, pack_threshold, order)
+        if plan_path:
+            plan.save(plan_path)
+            print(f"💾 전송 계획 저장: {plan_path} ({plan.total_files}개 파일)")
+        
+        return self.execute_plan(plan, dry_run, shard_size, verify)
+    
+    def execute_plan(
+        self,
+        plan: TransferPlan,
+        dry_run: bool = False,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        verify: bool = False
+    ) -> dict:
+        """
+        업로드 계획 실행
+        
+        Args:
+            plan: plan_upload() 또는 TransferPlan.load()로 만든 계획
+            dry_run: True면 실제 업로드 없이 계획만 출력
+            shard_size: tar 샤드 하나의 최대 크기 (pack 항목이 있을 때)
+            verify: True면 업로드 후 upload 항목의 ETag 검증
+            
+        Returns:
+            업로드 통계 (uploaded_count, total_size, elapsed_time)
+        """
+        upload_start_time = datetime.now()
+        # 계획 이후 바뀐 파일을 계획 크기대로 올리면 잘리거나 통계가 틀리므로 실행 직전에 다시 확인
+        changed, missing = plan.refresh()
+        
+        print(f"\n{'='*70}")
+        print(f"📁 {'[DRY-RUN] ' if dry_run else ''}폴더 업로드")
+        print(f"{'='*70}")
+        print(f"📂 로컬: {plan.local_root}")
+        print(f"☁️  S3:   s3://{self.bucket_name}/{plan.s3_prefix}/")
+        print(f"📝 계획: {plan.total_files}개 파일, {plan.total_bytes / (1024*1024*1024):.2f} GB (순서: {plan.order})")
+        if changed:
+            print(f"🔄 계획 이후 바뀐 파일: {changed}개 (현재 크기/수정 시각으로 갱신)")
+        if missing:
+            print(f"❌ 계획 이후 사라진 파일: {len(missing)}개")
+            for entry in missing:
+                _log(f"   ❌ {entry['path']}: 파일이 없습니다")
+        print()
+        
+        if dry_run:
+            plan.print_plan()
+            print()
+            return {
+                "planned_count": plan.total_files,
+                "uploaded_count": 0,
+                "failed_count": len(missing),
+                "total_size": plan.total_bytes
+            }
+        
+        pool = self._new_pool(self._upload_handler(dry_run), dry_run)
+        
+        with tempfile.TemporaryDirectory(prefix="s3_pack_") as work_dir:
+            packer = None
+            if plan.pack_threshold:
+                packer = TarShardPacker(pool, plan.s3_prefix, shard_size, work_dir, dry_run)
+            
+            self._submit_plan(pool, plan, packer)
+            stats = pool.join()
+            if packer is not None:
+                packer.finish(self)
+        
+        self._invalidate_cache(plan.s3_prefix)
+        
+        elapsed = datetime.now() - upload_start_time
+        
+        print(f"\n{'='*70}")
+        print(f"✅ 업로드 완료!")
+        print(f"{'='*70}")
+        print(f"📊 파일 개수: {stats.success_count}개")
+        if packer is not None and packer.packed_count:
+            print(f"🗜️  샤드로 묶은 작은 파일: {packer.packed_count}개 (샤드 {len(packer.shards)}개)")
+        failed_count = stats.failed_count + len(missing)
+        if failed_count:
+            print(f"❌ 실패: {failed_count}개")
+        if stats.skipped_count:
+            print(f"⏭️  이미 완료되어 건너뜀: {stats.skipped_count}개")
+        print(f"📦 총 크기: {stats.total_bytes / (1024*1024*1024):.2f} GB")
+        if self.dedup is not None:
+            self.dedup.print_summary()
+        if self.compressor is not None:
+            self.compressor.print_summary()
+        print(f"⏱️  소요시간: {elapsed}")
+        if self.max_workers > 1:
+            stats.print_summary()
+        self.error_stats.print_summary(stats.retried_count)
+        self.metrics.print_summary()
+        print()
+        
+        result = {
+            "uploaded_count": stats.success_count,
+            "failed_count": failed_count,
+            "skipped_count": stats.skipped_count,
+            "packed_count": packer.packed_count if packer is not None else 0,
+            "total_size": stats.total_bytes,
+            "elapsed_time": elapsed
+        }
+        if verify:
+            result["verify"] = self.verify_folder(plan.local_root, plan.s3_prefix, plan)
+        return result
+    
+    def upload_specific_folders(
+        self,
+        base_dir: str,
+        folder_names: List[str],
+        s3_base_path: str,
+        dry_run: bool = False,
+        pack_threshold: Optional[int] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        order: str = "scan",
+        verify: bool = False
+    ) -> dict:
+        """
+        특정 폴더들만 선택적으로 업로드
+        
+        모든 폴더의 계획을 먼저 만든 뒤 하나의 TransferPool로 함께 업로드합니다.
+        작업은 폴더를 돌아가며 하나씩 제출(라운드 로빈)하므로 큰 파일이 많은
+        폴더가 있어도 다른 폴더의 작은 파일들이 그 뒤에서 기다리지 않고,
+        전체 소요시간이 폴더별 소요시간의 합이 아니라 대역폭에 맞춰집니다.
+        
+        Args:
+            base_dir: 기본 디렉토리 경로
+            folder_names: 업로드할 폴더명 리스트
+            s3_base_path: S3 기본 경로
+            dry_run: True면 실제 업로드 없이 미리보기만
+            pack_threshold: 지정하면 이보다 작은 파일은 폴더별 tar 샤드로 묶어서 업로드
+            shard_size: tar 샤드 하나의 최대 크기
+            order: 폴더별 전송 순서 (scan, largest, smallest)
+            verify: True면 업로드 후 폴더마다 ETag 검증
+            
+        Returns:
+            업로드 통계 (folders에 폴더별 소계 포함)
+        """
+        print(f"\n{'='*70}")
+        print(f"🎯 {'[DRY-RUN] ' if dry_run else ''}선택적 폴더 업로드")
+        print(f"{'='*70}")
+        print(f"📂 기본 경로: {base_dir}")
+        print(f"📋 대상 폴더: {', '.join(folder_names)}\n")
+        
+        upload_start_time = datetime.now()
+        
+        plans = {}
+        for folder_name in folder_names:
+            folder_path = os.path.join(base_dir, folder_name)
+            
+            if not os.path.exists(folder_path):
+                print(f"❗ 폴더를 찾을 수 없음: {folder_name}")
+                continue
+            
+            if not os.path.isdir(folder_path):
+                print(f"❗ 디렉토리가 아님: {folder_name}")
+                continue
+            
+            plan = self.plan_upload(folder_path, f"{s3_base_path}/{folder_name}", pack_threshold, order)
+            plans[folder_name] = plan
+            print(f"📁 [{folder_name}] {plan.total_files}개 파일, {plan.total_bytes / (1024*1024):.2f} MB")
+        
+        # 폴더별 결과 (키 -> 마지막 시도 결과). 재시도에 성공하면 덮어씀
+        results = {folder_name: {} for folder_name in plans}
+        results_lock = threading.Lock()
+        prefixes = sorted(
+            ((plan.s3_prefix + "/", folder_name) for folder_name, plan in plans.items()),
+            key=lambda pair: len(pair[0]), reverse=True
+        )
+        upload = self._upload_handler(dry_run)
+        
+        def handle(item):
+            success, nbytes = upload(item)
+            s3_key = item[1]
+            for prefix, folder_name in prefixes:
+                if s3_key.startswith(prefix):
+                    with results_lock:
+                        results[folder_name][s3_key] = (success, nbytes)
+                    break
+            return success, nbytes
+        
+        pool = self._new_pool(handle, dry_run)
+        
+        with tempfile.TemporaryDirectory(prefix="s3_pack_") as work_dir:
+            packers = {}
+            if pack_threshold:
+                for folder_name, plan in plans.items():
+                    packers[folder_name] = TarShardPacker(
+                        pool, plan.s3_prefix, shard_size,
+                        os.path.join(work_dir, str(len(packers))), dry_run
+                    )
+                    os.makedirs(packers[folder_name].work_dir)
+            
+            if pool.progress is not None:
+                uploads = [
+                    entry for plan in plans.values() for entry in plan.entries
+                    if not pack_threshold or entry["action"] == "upload"
+                ]
+                pool.progress.set_total(len(uploads), sum(entry["size"] for entry in uploads))
+            
+            for folder_name, entry in self._round_robin(plans):
+                plan = plans[folder_name]
+                packer = packers.get(folder_name)
+                if packer is not None and entry["action"] == "pack":
+                    packer.add(plan.local_path(entry), entry["path"], entry["size"])
+                else:
+                    pool.submit((plan.local_path(entry), entry["key"], entry["size"]))
+            
+            for packer in packers.values():
+                packer.flush()
+            stats = pool.join()
+            for packer in packers.values():
+                packer.finish(self)
+        
+        elapsed = datetime.now() - upload_start_time
+        
+        print(f"\n📋 폴더별 결과:")
+        folder_totals = {}
+        for folder_name, plan in plans.items():
+            outcomes = results[folder_name].values()
+            totals = folder_totals[folder_name] = {
+                "uploaded_count": sum(1 for success, _ in outcomes if success),
+                "failed_count": sum(1 for success, _ in outcomes if success is False),
+                "total_size": sum(nbytes for success, nbytes in outcomes if success)
+            }
+            line = (
+                f"   {'❌' if totals['failed_count'] else '✅'} {folder_name}: "
+                f"{totals['uploaded_count']}개 파일 ({totals['total_size'] / (1024*1024):.2f} MB)"
+            )
+            if totals["failed_count"]:
+                line += f", 실패 {totals['failed_count']}개"
+            if folder_name in packers and packers[folder_name].packed_count:
+                line += f", 샤드로 묶은 작은 파일 {packers[folder_name].packed_count}개"
+            print(line)
+            
+            if not dry_run:
+                self._invalidate_cache(plan.s3_prefix)
+        
+        total_mismatched = 0
+        if verify and not dry_run:
+            for plan in plans.values():
+                verify_result = self.verify_folder(plan.local_root, plan.s3_prefix, plan)
+                total_mismatched += len(verify_result["mismatched"]) + len(verify_result["missing"])
+        
+        total_packed = sum(packer.packed_count for packer in packers.values())
+        
+        print(f"\n{'='*70}")
+        print(f"✅ 모든 업로드 완료!")
+        print(f"{'='*70}")
+        print(f"📊 총 파일: {stats.success_count}개")
+        if total_packed:
+            print(f"🗜️  샤드로 묶은 작은 파일: {total_packed}개")
+        if stats.failed_count:
+            print(f"❌ 실패: {stats.failed_count}개")
+        if stats.skipped_count:
+            print(f"⏭️  이미 완료되어 건너뜀: {stats.skipped_count}개")
+        if total_mismatched:
+            print(f"⚠️  검증 실패: {total_mismatched}개")
+        print(f"📦 총 크기: {stats.total_bytes / (1024*1024*1024):.2f} GB")
+        if self.dedup is not None:
+            self.dedup.print_summary()
+        if self.compressor is not None:
+            self.compressor.print_summary()
+        print(f"⏱️  소요시간: {elapsed}")
+        if self.max_workers > 1:
+            stats.print_summary()
+        self.error_stats.print_summary(stats.retried_count)
+        self.metrics.print_summary()
+        print()
+        
+        return {
+            "uploaded_count": stats.success_count,
+            "failed_count": stats.failed_count,
+            "skipped_count": stats.skipped_count,
+            "packed_count": total_packed,
+            "mismatched_count": total_mismatched,
+            "total_size": stats.total_bytes,
+            "elapsed_time": elapsed,
+            "folders": folder_totals
+        }
+    
+    @staticmethod
+    def _round_robin(plans: dict):
+        """
+        폴더마다 계획 순서를 유지하면서 폴더를 돌아가며 항목을 하나씩 반환
+        
+        Yields:
+            (폴더명, 계획 항목)
+        """
+        iterators = [(folder_name, iter(plan.entries)) for folder_name, plan in plans.items()]
+        while iterators:
+            remaining = []
+            for folder_name, entries in iterators:
+                entry = next(entries, None)
+                if entry is not None:
+                    yield folder_name, entry
+                    remaining.append((folder_name, entries))
+            iterators = remaining
+    
+    def download_file(
+        self,
+        s3_key: str,
+        local_path: str,
+        dry_run: bool = False,
+        file_size: Optional[int] = None
+    ) -> bool:
+        """
+        S3에서 단일 파일 다운로드
+        
+        Args:
+            s3_key: S3 키
+            local_path: 로컬 저장 경로
+            dry_run: True면 실제 다운로드 없이 미리보기만
+            file_size: 목록 조회로 이미 알고 있는 객체 크기 (None이면 다운로드 후 조회)
+            
+        Returns:
+            성공 여부
+        """
+        timer = None
+        try:
+            if dry_run:
+                _log(f"   [DRY-RUN] s3://{self.bucket_name}/{s3_key} -> {local_path}")
+                return True
+            
+            # 디렉토리 생성
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            
+            timer = self.metrics.start(s3_key, "download")
+            if self.ranged_threshold and file_size and file_size >= self.ranged_threshold:
+                self.download_file_ranged(s3_key, local_path, file_size, timer=timer)
+            else:
+                self.s3.download_file(
+                    self.bucket_name, s3_key, local_path,
+                    **self._transfer_kwargs(file_size, timer)
+                )
+            if file_size is None:
+                file_size = os.path.getsize(local_path)
+            self._decompress_if_encoded(s3_key, local_path)
+            timer.finish(file_size, True)
+            self.progress.item(f"   ✓ {os.path.basename(local_path)} ({file_size / (1024*1024):.2f} MB)")
+            return True
+            
+        except Exception as e:
+            if timer is not None:
+                timer.finish(0, False)
+            self.error_stats.record_error(e)
+            _log(f"   ❌ {os.path.basename(local_path)}: {e}")
+            return False
+    
+    def _decompress_if_encoded(self, s3_key: str, local_path: str):
+        """
+        업로드 때 압축한 객체(Content-Encoding: gzip/zstd)면 받은 파일을 풀기
+        
+        받은 파일 앞부분이 gzip/zstd 형식일 때만 HEAD로 Content-Encoding을 확인하므로
+        압축하지 않은 객체에는 추가 요청이 없고, 원래 .gz인 파일은 그대로 둡니다.
+        """
+        with open(local_path, 'rb') as f:
+            header = f.read(4)
+        if not any(header.startswith(magic) for magic in COMPRESSION_MAGIC.values()):
+            return
+        
+        encoding = self.s3.head_object(Bucket=self.bucket_name, Key=s3_key).get("ContentEncoding", "")
+        if encoding in COMPRESSION_CODECS:
+            Compressor.decompress_file(local_path, encoding)
+    
+    def download_file_ranged(
+        self,
+        s3_key: str,
+        local_path: str,
+        file_size: Optional[int] = None,
+        etag: Optional[str] = None,
+        timer: Optional[ObjectTimer] = None
+    ):
+        """
+        큰 객체를 바이트 범위로 나눠 병렬 다운로드
+        
+        {local_path}.part 파일을 객체 크기만큼 미리 할당한 뒤 각 범위를 자기 위치에
+        os.pwrite로 바로 기록하고, 모두 끝나면 최종 이름으로 원자적으로 바꿉니다.
+        중간에 종료되어도 최종 이름에는 잘린 파일이 남지 않습니다. 모든 범위 요청에
+        IfMatch를 붙여 다운로드 도중 객체가 바뀌면 실패하도록 하고, 한 범위가 실패하면
+        남은 범위는 요청하지 않습니다.
+        
+        Args:
+            s3_key: S3 키
+            local_path: 로컬 저장 경로
+            file_size: 객체 크기 (None이면 HEAD로 조회)
+            etag: 객체 ETag (None이면 HEAD로 조회)
+            timer: 전송 계측용 타이머
+        """
+        if file_size is None or etag is None:
+            head = self.s3.head_object(Bucket=self.bucket_name, Key=s3_key)
+            file_size = head['ContentLength']
+            etag = head['ETag']
+        
+        part_size = self.part_size_for(file_size)
+        ranges = [
+            (start, min(start + part_size, file_size) - 1)
+            for start in range(0, file_size, part_size)
+        ]
+        temp_path = f"{local_path}.part"
+        on_bytes = self._byte_callback(timer)
+        
+        fd = os.open(temp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            # 디스크 공간을 미리 확보 (지원하지 않는 파일 시스템이면 크기만 설정)
+            try:
+                os.posix_fallocate(fd, 0, file_size)
+            except (AttributeError, OSError):
+                os.ftruncate(fd, file_size)
+            
+            def fetch(byte_range):
+                start, end = byte_range
+                response = self.s3.get_object(
+                    Bucket=self.bucket_name, Key=s3_key,
+                    Range=f"bytes={start}-{end}", IfMatch=etag
+                )
+                offset = start
+                for chunk in response['Body'].iter_chunks(RANGED_WRITE_CHUNK):
+                    if on_bytes is not None:
+                        on_bytes(len(chunk))
+                    if hasattr(os, "pwrite"):
+                        os.pwrite(fd, chunk, offset)
+                    else:
+                        # os.pwrite가 없는 플랫폼은 범위마다 별도 핸들로 기록
+                        with open(temp_path, 'r+b') as f:
+                            f.seek(offset)
+                            f.write(chunk)
+                    offset += len(chunk)
+                if offset != end + 1:
+                    raise IOError(f"범위 {start}-{end} 수신 크기 불일치: {offset - start} bytes")
+            
+            run_bounded(fetch, ranges, self.transfer_settings["max_concurrency"])
+            
+            os.fsync(fd)
+        except BaseException:
+            os.close(fd)
+            os.remove(temp_path)
+            raise
+        
+        os.close(fd)
+        os.replace(temp_path, local_path)
+    
+    @staticmethod
+    def _is_packed_shard(s3_key: str) -> bool:
+        """업로드 시 작은 파일을 묶어 만든 tar 샤드 키인지 확인"""
+        parts = s3_key.split("/")
+        return (
+            len(parts) >= 2 and parts[-2] == PACK_DIR_NAME
+            and PACK_SHARD_PATTERN.match(parts[-1]) is not None
+        )
+    
+    def _download_shard(
+        self,
+        s3_key: str,
+        shard_path: str,
+        dry_run: bool = False,
+        filter_prefix: Optional[str] = None
+    ) -> bool:
+        """
+        tar 샤드를 내려받아 원래 폴더 구조로 풀기
+        
+        샤드는 {폴더}/_packed/shard-NNNNN.tar에 있으므로 {폴더}에 풉니다.
+        경로 조작(절대 경로, ..)이 있는 항목은 건너뜁니다. 샤드 안 파일들은 목록에
+        나오지 않으므로 객체 필터는 풀 때 tar 항목의 경로/크기/수정 시각에 적용합니다.
+        
+        Args:
+            s3_key: 샤드 S3 키
+            shard_path: 샤드를 그대로 받았을 때의 로컬 경로
+            dry_run: True면 실제 다운로드 없이 미리보기만
+            filter_prefix: 객체 필터의 상대 경로 기준 프리픽스 (다운로드한 S3 경로)
+            
+        Returns:
+            성공 여부
+        """
+        extract_dir = os.path.dirname(os.path.dirname(shard_path))
+        if dry_run:
+            _log(f"   [DRY-RUN] s3://{self.bucket_name}/{s3_key} -> {extract_dir}/ (풀기)")
+            return True
+        
+        timer = self.metrics.start(s3_key, "download")
+        try:
+            os.makedirs(extract_dir, exist_ok=True)
+            with tempfile.TemporaryFile(dir=extract_dir) as f:
+                self.s3.download_fileobj(self.bucket_name, s3_key, f, **self._transfer_kwargs(timer=timer))
+                shard_size = f.tell()
+                f.seek(0)
+                with tarfile.open(fileobj=f, mode="r") as tar:
+                    members = [
+                        m for m in tar.getmembers()
+                        if m.isfile() and not os.path.isabs(m.name)
+                        and ".." not in m.name.split("/")
+                    ]
+                    if self.object_filter is not None:
+                        folder = s3_key.rsplit("/", 2)[0]
+                        at_root = folder.strip("/") == (filter_prefix or "").strip("/")
+                        base = "" if at_root else self._relative_key(folder, filter_prefix or "")
+                        members = [
+                            m for m in members
+                            if self.object_filter.matches(
+                                f"{base}/{m.name}" if base else m.name, m.size,
+                                datetime.fromtimestamp(m.mtime, timezone.utc)
+                            )
+                        ]
+                    # 지원되는 Python에서는 tarfile의 안전 필터도 함께 사용
+                    extract_options = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+                    tar.extractall(extract_dir, members=members, **extract_options)
+            timer.finish(shard_size, True)
+            self.progress.item(f"   ✓ {os.path.basename(s3_key)} -> 작은 파일 {len(members)}개 풀기")
+            return True
+        
+        except Exception as e:
+            timer.finish(0, False)
+            self.error_stats.record_error(e)
+            _log(f"   ❌ {os.path.basename(s3_key)}: {e}")
+            return False
+    
+    @staticmethod
+    def _relative_key(s3_key: str, s3_prefix: str) -> str:
+        """프리픽스 기준 상대 키 ("/" 구분)"""
+        prefix = s3_prefix.strip("/")
+        if not prefix:
+            return s3_key
+        if s3_key == prefix:
+            return s3_key.rsplit("/", 1)[-1]
+        return s3_key[len(prefix):].lstrip("/")
+    
+    def _download_handler(
+        self,
+        dry_run: bool,
+        preserve_mtime: bool = False,
+        unpack: bool = False,
+        s3_prefix: Optional[str] = None
+    ):
+        """
+        TransferPool용 다운로드 작업 함수 생성. 작업은 (S3 키, 로컬 경로, 크기, LastModified, ETag)
+        
+        Args:
+            dry_run: True면 실제 다운로드 없이 미리보기만
+            preserve_mtime: True면 받은 파일의 수정 시각을 LastModified로 맞춤
+            unpack: True면 tar 샤드는 받는 대신 원래 파일들로 풀기
+            s3_prefix: 다운로드하는 S3 경로 (tar 샤드 안 파일에 객체 필터를 적용할 때 기준)
+        """
+        def handle(item):
+            s3_key, local_path, file_size, last_modified, etag = item
+            # 같은 크기로 덮어쓴 객체도 다시 받도록 ETag까지 확인 (LastModified는 초 단위라 부족)
+            if self.journal is not None and self.journal.is_done(s3_key, file_size, etag):
+                return None, 0
+            if unpack and self._is_packed_shard(s3_key):
+                success = self._download_shard(s3_key, local_path, dry_run, s3_prefix)
+            else:
+                success = self.download_file(s3_key, local_path, dry_run, file_size=file_size)
+            if success and not dry_run:
+                if preserve_mtime:
+                    mtime = last_modified.timestamp()
+                    os.utime(local_path, (mtime, mtime))
+                if self.journal is not None:
+                    self.journal.mark_done(s3_key, file_size, etag)
+            return success, file_size
+        return handle
+    
+    def download_folder(
+        self,
+        s3_prefix: str,
+        local_root: str,
+        dry_run: bool = False,
+        unpack: bool = True
+    ) -> dict:
+        """
+        S3 폴더 전체를 로컬로 다운로드
+        
+        목록 조회 페이지가 도착하는 대로 작업 큐에 넣고 워커들이 바로 다운로드하므로
+        목록 조회와 전송이 겹쳐서 진행됩니다. 크기 집계에는 목록의 Size를 사용합니다.
+        
+        Args:
+            s3_prefix: S3 경로 프리픽스
+            local_root: 로컬 저장 경로
+            dry_run: True면 실제 다운로드 없이 미리보기만
+            unpack: True면 업로드 시 묶은 tar 샤드를 원래 파일들로 풀기
+            
+        Returns:
+            다운로드 통계
+        """
+        download_start_time = datetime.now()
+        
+        print(f"\n{'='*70}")
+        print(f"📥 {'[DRY-RUN] ' if dry_run else ''}폴더 다운로드")
+        print(f"{'='*70}")
+        print(f"☁️  S3:   s3://{self.bucket_name}/{s3_prefix}/")
+        print(f"📂 로컬: {local_root}\n")
+        
+        pool = self._new_pool(self._download_handler(dry_run, unpack=unpack, s3_prefix=s3_prefix), dry_run)
+        
+        try:
+            for obj in self.iter_objects(s3_prefix, use_cache=dry_run):
+                s3_key = obj['Key']
+                if unpack and s3_key.endswith(f"/{PACK_DIR_NAME}/{PACK_INDEX_NAME}"):
+                    continue
+                if not self.in_shard(s3_key):
+                    continue
+                # tar 샤드는 풀 때 안의 파일마다 필터 적용
+                if (self.object_filter is not None
+                        and not (unpack and self._is_packed_shard(s3_key))
+                        and not self.object_filter.matches(
+                            self._relative_key(s3_key, s3_prefix), obj['Size'], obj['LastModified'])):
+                    continue
+                relative_path = os.path.relpath(s3_key, s3_prefix)
+                local_path = os.path.join(local_root, relative_path)
+                pool.submit((s3_key, local_path, obj['Size'], obj['LastModified'], obj.get('ETag')), obj['Size'])
+            
+            stats = pool.join()
+            elapsed = datetime.now() - download_start_time
+            
+            print(f"\n{'='*70}")
+            print(f"✅ 다운로드 완료!")
+            print(f"{'='*70}")
+            print(f"📊 파일 개수: {stats.success_count}개")
+            if stats.failed_count:
+                print(f"❌ 실패: {stats.failed_count}개")
+            if stats.skipped_count:
+                print(f"⏭️  이미 완료되어 건너뜀: {stats.skipped_count}개")
+            print(f"📦 총 크기: {stats.total_bytes / (1024*1024*1024):.2f} GB")
+            if self.object_filter is not None:
+                self.object_filter.print_summary()
+            print(f"⏱️  소요시간: {elapsed}")
+            if self.max_workers > 1:
+                stats.print_summary()
+            self.error_stats.print_summary(stats.retried_count)
+            self.metrics.print_summary()
+            print()
+            
+            return {
+                "downloaded_count": stats.success_count,
+                "failed_count": stats.failed_count,
+                "skipped_count": stats.skipped_count,
+                "total_size": stats.total_bytes,
+                "elapsed_time": elapsed
+            }
+            
+        except Exception as e:
+            pool.join()
+            print(f"❌ 다운로드 중 오류: {e}")
+            return {"downloaded_count": 0, "total_size": 0}
+    
+    def download_stream(self, s3_path: str, stream, dry_run: bool = False) -> dict:
+        """
+        객체 하나 또는 프리픽스 아래 모든 객체를 키 순서대로 이어서 스트림(표준 출력)으로 전송
+        
+        객체마다 GET 응답 본문을 받는 대로 앞에서부터 이어 쓰므로 디스크를 거치지 않고
+        tar, zstd, 검증 도구 등에 바로 파이프로 넘길 수 있습니다. (관리형 다운로드는 파트를
+        각자 위치에 쓰므로 여러 객체를 한 스트림에 이어 쓸 수 없습니다.) 업로드 때 압축한
+        객체(Content-Encoding: gzip/zstd)는 download_file과 마찬가지로 풀어서 씁니다.
+        객체 하나라도 실패하면 뒤의 출력이 어긋나므로 거기서 멈춥니다.
+        
+        Args:
+            s3_path: 객체 키 또는 프리픽스 ("/"로 끝나면 프리픽스로만 취급)
+            stream: 쓸 바이너리 스트림 (예: sys.stdout.buffer)
+            dry_run: True면 스트림에 아무것도 쓰지 않고 보낼 객체 목록과 크기만 출력
+            
+        Returns:
+            다운로드 통계 (downloaded_count, failed_count, total_size, elapsed_time)
+        """
+        download_start_time = datetime.now()
+        
+        objects = []
+        if not s3_path.endswith("/"):
+            try:
+                head = self.s3.head_object(Bucket=self.bucket_name, Key=s3_path)
+                objects.append((s3_path, head["ContentLength"]))
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') not in ("404", "NoSuchKey", "NotFound"):
+                    raise
+        if not objects:
+            prefix = s3_path.rstrip("/")
+            objects = sorted(
+                (obj['Key'], obj['Size']) for obj in self.iter_objects(prefix)
+                if (obj['Key'].startswith(prefix + "/") or not prefix)
+                and (self.object_filter is None or self.object_filter.matches(
+                    self._relative_key(obj['Key'], prefix), obj['Size'], obj['LastModified']))
+            )
+        
+        print(f"\n{'='*70}")
+        print(f"📥 {'[DRY-RUN] ' if dry_run else ''}스트림 다운로드 (표준 출력)")
+        print(f"{'='*70}")
+        print(f"☁️  S3:   s3://{self.bucket_name}/{s3_path}")
+        print(f"📝 객체: {len(objects)}개, {sum(size for _, size in objects) / (1024*1024):.2f} MB\n")
+        
+        if dry_run:
+            for s3_key, file_size in objects:
+                _log(f"   [DRY-RUN] s3://{self.bucket_name}/{s3_key} ({file_size / (1024*1024):.2f} MB) -> 표준 출력")
+            print()
+            return {"downloaded_count": 0, "failed_count": 0, "total_size": sum(size for _, size in objects)}
+        
+        downloaded = 0
+        total_bytes = 0
+        failed = False
+        self.progress.start()
+        self.progress.set_total(len(objects), sum(size for _, size in objects))
+        try:
+            for s3_key, file_size in objects:
+                timer = self.metrics.start(s3_key, "download")
+                on_bytes = self._byte_callback(timer)
+                try:
+                    response = self.s3.get_object(Bucket=self.bucket_name, Key=s3_key)
+                    body = reader = response['Body']
+                    encoding = response.get("ContentEncoding", "")
+                    if encoding in COMPRESSION_CODECS:
+                        reader = Compressor.open_decompressed(body, encoding)
+                    received = 0
+                    try:
+                        while True:
+                            chunk = reader.read(STREAM_WRITE_CHUNK)
+                            if not chunk:
+                                break
+                            if on_bytes is not None:
+                                # 진행 상황/대역폭 제한은 실제로 받은(압축된) 바이트 기준
+                                position = body.tell()
+                                on_bytes(position - received)
+                                received = position
+                            stream.write(chunk)
+                    finally:
+                        reader.close()
+                    stream.flush()
+                except BrokenPipeError:
+                    timer.finish(0, False)
+                    # 받는 쪽(head 등)이 먼저 닫힘. 종료 시 flush 오류가 나지 않도록 /dev/null로 바꿈
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), stream.fileno())
+                    _log("⚠️  출력 파이프가 닫혀 전송을 멈춥니다")
+                    failed = True
+                    break
+                except Exception as e:
+                    timer.finish(0, False)
+                    self.error_stats.record_error(e)
+                    _log(f"   ❌ {s3_key}: {e}")
+                    failed = True
+                    break
+                timer.finish(file_size, True)
+                self.progress.finished(True, file_size)
+                downloaded += 1
+                total_bytes += file_size
+        finally:
+            self.progress.stop()
+        
+        elapsed = datetime.now() - download_start_time
+        print(f"{'❌ 중단' if failed else '✅ 완료'}: {downloaded}/{len(objects)}개 객체, "
+              f"{total_bytes / (1024*1024):.2f} MB ({elapsed})")
+        self.error_stats.print_summary(0)
+        print()
+        
+        return {
+            "downloaded_count": downloaded,
+            "failed_count": len(objects) - downloaded,
+            "total_size": total_bytes,
+            "elapsed_time": elapsed
+        }
+    
+    def copy_prefix(
+        self,
+        source_prefix: str,
+        dest_prefix: str,
+        dry_run: bool = False,
+        delete_source: bool = False
+    ) -> dict:
+        """
+        프리픽스 아래 객체를 다른 프리픽스로 서버 측 복사 (delete_source면 이동)
+        
+        원본 목록을 조회하는 대로 워커들이 동시에 복사하며, 대상에 이미 복사된
+        객체가 있으면 건너뜁니다(중단 후 다시 실행해도 이어서 진행, _already_copied 참고).
+        이동은 복사에 성공한 원본만 delete_objects로 1000개씩 묶어 삭제합니다.
+        
+        Args:
+            source_prefix: 원본 S3 경로 (폴더 또는 객체 하나)
+            dest_prefix: 대상 S3 경로
+            dry_run: True면 실제 복사/삭제 없이 미리보기만
+            delete_source: True면 복사 후 원본 삭제 (move)
+            
+        Returns:
+            복사 통계 (copied_count, failed_count, deleted_count, total_size)
+        """
+        source = source_prefix.rstrip("/")
+        dest = dest_prefix.rstrip("/")
+        operation = "이동" if delete_source else "복사"
+        copy_start_time = datetime.now()
+        
+        print(f"\n{'='*70}")
+        print(f"🚚 {'[DRY-RUN] ' if dry_run else ''}서버 측 {operation}")
+        print(f"{'='*70}")
+        print(f"☁️  원본: s3://{self.bucket_name}/{source}/")
+        print(f"☁️  대상: s3://{self.bucket_name}/{dest}/\n")
+        
+        existing = {
+            obj['Key']: (obj['Size'], obj.get('ETag'), obj['LastModified'])
+            for obj in self.iter_objects(dest)
+        }
+        deleter = BatchDeleter(self.s3, self.bucket_name) if delete_source and not dry_run else None
+        
+        def handle(item):
+            source_key, dest_key, size, etag, last_modified = item
+            if self._already_copied((size, etag, last_modified), existing.get(dest_key)):
+                success = None
+            else:
+                success = self.copy_object(source_key, dest_key, dry_run, size, etag)
+            if deleter is not None and success is not False:
+                deleter.add(source_key)
+            return success, size
+        
+        pool = self._new_pool(handle, dry_run)
+        for obj in self.iter_objects(source):
+            key = obj['Key']
+            if key == source:
+                dest_key = dest
+            elif not source or key.startswith(source + "/"):
+                dest_key = f"{dest}/{key[len(source):].lstrip('/')}"
+            else:
+                continue
+            pool.submit((key, dest_key, obj['Size'], obj.get('ETag'), obj['LastModified']), obj['Size'])
+        
+        stats = pool.join()
+        if deleter is not None:
+            deleter.flush()
+        
+        if not dry_run:
+            self._invalidate_cache(dest)
+            if delete_source:
+                self._invalidate_cache(source)
+        
+        elapsed = datetime.now() - copy_start_time
+        
+        print(f"\n{'='*70}")
+        print(f"✅ {operation} 완료!")
+        print(f"{'='*70}")
+        print(f"📊 {operation}한 객체: {stats.success_count}개")
+        if stats.failed_count:
+            print(f"❌ 실패: {stats.failed_count}개")
+        if stats.skipped_count:
+            print(f"⏭️  대상에 이미 있어 건너뜀: {stats.skipped_count}개")
+        if deleter is not None:
+            print(f"🗑️  원본 삭제: {deleter.deleted_count}개")
+            if deleter.failed:
+                print(f"❌ 원본 삭제 실패: {len(deleter.failed)}개")
+        print(f"📦 총 크기: {stats.total_bytes / (1024*1024*1024):.2f} GB (전송량 0)")
+        print(f"⏱️  소요시간: {elapsed}")
+        if self.max_workers > 1:
+            stats.print_summary()
+        self.error_stats.print_summary(stats.retried_count)
+        print()
+        
+        return {
+            "copied_count": stats.success_count,
+            "failed_count": stats.failed_count + (len(deleter.failed) if deleter is not None else 0),
+            "skipped_count": stats.skipped_count,
+            "deleted_count": deleter.deleted_count if deleter is not None else 0,
+            "total_size": stats.total_bytes,
+            "elapsed_time": elapsed
+        }
+    
+    def _copy_part_count(self, file_size: int) -> int:
+        """_server_copy로 복사했을 때 대상 객체의 파트 수 (copy_object 한 번이면 0)"""
+        if file_size < self.transfer_settings["multipart_threshold"]:
+            return 0
+        # boto3 관리형 복사는 10,000 파트를 넘지 않도록 chunksize를 두 배씩 늘림
+        part_size = max(self.transfer_config(file_size).multipart_chunksize, MIN_PART_SIZE)
+        while -(-file_size // part_size) > MAX_MULTIPART_PARTS:
+            part_size *= 2
+        return -(-file_size // part_size)
+    
+    def _already_copied(self, source: tuple, dest: Optional[tuple]) -> bool:
+        """
+        대상 객체가 원본을 이미 복사한 것인지 (source, dest: (크기, ETag, LastModified))
+        
+        copy_object로 복사한 객체는 ETag가 원본과 같습니다. multipart_threshold 이상이라
+        관리형 복사(파트 복사)로 만든 객체는 ETag가 "-파트 수" 형식으로 바뀌므로, 크기가
+        같고 파트 수가 이 설정으로 복사했을 때와 같으며 원본보다 나중에 만들어졌으면
+        복사된 것으로 봅니다.
+        """
+        if dest is None or dest[0] != source[0]:
+            return False
+        source_etag = (source[1] or "").strip('"')
+        dest_etag = (dest[1] or "").strip('"')
+        if source_etag and dest_etag == source_etag:
+            return True
+        part_count = self._copy_part_count(source[0])
+        return part_count > 0 and dest_etag.endswith(f"-{part_count}") and dest[2] >= source[2]
+    
+    def delete_keys(self, keys, dry_run: bool = False) -> BatchDeleter:
+        """
+        키들을 1000개씩 묶어 delete_objects 요청을 워커 수만큼 동시에 보내 삭제
+        
+        Args:
+            keys: 삭제할 키 (iterable, 목록 조회 결과를 그대로 넘겨도 됨)
+            dry_run: True면 삭제할 키만 출력
+            
+        Returns:
+            삭제 결과 (deleted_count, failed)
+        """
+        deleter = BatchDeleter(self.s3, self.bucket_name)
+        
+        def handle(batch):
+            if dry_run:
+                for key in batch:
+                    _log(f"   [DRY-RUN] 삭제: s3://{self.bucket_name}/{key}")
+                return True, 0
+            return deleter.delete_batch(batch) == 0, 0
+        
+        pool = TransferPool(handle, self.max_workers)
+        batch = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= deleter.batch_size:
+                pool.submit(batch)
+                batch = []
+        if batch:
+            pool.submit(batch)
+        pool.join()
+        return deleter
+    
+    def delete_prefix(self, s3_prefix: str, dry_run: bool = False) -> dict:
+        """
+        프리픽스(폴더) 아래 모든 객체 삭제
+        
+        목록을 조회하는 대로 1000개씩 묶어 삭제하므로 객체 수와 관계없이
+        메모리 사용량이 일정하고, 객체 하나씩 DELETE를 보내는 것보다 요청 수가
+        1/1000로 줄어듭니다. "a/b"는 "a/b/..."와 "a/b" 키만 삭제합니다 ("a/bc"는 제외).
+        
+        Args:
+            s3_prefix: 삭제할 S3 경로
+            dry_run: True면 실제 삭제 없이 대상만 출력
+            
+        Returns:
+            삭제 통계 (deleted_count, failed_count, total_size)
+        """
+        prefix = s3_prefix.rstrip("/")
+        if not prefix:
+            print("❌ 버킷 전체 삭제는 지원하지 않습니다. --s3-path를 지정하세요.")
+            return {"deleted_count": 0, "failed_count": 0, "total_size": 0}
+        
+        delete_start_time = datetime.now()
+        
+        print(f"\n{'='*70}")
+        print(f"🗑️  {'[DRY-RUN] ' if dry_run else ''}프리픽스 삭제")
+        print(f"{'='*70}")
+        print(f"☁️  S3:   s3://{self.bucket_name}/{prefix}/\n")
+        
+        totals = {"count": 0, "size": 0}
+        
+        def matching_keys():
+            for obj in self.iter_objects(prefix):
+                key = obj['Key']
+                if key == prefix or key.startswith(prefix + "/"):
+                    totals["count"] += 1
+                    totals["size"] += obj['Size']
+                    yield key
+        
+        deleter = self.delete_keys(matching_keys(), dry_run)
+        if not dry_run:
+            self._invalidate_cache(prefix)
+        elapsed = datetime.now() - delete_start_time
+        
+        print(f"\n{'='*70}")
+        print(f"✅ {'삭제 대상 확인' if dry_run else '삭제'} 완료!")
+        print(f"{'='*70}")
+        if dry_run:
+            print(f"📊 삭제 대상: {totals['count']}개")
+        else:
+            print(f"📊 삭제한 객체: {deleter.deleted_count}개")
+            if deleter.failed:
+                print(f"❌ 실패: {len(deleter.failed)}개")
+        print(f"📦 총 크기: {totals['size'] / (1024*1024*1024):.2f} GB")
+        print(f"⏱️  소요시간: {elapsed}")
+        self.error_stats.print_summary(0)
+        print()
+        
+        return {
+            "deleted_count": deleter.deleted_count,
+            "failed_count": len(deleter.failed),
+            "total_size": totals["size"],
+            "elapsed_time": elapsed
+        }
+    
+    def _invalidate_cache(self, s3_prefix: str):
+        """업로드 등으로 바뀐 프리픽스의 캐시를 무효화"""
+        if self.inventory is not None:
+            self.inventory.invalidate(self.bucket_name, s3_prefix)
+    
+    def _cache_is_fresh(self, s3_prefix: str) -> bool:
+        return (
+            self.inventory is not None and not self.refresh_cache
+            and self.inventory.is_fresh(self.bucket_name, s3_prefix, self.cache_ttl)
+        )
+    
+    def iter_objects(self, s3_prefix: str, use_cache: bool = False):
+        """
+        프리픽스 아래 모든 객체를 페이지 단위로 조회하며 하나씩 반환
+        
+        list_workers가 2 이상이면 하위 프리픽스별로 동시에 조회한 결과를 합쳐서
+        반환하므로 순서는 키 순서가 아닙니다. 인벤토리 캐시가 설정되어 있으면
+        실제 조회 결과로 캐시를 갱신하고, use_cache=True이면서 캐시가 유효하면
+        S3에 요청하지 않고 캐시에서 답합니다.
+        
+        Args:
+            s3_prefix: S3 경로 프리픽스
+            use_cache: True면 유효한 캐시가 있을 때 캐시 사용 (목록 조회, dry-run용)
+            
+        Yields:
+            list_objects_v2의 Contents 항목 (Key, Size, ETag, LastModified 등)
+        """
+        if self.inventory is None:
+            yield from self._iter_objects_live(s3_prefix)
+        elif use_cache and self._cache_is_fresh(s3_prefix):
+            yield from self.inventory.iter_objects(self.bucket_name, s3_prefix)
+        else:
+            yield from self.inventory.record(
+                self.bucket_name, s3_prefix, self._iter_objects_live(s3_prefix)
+            )
+    
+    def _iter_objects_live(self, s3_prefix: str):
+        """S3에서 실제로 목록 조회 (iter_objects 참고)"""
+        if self.list_workers > 1:
+            yield from self._iter_objects_fanout(s3_prefix)
+            return
+        
+        paginator = self.s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=s3_prefix)
+        
+        for page in pages:
+            for obj in page.get('Contents', []):
+                yield obj
+    
+    def _iter_objects_fanout(self, s3_prefix: str):
+        """
+        Delimiter='/'로 하위 프리픽스(예: upload_YYYYMMDD_NNN 폴더)를 찾아
+        list_workers개 스레드가 동시에 목록 조회하고, 페이지를 하나의 스트림으로 합침
+        
+        fanout_depth 깊이까지는 폴더 단위로 더 나누고, 그 아래는 일반 재귀 목록
+        조회를 사용합니다. 결과 큐 크기가 제한되어 있어 소비가 느리면 조회도
+        함께 느려지므로 메모리 사용량이 일정합니다.
+        """
+        results = queue.Queue(maxsize=self.list_workers * 4)
+        tasks = queue.Queue()
+        cancelled = threading.Event()
+        pending = [0]
+        pending_lock = threading.Lock()
+        
+        def add_task(prefix: str, depth: int):
+            with pending_lock:
+                pending[0] += 1
+            tasks.put((prefix, depth))
+        
+        def put_result(value):
+            while not cancelled.is_set():
+                try:
+                    results.put(value, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+        
+        def list_prefix(prefix: str, depth: int):
+            if depth >= self.fanout_depth:
+                paginator = self.s3.get_paginator('list_objects_v2')
+                for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+                    if cancelled.is_set():
+                        return
+                    put_result(page.get('Contents', []))
+                return
+            
+            batch = []
+            for kind, entry in self.iter_children(prefix):
+                if cancelled.is_set():
+                    return
+                if kind == "folder":
+                    # "a" 조회 시 나오는 "a/"는 같은 단계로 취급
+                    same_level = entry['Prefix'] == f"{prefix}/"
+                    add_task(entry['Prefix'], depth if same_level else depth + 1)
+                else:
+                    batch.append(entry)
+                    if len(batch) >= 1000:
+                        put_result(batch)
+                        batch = []
+            if batch:
+                put_result(batch)
+        
+        def worker():
+            while True:
+                task = tasks.get()
+                if task is _STOP:
+                    return
+                try:
+                    if not cancelled.is_set():
+                        list_prefix(*task)
+                except Exception as e:
+                    put_result(e)
+                finally:
+                    with pending_lock:
+                        pending[0] -= 1
+                        finished = pending[0] == 0
+                    if finished:
+                        for _ in threads:
+                            tasks.put(_STOP)
+                        put_result(_STOP)
+        
+        threads = [
+            threading.Thread(target=worker, name=f"lister-{i + 1}", daemon=True)
+            for i in range(self.list_workers)
+        ]
+        add_task(s3_prefix, 0)
+        for thread in threads:
+            thread.start()
+        
+        try:
+            while True:
+                item = results.get()
+                if item is _STOP:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield from item
+        finally:
+            cancelled.set()
+    
+    @staticmethod
+    def _scan_local(local_root: str) -> dict:
+        """
+        os.scandir로 로컬 폴더를 한 번 탐색하여 파일 정보 수집
+        
+        Args:
+            local_root: 로컬 폴더 경로
+            
+        Returns:
+            {상대경로(/ 구분): {"path", "size", "mtime"}}
+        """
+        files = {}
+        stack = [local_root]
+        
+        while stack:
+            current = stack.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        relative_path = os.path.relpath(entry.path, local_root).replace(os.sep, "/")
+                        files[relative_path] = {
+                            "path": entry.path,
+                            "size": stat.st_size,
+                            "mtime": stat.st_mtime
+                        }
+        
+        return files
+    
+    @staticmethod
+    def _file_etag(local_path: str, file_size: int, part_size: Optional[int] = None) -> str:
+        """
+        로컬 파일로 S3 ETag 계산
+        
+        part_size가 없으면 단일 업로드 ETag(파일 MD5), 있으면 멀티파트 ETag
+        (파트별 MD5를 이어 붙인 값의 MD5 + "-파트 수")를 계산합니다.
+        mmap으로 읽어 복사 없이 해시하며, hashlib은 해시하는 동안 GIL을 놓으므로
+        여러 스레드에서 동시에 계산하면 CPU 코어를 함께 사용합니다.
+        """
+        if file_size == 0:
+            return hashlib.md5().hexdigest()
+        
+        with open(local_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                if part_size is None:
+                    return hashlib.md5(view).hexdigest()
+                digests = [
+                    hashlib.md5(view[offset:offset + part_size]).digest()
+                    for offset in range(0, file_size, part_size)
+                ]
+            finally:
+                view.release()
+        return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+    
+    def _upload_part_size(self, file_size: int) -> Optional[int]:
+        """
+        이 설정으로 업로드했을 때의 파트 크기 (단일 PUT이면 None)
+        
+        저널/적응형 업로드는 part_size_for()를 그대로 쓰고, 그 외에는 boto3가
+        10,000 파트를 넘지 않도록 chunksize를 두 배씩 늘리는 방식을 따릅니다.
+        """
+        if file_size < self.transfer_settings["multipart_threshold"]:
+            return None
+        if self.journal is not None or self.adaptive_chunksize:
+            return self.part_size_for(file_size)
+        
+        part_size = self.transfer_settings["multipart_chunksize"]
+        while -(-file_size // part_size) > MAX_MULTIPART_PARTS:
+            part_size *= 2
+        return min(max(part_size, MIN_PART_SIZE), MAX_PART_SIZE)
+    
+    @staticmethod
+    def _part_size_candidates(file_size: int, part_count: int) -> List[int]:
+        """
+        멀티파트 ETag의 파트 수로 추정한 파트 크기 후보 (자주 쓰는 크기 우선, 최대 3개)
+        
+        다른 도구나 설정으로 업로드된 객체는 파트 크기를 알 수 없으므로
+        파트 수가 맞는 크기 중 흔히 쓰는 값(2의 거듭제곱 MB, 5MB 등)부터 시도합니다.
+        """
+        def fits(part_size: int) -> bool:
+            return part_size > 0 and -(-file_size // part_size) == part_count
+        
+        common_sizes = [5 * MB, 15 * MB, 100 * MB] + [(1 << n) * MB for n in range(13)]
+        candidates = sorted(size for size in set(common_sizes) if fits(size))
+        smallest = -(-file_size // part_count // MB) * MB
+        if fits(smallest) and smallest not in candidates:
+            candidates.append(smallest)
+        if not candidates:
+            candidates.append(-(-file_size // part_count))
+        return candidates[:3]
+    
+    def etag_matches(self, local_path: str, file_size: int, etag: str) -> bool:
+        """
+        로컬 파일과 S3 ETag가 같은 내용인지 확인
+        
+        현재 설정의 파트 크기로 먼저 계산하고, 일치하지 않으면(다른 파트 크기로
+        업로드된 객체) ETag의 파트 수로 파트 크기를 추정해서 다시 계산합니다.
+        """
+        etag = etag.strip('"')
+        if "-" not in etag:
+            return self._file_etag(local_path, file_size) == etag
+        
+        part_count = int(etag.rsplit("-", 1)[1])
+        part_size = self._upload_part_size(file_size)
+        candidates = [
+            size for size in self._part_size_candidates(file_size, part_count) if size != part_size
+        ]
+        if part_size is not None and -(-file_size // part_size) == part_count:
+            candidates.insert(0, part_size)
+        
+        return any(
+            self._file_etag(local_path, file_size, part_size) == etag
+            for part_size in candidates
+        )
+    
+    def verify_folder(
+        self,
+        local_root: str,
+        s3_prefix: str,
+        plan: Optional[TransferPlan] = None
+    ) -> dict:
+        """
+        로컬 파일과 S3 객체의 ETag를 비교해서 업로드 무결성 검증
+        
+        S3 ETag는 목록 조회로 한 번에 가져오고(파일별 HEAD 없음), 로컬 ETag는
+        여러 파일을 스레드로 동시에 계산합니다. SSE-KMS/SSE-C로 암호화된 객체는
+        ETag가 MD5가 아니므로 불일치로 보고될 수 있습니다. 일치하지 않는 객체 중
+        업로드 때 압축한 객체(Content-Encoding)는 ETag를 비교할 수 없으므로 원본 크기만
+        확인하고 건너뜁니다.
+        
+        Args:
+            local_root: 로컬 폴더 경로
+            s3_prefix: 비교할 S3 경로
+            plan: 업로드에 사용한 계획 (있으면 upload 항목만 검증, 없으면 폴더 탐색)
+            
+        Returns:
+            검증 결과 (verified_count, mismatched, missing, compressed_count)
+        """
+        if plan is not None:
+            files = {
+                entry["key"]: (plan.local_path(entry), entry["size"])
+                for entry in plan.entries if entry["action"] == "upload"
+            }
+        else:
+            files = {
+                f"{s3_prefix}/{relative_path}": (local["path"], local["size"])
+                for relative_path, local in self._scan_local(local_root).items()
+            }
+        
+        print(f"\n🔍 무결성 검증: {len(files)}개 파일 (s3://{self.bucket_name}/{s3_prefix}/)")
+        verify_start_time = datetime.now()
+        
+        remote = {}
+        for obj in self.iter_objects(s3_prefix):
+            if obj['Key'] in files:
+                remote[obj['Key']] = (obj['Size'], obj.get('ETag', ''))
+        
+        missing = sorted(key for key in files if key not in remote)
+        
+        def check(key: str) -> Optional[bool]:
+            local_path, file_size = files[key]
+            remote_size, etag = remote[key]
+            try:
+                if remote_size == file_size and self.etag_matches(local_path, file_size, etag):
+                    return True
+                head = self.s3.head_object(Bucket=self.bucket_name, Key=key)
+                if head.get("ContentEncoding") in COMPRESSION_CODECS:
+                    # 압축한 객체: 원본 크기가 같으면 건너뜀 (None)
+                    return None if head.get("Metadata", {}).get("uncompressed-size") == str(file_size) else False
+                return False
+            except (OSError, ClientError) as e:
+                _log(f"   ❌ {local_path}: {e}")
+                return False
+        
+        keys = sorted(remote)
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, os.cpu_count() or 1)) as executor:
+            results = list(executor.map(check, keys))
+        mismatched = [key for key, ok in zip(keys, results) if ok is False]
+        compressed_count = sum(1 for ok in results if ok is None)
+        
+        for key in missing:
+            print(f"   ❓ S3에 없음: {key}")
+        for key in mismatched:
+            print(f"   ❌ ETag 불일치: {key}")
+        
+        elapsed = datetime.now() - verify_start_time
+        verified_count = len(keys) - len(mismatched) - compressed_count
+        if missing or mismatched:
+            print(f"⚠️  검증 실패: 일치 {verified_count}개, 불일치 {len(mismatched)}개, 없음 {len(missing)}개 ({elapsed})")
+        else:
+            print(f"✅ 검증 완료: {verified_count}개 모두 일치 ({elapsed})")
+        if compressed_count:
+            print(f"🗜️  압축 객체라 ETag 비교 건너뜀: {compressed_count}개 (원본 크기 일치)")
+        
+        return {
+            "verified_count": verified_count,
+            "compressed_count": compressed_count,
+            "mismatched": mismatched,
+            "missing": missing,
+            "elapsed_time": elapsed
+        }
     
-    def upload_file(self, local_path: str, s3_key: str, dry_run: bool = False) -> bool:
+    def _is_changed(self, local: dict, remote: dict, direction: str, checksum: bool) -> bool:
         """
-        단일 파일을 S3에 업로드
+        로컬 파일과 S3 객체가 다른지 판단
         
-        Args:
-            local_path: 로컬 파일 경로
-            s3_key: S3 키 (버킷 내 경로)
-            dry_run: True면 실제 업로드 없이 미리보기만
-            
-        Returns:
-            성공 여부
+        크기가 다르면 변경된 것으로 봅니다. 크기가 같으면 checksum 모드에서는
+        로컬에서 계산한 ETag(멀티파트 포함)를 비교하고, 그 외에는 전송 방향의
+        원본 쪽이 더 최근에 수정되었는지 비교합니다. 압축 조건에 맞는 파일은
+        S3 크기/ETag가 압축 결과의 값이므로 수정 시각만 비교합니다. --compress 없이
+        실행해도 크기가 다르면 HEAD로 압축 객체인지 확인해서, 원본 크기 메타데이터가
+        로컬 크기와 같으면 마찬가지로 수정 시각만 비교합니다.
         """
-        try:
-            file_size = os.path.getsize(local_path)
-            
-            if dry_run:
-                print(f"   [DRY-RUN] {local_path} -> s3://{self.bucket_name}/{s3_key}")
+        compressed = self.compressor is not None and self.compressor.should_compress(local["path"], local["size"])
+        if local["size"] != remote["Size"] and not compressed:
+            if self._uncompressed_size(remote["Key"]) != local["size"]:
                 return True
-            
-            self.s3.upload_file(local_path, self.bucket_name, s3_key)
-            print(f"   ✓ {os.path.basename(local_path)} ({file_size / (1024*1024):.2f} MB)")
-            return True
-            
-        except Exception as e:
-            print(f"   ❌ {os.path.basename(local_path)}: {e}")
-            return False
+            compressed = True
+        
+        etag = remote.get("ETag", "")
+        if checksum and etag and not compressed:
+            return not self.etag_matches(local["path"], local["size"], etag)
+        
+        remote_mtime = remote["LastModified"].timestamp()
+        if direction == "upload":
+            return local["mtime"] > remote_mtime + SYNC_MTIME_TOLERANCE
+        return remote_mtime > local["mtime"] + SYNC_MTIME_TOLERANCE
     
-    def upload_folder(
+    def _uncompressed_size(self, s3_key: str) -> Optional[int]:
+        """업로드 때 압축한 객체면 원본 크기 메타데이터 (압축 객체가 아니거나 알 수 없으면 None)"""
+        try:
+            head = self.s3.head_object(Bucket=self.bucket_name, Key=s3_key)
+        except ClientError:
+            return None
+        if head.get("ContentEncoding", "") not in COMPRESSION_CODECS:
+            return None
+        size = head.get("Metadata", {}).get("uncompressed-size")
+        return int(size) if size and size.isdigit() else None
+    
+    def sync_folder(
         self,
         local_root: str,
-        s3_base_path: str,
-        dry_run: bool = False
+        s3_prefix: str,
+        direction: str = "upload",
+        dry_run: bool = False,
+        checksum: bool = False,
+        delete: bool = False
     ) -> dict:
         """
-        폴더 전체를 S3에 업로드
+        새로 생겼거나 변경된 파일만 전송하는 증분 동기화
+        
+        S3 프리픽스는 한 번만 목록 조회하고 로컬은 os.scandir로 한 번 탐색한 뒤
+        크기와 수정 시각(또는 ETag)을 비교합니다. 다운로드한 파일의 수정 시각은
+        S3의 LastModified로 맞춰 두므로 다음 실행에서 변경 없음으로 판단됩니다.
         
         Args:
             local_root: 로컬 폴더 경로
-            s3_base_path: S3 기본 경로
-            dry_run: True면 실제 업로드 없이 미리보기만
+            s3_prefix: S3 경로 프리픽스
+            direction: "upload" (로컬 -> S3) 또는 "download" (S3 -> 로컬)
+            dry_run: True면 실제 전송 없이 미리보기만
+            checksum: True면 크기가 같을 때 수정 시각 대신 MD5/ETag 비교
+            delete: True면 로컬에 없는 S3 객체를 삭제해 로컬과 똑같이 맞춤 (upload 방향).
+                전송에 실패한 파일이 있으면 삭제하지 않습니다.
             
         Returns:
-            업로드 통계 (uploaded_count, total_size, elapsed_time)
+            동기화 통계
         """
-        if not os.path.exists(local_root):
-            print(f"❌ 경로가 존재하지 않습니다: {local_root}")
-            return {"uploaded_count": 0, "total_size": 0}
+        if direction not in ("upload", "download"):
+            raise ValueError(f"지원하지 않는 동기화 방향: {direction}")
+        if delete and direction != "upload":
+            raise ValueError("--delete는 upload 방향 동기화에서만 사용할 수 있습니다")
         
-        upload_start_time = datetime.now()
-        uploaded_count = 0
-        total_size = 0
+        sync_start_time = datetime.now()
+        s3_prefix = s3_prefix.rstrip("/")
         
         print(f"\n{'='*70}")
-        print(f"📁 {'[DRY-RUN] ' if dry_run else ''}폴더 업로드")
+        print(f"🔄 {'[DRY-RUN] ' if dry_run else ''}증분 동기화 ({direction})")
         print(f"{'='*70}")
         print(f"📂 로컬: {local_root}")
-        print(f"☁️  S3:   s3://{self.bucket_name}/{s3_base_path}/\n")
+        print(f"☁️  S3:   s3://{self.bucket_name}/{s3_prefix}/\n")
         
-        for root, dirs, files in os.walk(local_root):
-            for file in files:
-                local_path = os.path.join(root, file)
-                relative_path = os.path.relpath(local_path, local_root)
-                s3_key = f"{s3_base_path}/{relative_path}".replace(os.sep, "/")
-                
-                file_size = os.path.getsize(local_path)
-                total_size += file_size
-                
-                if self.upload_file(local_path, s3_key, dry_run):
-                    uploaded_count += 1
+        if direction == "upload" and not os.path.isdir(local_root):
+            print(f"❌ 경로가 존재하지 않습니다: {local_root}")
+            return {"transferred_count": 0, "total_size": 0}
         
-        elapsed = datetime.now() - upload_start_time
+        local_files = self._scan_local(local_root) if os.path.isdir(local_root) else {}
+        remote_objects = {}
+        for obj in self.iter_objects(f"{s3_prefix}/", use_cache=dry_run):
+            relative_path = obj["Key"][len(s3_prefix) + 1:]
+            if relative_path and not obj["Key"].endswith("/"):
+                remote_objects[relative_path] = obj
+        
+        if self.shard_count > 1:
+            # 양쪽 모두 이 호스트가 맡은 키만 비교 (--delete도 이 샤드 안에서만 삭제)
+            local_files = {p: v for p, v in local_files.items() if self.in_shard(f"{s3_prefix}/{p}")}
+            remote_objects = {p: obj for p, obj in remote_objects.items() if self.in_shard(obj["Key"])}
+        
+        source, target = (
+            (local_files, remote_objects) if direction == "upload"
+            else (remote_objects, local_files)
+        )
+        new_count = changed_count = unchanged_count = 0
+        pending = []
+        
+        for relative_path in sorted(source):
+            if relative_path not in target:
+                new_count += 1
+            else:
+                local = local_files[relative_path]
+                remote = remote_objects[relative_path]
+                if not self._is_changed(local, remote, direction, checksum):
+                    unchanged_count += 1
+                    continue
+                changed_count += 1
+            pending.append(relative_path)
+        
+        stale = sorted(p for p in remote_objects if p not in local_files) if delete else []
+        
+        pending_size = sum(source[p]["size" if direction == "upload" else "Size"] for p in pending)
+        print(f"🆕 새 파일: {new_count}개 | ✏️  변경: {changed_count}개 | ⏭️  변경 없음: {unchanged_count}개")
+        if delete:
+            print(f"🗑️  로컬에 없어 삭제 예정: {len(stale)}개")
+        print(f"📦 전송 예정: {pending_size / (1024*1024):.2f} MB\n")
+        
+        if direction == "upload":
+            pool = self._new_pool(self._upload_handler(dry_run), dry_run)
+            for relative_path in pending:
+                local = local_files[relative_path]
+                pool.submit((local["path"], f"{s3_prefix}/{relative_path}", local["size"]), local["size"])
+        else:
+            pool = self._new_pool(self._download_handler(dry_run, preserve_mtime=True), dry_run)
+            for relative_path in pending:
+                remote = remote_objects[relative_path]
+                local_path = os.path.join(local_root, *relative_path.split("/"))
+                pool.submit((remote["Key"], local_path, remote["Size"], remote["LastModified"], remote.get("ETag")), remote["Size"])
+        
+        stats = pool.join()
+        
+        deleter = None
+        if stale and stats.failed_count:
+            print(f"⚠️  전송 실패가 있어 삭제를 건너뜁니다 ({len(stale)}개)")
+        elif stale:
+            deleter = self.delete_keys((remote_objects[p]["Key"] for p in stale), dry_run)
+        
+        if direction == "upload" and not dry_run:
+            self._invalidate_cache(s3_prefix)
+        elapsed = datetime.now() - sync_start_time
         
         print(f"\n{'='*70}")
-        print(f"✅ 업로드 완료!")
+        print(f"✅ 동기화 완료!")
         print(f"{'='*70}")
-        print(f"📊 파일 개수: {uploaded_count}개")
-        print(f"📦 총 크기: {total_size / (1024*1024*1024):.2f} GB")
-        print(f"⏱️  소요시간: {elapsed}\n")
+        print(f"📊 전송 파일: {stats.success_count}개 (건너뜀: {unchanged_count}개)")
+        if stats.failed_count:
+            print(f"❌ 실패: {stats.failed_count}개")
+        if deleter is not None and not dry_run:
+            print(f"🗑️  삭제: {deleter.deleted_count}개")
+            if deleter.failed:
+                print(f"❌ 삭제 실패: {len(deleter.failed)}개")
+        if stats.skipped_count:
+            print(f"⏭️  이미 완료되어 건너뜀: {stats.skipped_count}개")
+        print(f"📦 총 크기: {stats.total_bytes / (1024*1024*1024):.2f} GB")
+        if self.dedup is not None:
+            self.dedup.print_summary()
+        if self.compressor is not None:
+            self.compressor.print_summary()
+        print(f"⏱️  소요시간: {elapsed}")
+        if self.max_workers > 1:
+            stats.print_summary()
+        self.error_stats.print_summary(stats.retried_count)
+        self.metrics.print_summary()
+        print()
         
         return {
-            "uploaded_count": uploaded_count,
-            "total_size": total_size,
+            "transferred_count": stats.success_count,
+            "failed_count": stats.failed_count + (len(deleter.failed) if deleter is not None else 0),
+            "deleted_count": deleter.deleted_count if deleter is not None else 0,
+            "skipped_count": unchanged_count + stats.skipped_count,
+            "total_size": stats.total_bytes,
             "elapsed_time": elapsed
         }
     
-    def upload_specific_folders(
+    def watch_folder(
         self,
-        base_dir: str,
-        folder_names: List[str],
+        local_root: str,
         s3_base_path: str,
-        dry_run: bool = False
+        dry_run: bool = False,
+        state_path: Optional[str] = None,
+        debounce: float = DEFAULT_WATCH_DEBOUNCE,
+        poll_interval: float = DEFAULT_WATCH_POLL_INTERVAL,
+        polling: bool = False,
+        stop_event: Optional[threading.Event] = None
     ) -> dict:
         """
-        특정 폴더들만 선택적으로 업로드
+        폴더를 감시하며 쓰기가 끝난 파일을 계속 업로드 (Ctrl+C로 종료)
+        
+        inotify로 쓰기가 끝난 파일을 감지하고(사용할 수 없으면 주기적 탐색), 이벤트가
+        debounce초 동안 멈추면 모아 둔 파일을 한 번에 TransferPool로 업로드합니다.
+        폴더 전체를 다시 탐색하지 않으므로 파일이 들어온 뒤 몇 초 안에 업로드되고,
+        기다리는 동안에는 워커 스레드도 없습니다. 시작할 때는 상태 파일의 high-water mark보다
+        새 파일(감시하지 않는 동안 들어온 파일)부터 업로드합니다. 업로드에 실패한 파일은
+        새 이벤트가 없어도 WATCH_MAX_DELAY초 뒤에 다시 시도합니다.
         
         Args:
-            base_dir: 기본 디렉토리 경로
-            folder_names: 업로드할 폴더명 리스트
+            local_root: 감시할 로컬 폴더
             s3_base_path: S3 기본 경로
-            dry_run: True면 실제 업로드 없이 미리보기만
+            dry_run: True면 업로드할 파일만 출력하고 상태를 저장하지 않음
+            state_path: high-water mark를 저장할 상태 파일
+            debounce: 마지막 이벤트 후 업로드를 시작하기까지 기다릴 시간 (초)
+            poll_interval: inotify 대신 주기적 탐색을 쓸 때 탐색 간격 (초)
+            polling: True면 inotify를 쓰지 않고 주기적 탐색
+            stop_event: 설정되면 감시 종료 (테스트나 다른 스레드에서 멈출 때)
             
         Returns:
-            업로드 통계
+            감시 중 업로드 통계
         """
+        if not os.path.isdir(local_root):
+            print(f"❌ 폴더가 존재하지 않습니다: {local_root}")
+            return {"uploaded_count": 0, "failed_count": 0, "total_size": 0}
+        
+        stop_event = stop_event or threading.Event()
+        state = WatchState(state_path) if state_path else None
+        watch_start_time = datetime.now()
+        totals = {"uploaded": 0, "failed": 0, "bytes": 0}
+        
+        # 감시를 먼저 시작한 뒤 탐색해야 그 사이에 들어온 파일을 놓치지 않음
+        watcher = None
+        if not polling:
+            try:
+                watcher = InotifyWatcher(local_root)
+            except OSError as e:
+                print(f"⚠️  inotify를 사용할 수 없어 {poll_interval:g}초 간격 탐색으로 감시합니다 ({e})")
+        
+        scanned = self._scan_local(local_root)
+        if watcher is None:
+            watcher = PollingWatcher(local_root, poll_interval, scanned)
+        
         print(f"\n{'='*70}")
-        print(f"🎯 {'[DRY-RUN] ' if dry_run else ''}선택적 폴더 업로드")
+        print(f"👀 {'[DRY-RUN] ' if dry_run else ''}폴더 감시 업로드 "
+              f"({'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'})")
         print(f"{'='*70}")
-        print(f"📂 기본 경로: {base_dir}")
-        print(f"📋 대상 폴더: {', '.join(folder_names)}\n")
+        print(f"📂 로컬: {local_root}")
+        print(f"☁️  S3:   s3://{self.bucket_name}/{s3_base_path}/")
+        if state is not None:
+            since = datetime.fromtimestamp(state.high_water).isoformat() if state.high_water else "처음 실행"
+            print(f"💾 상태 파일: {state.path} (기준 시각: {since})")
+        print(f"⏱️  디바운스: {debounce:g}초 | 중지: Ctrl+C\n")
         
-        total_uploaded = 0
-        total_size = 0
-        upload_start_time = datetime.now()
+        def upload_batch(relative_paths):
+            batch_start = time.monotonic()
+            results = self._upload_watch_batch(local_root, s3_base_path, relative_paths, state, dry_run)
+            uploaded = [path for path, (success, _, _) in results.items() if success is not False]
+            failed = [path for path, (success, _, _) in results.items() if success is False]
+            nbytes = sum(size for success, size, _ in results.values() if success)
+            totals["uploaded"] += len(uploaded)
+            totals["bytes"] += nbytes
+            totals["failed"] += len(failed)
+            if results and not dry_run:
+                line = (
+                    f"📤 [{datetime.now():%H:%M:%S}] {len(uploaded)}개 파일 업로드 "
+                    f"({nbytes / (1024*1024):.2f} MB, {time.monotonic() - batch_start:.1f}초)"
+                )
+                if failed:
+                    line += f", 실패 {len(failed)}개 ({WATCH_MAX_DELAY:g}초 안에 다시 시도)"
+                _log(line)
+            return failed
         
-        for folder_name in folder_names:
-            folder_path = os.path.join(base_dir, folder_name)
-            
-            if not os.path.exists(folder_path):
-                print(f"❗ 폴더를 찾을 수 없음: {folder_name}")
-                continue
-            
-            if not os.path.isdir(folder_path):
-                print(f"❗ 디렉토리가 아님: {folder_name}")
-                continue
-            
-            print(f"\n📁 [{folder_name}] 업로드 중...")
-            
-            folder_uploaded = 0
-            folder_size = 0
-            
-            for root, dirs, files in os.walk(folder_path):
-                for file in files:
-                    local_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(local_path, folder_path)
-                    s3_key = f"{s3_base_path}/{folder_name}/{relative_path}".replace(os.sep, "/")
-                    
-                    file_size = os.path.getsize(local_path)
-                    folder_size += file_size
-                    
-                    if self.upload_file(local_path, s3_key, dry_run):
-                        folder_uploaded += 1
-                        total_uploaded += 1
-                        total_size += file_size
-            
-            print(f"   ✅ {folder_name}: {folder_uploaded}개 파일 ({folder_size / (1024*1024):.2f} MB)")
+        pending = {}  # 상대 경로 -> 처음 감지한 시각
+        retry = []
         
-        elapsed = datetime.now() - upload_start_time
+        catch_up = []
+        if state is not None:
+            catch_up = [path for path, info in scanned.items() if state.needs_upload(path, info["mtime"])]
+        if catch_up:
+            print(f"🔎 감시하지 않는 동안 들어온 파일: {len(catch_up)}개")
+            retry = upload_batch(catch_up)
+        retry_since = time.monotonic()
+        
+        last_event = time.monotonic()
+        try:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                timeout = 1.0 if not pending else min(1.0, max(0.05, last_event + debounce - now))
+                paths = watcher.read(timeout)
+                
+                if watcher.needs_rescan:
+                    watcher.needs_rescan = False
+                    _log("⚠️  inotify 이벤트 큐가 넘쳐 폴더를 다시 탐색합니다")
+                    paths |= {
+                        path for path, info in self._scan_local(local_root).items()
+                        if state is None or state.needs_upload(path, info["mtime"])
+                    }
+                
+                now = time.monotonic()
+                if paths:
+                    last_event = now
+                    for path in paths:
+                        pending.setdefault(path, now)
+                
+                # 조용한 폴더에서도 실패한 파일이 재시작 때까지 남지 않도록 retry도 타이머로 비움
+                if (pending and (
+                    now - last_event >= debounce
+                    or len(pending) >= WATCH_MAX_BATCH
+                    or now - min(pending.values()) >= WATCH_MAX_DELAY
+                )) or (retry and now - retry_since >= WATCH_MAX_DELAY):
+                    batch = sorted(set(pending) | set(retry))
+                    pending = {}
+                    retry = upload_batch(batch)
+                    retry_since = time.monotonic()
+        except KeyboardInterrupt:
+            print("\n⏹️  감시를 종료합니다")
+        finally:
+            watcher.close()
+        
+        elapsed = datetime.now() - watch_start_time
         
         print(f"\n{'='*70}")
-        print(f"✅ 모든 업로드 완료!")
+        print(f"✅ 감시 종료")
         print(f"{'='*70}")
-        print(f"📊 총 파일: {total_uploaded}개")
-        print(f"📦 총 크기: {total_size / (1024*1024*1024):.2f} GB")
-        print(f"⏱️  소요시간: {elapsed}\n")
+        print(f"📊 업로드한 파일: {totals['uploaded']}개")
+        if retry:
+            print(f"❌ 실패: {len(retry)}개 (다시 시작하면 이어서 업로드)")
+        if pending:
+            print(f"⏳ 업로드 전에 종료: {len(pending)}개 (다시 시작하면 이어서 업로드)")
+        print(f"📦 총 크기: {totals['bytes'] / (1024*1024*1024):.2f} GB")
+        if self.compressor is not None:
+            self.compressor.print_summary()
+        print(f"⏱️  감시 시간: {elapsed}")
+        self.error_stats.print_summary(0)
+        self.metrics.print_summary()
+        print()
         
         return {
-            "uploaded_count": total_uploaded,
-            "total_size": total_size,
+            "uploaded_count": totals["uploaded"],
+            "failed_count": len(retry),
+            "total_size": totals["bytes"],
             "elapsed_time": elapsed
         }
     
-    def download_file(self, s3_key: str, local_path: str, dry_run: bool = False) -> bool:
+    def _upload_watch_batch(
+        self,
+        local_root: str,
+        s3_base_path: str,
+        relative_paths: List[str],
+        state: Optional[WatchState],
+        dry_run: bool = False
+    ) -> dict:
         """
-        S3에서 단일 파일 다운로드
+        감지한 파일들을 TransferPool로 업로드하고 상태 파일 갱신
+        
+        업로드 전에 파일들을 pending으로 저장하므로 도중에 종료되어도 다시 시작하면
+        이어서 업로드합니다. 그 사이 삭제/이동된 파일은 건너뜁니다.
         
-        Args:
-            s3_key: S3 키
-            local_path: 로컬 저장 경로
-            dry_run: True면 실제 다운로드 없이 미리보기만
-            
         Returns:
-            성공 여부
+            {상대 경로: (성공 여부, 크기, 수정 시각)}
         """
-        try:
-            if dry_run:
-                print(f"   [DRY-RUN] s3://{self.bucket_name}/{s3_key} -> {local_path}")
-                return True
-            
-            # 디렉토리 생성
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            
-            self.s3.download_file(self.bucket_name, s3_key, local_path)
-            file_size = os.path.getsize(local_path)
-            print(f"   ✓ {os.path.basename(local_path)} ({file_size / (1024*1024):.2f} MB)")
-            return True
-            
-        except Exception as e:
-            print(f"   ❌ {os.path.basename(local_path)}: {e}")
-            return False
+        entries = []
+        for relative_path in relative_paths:
+            local_path = os.path.join(local_root, *relative_path.split("/"))
+            try:
+                stat = os.stat(local_path)
+            except OSError:
+                continue
+            entries.append((relative_path, local_path, stat.st_size, stat.st_mtime))
+        
+        if state is not None and not dry_run:
+            state.pending.update(relative_path for relative_path, _, _, _ in entries)
+            state.save()
+        
+        results = {}
+        results_lock = threading.Lock()
+        upload = self._upload_handler(dry_run)
+        
+        def handle(entry):
+            relative_path, local_path, file_size, mtime = entry
+            success, nbytes = upload((local_path, f"{s3_base_path}/{relative_path}", file_size))
+            with results_lock:
+                results[relative_path] = (success, file_size, mtime)
+            return success, nbytes
+        
+        pool = self._new_pool(handle, dry_run)
+        if pool.progress is not None:
+            pool.progress.set_total(len(entries), sum(entry[2] for entry in entries))
+        for entry in entries:
+            pool.submit(entry)
+        pool.join()
+        
+        if state is not None and not dry_run:
+            for relative_path, (success, _, mtime) in results.items():
+                if success is not False:
+                    state.pending.discard(relative_path)
+                    state.high_water = max(state.high_water, mtime)
+                    state.uploaded_count += 1
+            state.save()
+            self._invalidate_cache(s3_base_path)
+        return results
     
-    def download_folder(
-        self,
-        s3_prefix: str,
-        local_root: str,
-        dry_run: bool = False
-    ) -> dict:
+    def iter_children(self, s3_prefix: str, use_cache: bool = False):
         """
-        S3 폴더 전체를 로컬로 다운로드
+        프리픽스 바로 아래의 폴더(CommonPrefixes)와 파일을 모든 페이지에 걸쳐 반환
         
         Args:
             s3_prefix: S3 경로 프리픽스
-            local_root: 로컬 저장 경로
-            dry_run: True면 실제 다운로드 없이 미리보기만
+            use_cache: True면 유효한 인벤토리 캐시가 있을 때 캐시에서 답함
             
-        Returns:
-            다운로드 통계
+        Yields:
+            ("folder", {"Prefix": ...}) 또는 ("file", Contents 항목)
         """
-        download_start_time = datetime.now()
-        downloaded_count = 0
-        total_size = 0
+        if use_cache and self._cache_is_fresh(s3_prefix):
+            yield from self.inventory.iter_children(self.bucket_name, s3_prefix)
+            return
         
-        print(f"\n{'='*70}")
-        print(f"📥 {'[DRY-RUN] ' if dry_run else ''}폴더 다운로드")
-        print(f"{'='*70}")
-        print(f"☁️  S3:   s3://{self.bucket_name}/{s3_prefix}/")
-        print(f"📂 로컬: {local_root}\n")
+        paginator = self.s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=s3_prefix, Delimiter='/')
         
-        try:
-            paginator = self.s3.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix=s3_prefix)
-            
-            for page in pages:
-                if 'Contents' not in page:
-                    continue
-                
-                for obj in page['Contents']:
-                    s3_key = obj['Key']
-                    relative_path = os.path.relpath(s3_key, s3_prefix)
-                    local_path = os.path.join(local_root, relative_path)
-                    
-                    if self.download_file(s3_key, local_path, dry_run):
-                        downloaded_count += 1
-                        if not dry_run:
-                            total_size += os.path.getsize(local_path)
-            
-            elapsed = datetime.now() - download_start_time
-            
-            print(f"\n{'='*70}")
-            print(f"✅ 다운로드 완료!")
-            print(f"{'='*70}")
-            print(f"📊 파일 개수: {downloaded_count}개")
-            print(f"📦 총 크기: {total_size / (1024*1024*1024):.2f} GB")
-            print(f"⏱️  소요시간: {elapsed}\n")
-            
-            return {
-                "downloaded_count": downloaded_count,
-                "total_size": total_size,
-                "elapsed_time": elapsed
-            }
-            
-        except Exception as e:
-            print(f"❌ 다운로드 중 오류: {e}")
-            return {"downloaded_count": 0, "total_size": 0}
+        for page in pages:
+            for prefix in page.get('CommonPrefixes', []):
+                yield "folder", prefix
+            for obj in page.get('Contents', []):
+                yield "file", obj
+    
+    @staticmethod
+    def _listing_record(kind: str, entry: dict) -> dict:
+        """목록 항목을 jsonl/csv 출력용 레코드로 변환"""
+        if kind == "folder":
+            return {"type": "folder", "key": entry['Prefix'], "size": 0,
+                    "last_modified": "", "etag": ""}
+        return {
+            "type": "file",
+            "key": entry['Key'],
+            "size": entry['Size'],
+            "last_modified": entry['LastModified'].isoformat(),
+            "etag": entry.get('ETag', '').strip('"')
+        }
     
-    def list_objects(self, s3_prefix: str = "", recursive: bool = False):
+    def list_objects(
+        self,
+        s3_prefix: str = "",
+        recursive: bool = False,
+        output_format: str = "text",
+        output=None
+    ) -> dict:
         """
         S3 경로의 객체 목록 출력
         
+        모든 페이지를 조회하며 항목이 도착하는 대로 출력하므로 객체 수와 관계없이
+        메모리 사용량이 일정합니다. 개수와 크기는 출력하면서 함께 집계합니다.
+        
         Args:
             s3_prefix: S3 경로 프리픽스
             recursive: True면 재귀적으로 모든 파일 출력
+            output_format: "text" (사람용), "jsonl" 또는 "csv" (기계 판독용)
+            output: jsonl/csv를 기록할 스트림 (None이면 표준 출력)
+            
+        Returns:
+            집계 (file_count, folder_count, total_size)
         """
         print(f"\n{'='*70}")
         print(f"📋 S3 객체 목록")
         print(f"{'='*70}")
         print(f"☁️  경로: s3://{self.bucket_name}/{s3_prefix or '(root)'}\n")
         
+        stream = output or sys.stdout
+        csv_writer = None
+        if output_format == "csv":
+            csv_writer = csv.DictWriter(stream, fieldnames=LIST_FIELDS)
+            csv_writer.writeheader()
+        
+        file_count = 0
+        folder_count = 0
+        total_size = 0
+        
         try:
             if recursive:
-                # 모든 파일 나열
-                paginator = self.s3.get_paginator('list_objects_v2')
-                pages = paginator.paginate(Bucket=self.bucket_name, Prefix=s3_prefix)
-                
-                total_count = 0
-                total_size = 0
-                
-                for page in pages:
-                    if 'Contents' not in page:
-                        continue
-                    
-                    for obj in page['Contents']:
-                        size_mb = obj['Size'] / (1024*1024)
-                        modified = obj['LastModified'].strftime('%Y-%m-%d %H:%M:%S')
-                        print(f"  📄 {obj['Key']}")
-                        print(f"      크기: {size_mb:.2f} MB | 수정일: {modified}")
-                        total_count += 1
-                        total_size += obj['Size']
-                
-                print(f"\n{'='*70}")
-                print(f"📊 총 파일: {total_count}개")
-                print(f"📦 총 크기: {total_size / (1024*1024*1024):.2f} GB\n")
-                
+                entries = (("file", obj) for obj in self.iter_objects(s3_prefix, use_cache=True))
             else:
-                # 디렉토리 구조만 나열
-                response = self.s3.list_objects_v2(
-                    Bucket=self.bucket_name,
-                    Prefix=s3_prefix,
-                    Delimiter='/'
-                )
-                
-                # 폴더 출력
-                if 'CommonPrefixes' in response:
-                    print("📁 폴더:")
-                    for prefix in response['CommonPrefixes']:
-                        folder_name = prefix['Prefix'].rstrip('/').split('/')[-1]
-                        print(f"  📁 {folder_name}/")
-                
-                # 파일 출력
-                if 'Contents' in response:
-                    print("\n📄 파일:")
-                    for obj in response['Contents']:
-                        if obj['Key'] == s3_prefix:  # 프리픽스 자체는 제외
-                            continue
-                        file_name = obj['Key'].split('/')[-1]
-                        size_mb = obj['Size'] / (1024*1024)
-                        print(f"  📄 {file_name} ({size_mb:.2f} MB)")
+                entries = self.iter_children(s3_prefix, use_cache=True)
+            
+            for kind, entry in entries:
+                if kind == "file" and entry['Key'] == s3_prefix:  # 프리픽스 자체는 제외
+                    continue
+                if (kind == "file" and self.object_filter is not None
+                        and not self.object_filter.matches(
+                            self._relative_key(entry['Key'], s3_prefix), entry['Size'], entry['LastModified'])):
+                    continue
                 
-                print()
+                if kind == "folder":
+                    folder_count += 1
+                else:
+                    file_count += 1
+                    total_size += entry['Size']
                 
+                if output_format == "jsonl":
+                    stream.write(json.dumps(self._listing_record(kind, entry), ensure_ascii=False) + "\n")
+                elif csv_writer is not None:
+                    csv_writer.writerow(self._listing_record(kind, entry))
+                elif kind == "folder":
+                    folder_name = entry['Prefix'].rstrip('/').split('/')[-1]
+                    print(f"  📁 {folder_name}/")
+                else:
+                    name = entry['Key'] if recursive else entry['Key'].split('/')[-1]
+                    size_mb = entry['Size'] / (1024*1024)
+                    if recursive:
+                        modified = entry['LastModified'].strftime('%Y-%m-%d %H:%M:%S')
+                        print(f"  📄 {name} ({size_mb:.2f} MB, {modified})")
+                    else:
+                        print(f"  📄 {name} ({size_mb:.2f} MB)")
+            
+            stream.flush()
+            
+            print(f"\n{'='*70}")
+            if folder_count:
+                print(f"📁 총 폴더: {folder_count}개")
+            print(f"📊 총 파일: {file_count}개")
+            print(f"📦 총 크기: {total_size / (1024*1024*1024):.2f} GB")
+            if self.object_filter is not None:
+                self.object_filter.print_summary()
+            print()
+            
         except Exception as e:
             print(f"❌ 목록 조회 중 오류: {e}")
+        
+        return {"file_count": file_count, "folder_count": folder_count, "total_size": total_size}
+
+
+def run_command(args, data_stream):
+    """
+    파싱된 인자로 명령어 실행
+    
+    Args:
+        args: argparse 결과
+        data_stream: 목록 등 데이터를 기록할 원래 표준 출력
+    """
+    if args.command == 'merge-reports':
+        merge_reports(args.reports, args.output)
+        return
+    
+    # S3 클라이언트 생성
+    transfer = S3FileTransfer(
+        endpoint_url=args.endpoint_url,
+        region=args.region,
+        bucket_name=args.bucket,
+        max_workers=args.workers,
+        transfer_profile=getattr(args, 'transfer_profile', 'default'),
+        transfer_options={
+            "multipart_threshold": getattr(args, 'multipart_threshold', None),
+            "multipart_chunksize": getattr(args, 'multipart_chunksize', None),
+            "max_concurrency": getattr(args, 'max_concurrency', None),
+            "max_io_queue": getattr(args, 'max_io_queue', None)
+        },
+        adaptive_chunksize=getattr(args, 'adaptive_chunksize', False),
+        ranged_threshold=getattr(args, 'ranged_threshold', DEFAULT_RANGED_THRESHOLD),
+        list_workers=args.list_workers,
+        fanout_depth=args.fanout_depth,
+        cache_path=args.cache,
+        cache_ttl=args.cache_ttl,
+        refresh_cache=args.refresh_cache,
+        max_bandwidth=args.max_bandwidth,
+        max_requests_per_sec=args.max_requests,
+        retry_mode=args.retry_mode,
+        max_attempts=args.max_attempts,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        retry_passes=args.retry_failed,
+        verbose=args.verbose,
+        progress_interval=args.progress_interval,
+        dedup_index=getattr(args, 'dedup_index', None),
+        dedup_min_size=getattr(args, 'dedup_min_size', DEFAULT_DEDUP_MIN_SIZE),
+        compress=getattr(args, 'compress', None),
+        compress_extensions=getattr(args, 'compress_ext', DEFAULT_COMPRESS_EXTENSIONS),
+        compress_min_size=getattr(args, 'compress_min_size', DEFAULT_COMPRESS_MIN_SIZE),
+        object_filter=ObjectFilter(
+            include=getattr(args, 'include', None),
+            exclude=getattr(args, 'exclude', None),
+            extensions=getattr(args, 'ext', None),
+            min_size=getattr(args, 'min_size', None),
+            max_size=getattr(args, 'max_size', None),
+            modified_after=getattr(args, 'modified_after', None),
+            modified_before=getattr(args, 'modified_before', None)
+        ),
+        shard_index=getattr(args, 'shard_index', 0),
+        shard_count=getattr(args, 'shard_count', 1)
+    )
+    
+    plan = None
+    if args.command == 'execute-plan':
+        try:
+            plan = TransferPlan.load(args.plan)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ 전송 계획을 읽을 수 없습니다: {args.plan} ({e})")
+            return
+        if args.order:
+            plan.sort(args.order)
+    
+    if getattr(args, 'resume', False) and getattr(args, 'local_path', None) == '-':
+        print("❌ 표준 입력/출력 스트림 전송은 --resume을 지원하지 않습니다")
+        return
+    
+    if getattr(args, 'resume', False):
+        if plan is not None:
+            # 같은 폴더를 upload로 실행할 때와 같은 저널을 사용
+            transfer.open_journal('upload', plan.local_root, plan.s3_prefix, args.output_dir)
+        else:
+            transfer.open_journal(args.command, args.local_path, args.s3_path, args.output_dir)
+    
+    # 명령어 실행
+    result = {}
+    if args.command == 'upload':
+        pack_threshold = args.pack_threshold if args.pack_small_files else None
+        if args.local_path == '-':
+            # 표준 입력을 --s3-path 키로 스트림 업로드
+            result = transfer.upload_stream(sys.stdin.buffer, args.s3_path, args.dry_run)
+        elif args.folders:
+            # 선택적 폴더 업로드
+            result = transfer.upload_specific_folders(
+                args.local_path,
+                args.folders,
+                args.s3_path,
+                args.dry_run,
+                pack_threshold=pack_threshold,
+                shard_size=args.shard_size,
+                order=args.order,
+                verify=args.verify
+            )
+        else:
+            # 전체 폴더 업로드
+            result = transfer.upload_folder(
+                args.local_path,
+                args.s3_path,
+                args.dry_run,
+                pack_threshold=pack_threshold,
+                shard_size=args.shard_size,
+                order=args.order,
+                plan_path=args.plan_file,
+                verify=args.verify
+            )
+    
+    elif args.command == 'execute-plan':
+        result = transfer.execute_plan(plan, args.dry_run, args.shard_size, args.verify)
+    
+    elif args.command == 'delete':
+        result = transfer.delete_prefix(args.s3_path, args.dry_run)
+    
+    elif args.command in ('copy', 'move'):
+        result = transfer.copy_prefix(
+            args.s3_path,
+            args.dest_path,
+            args.dry_run,
+            delete_source=args.command == 'move'
+        )
+    
+    elif args.command == 'verify':
+        result = transfer.verify_folder(args.local_path, args.s3_path)
+    
+    elif args.command == 'download' and args.local_path == '-':
+        result = transfer.download_stream(args.s3_path, data_stream.buffer, args.dry_run)
+    
+    elif args.command == 'download':
+        result = transfer.download_folder(
+            args.s3_path,
+            args.local_path,
+            args.dry_run,
+            unpack=not args.no_unpack
+        )
+    
+    elif args.command == 'sync':
+        result = transfer.sync_folder(
+            args.local_path,
+            args.s3_path,
+            args.direction,
+            args.dry_run,
+            args.checksum,
+            delete=args.delete
+        )
+    
+    elif args.command == 'watch':
+        state_path = args.state_file
+        if not state_path:
+            job = f"watch|{os.path.abspath(args.local_path)}|{transfer.bucket_name}/{args.s3_path}"
+            job_id = hashlib.md5(job.encode('utf-8')).hexdigest()[:12]
+            state_path = os.path.join(args.output_dir, f"watch_{job_id}.json")
+        result = transfer.watch_folder(
+            args.local_path,
+            args.s3_path,
+            args.dry_run,
+            state_path=state_path,
+            debounce=args.debounce,
+            poll_interval=args.poll_interval,
+            polling=args.polling
+        )
+    
+    elif args.command == 'list':
+        if args.format != 'text' and args.output:
+            with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                transfer.list_objects(args.s3_path, args.recursive, args.format, f)
+        else:
+            transfer.list_objects(args.s3_path, args.recursive, args.format, data_stream)
+    
+    report_path = getattr(args, 'report', None)
+    if not report_path and transfer.shard_count > 1:
+        report_path = os.path.join(
+            args.output_dir,
+            f"report_{args.command}_shard{transfer.shard_index:03d}of{transfer.shard_count:03d}.json"
+        )
+    if report_path and not args.dry_run and result:
+        transfer.write_report(report_path, args.command, args.local_path, args.s3_path, result)
+    
+    if getattr(args, 'metrics_json', None) or getattr(args, 'prometheus_textfile', None):
+        transfer.write_metrics(args.metrics_json, args.prometheus_textfile)
+    
+    if transfer.journal is not None:
+        transfer.close_journal(
+            completed=not args.dry_run and result.get('failed_count', 1) == 0
+        )
 
 
 def main():
@@ -499,22 +5321,196 @@ def main():
     common.add_argument('--region', default='us-east-1', help='리전 (기본값: us-east-1)')
     common.add_argument('--bucket', help='버킷 이름')
     common.add_argument('--dry-run', action='store_true', help='실제 전송 없이 미리보기만')
+    common.add_argument('--workers', type=int, default=1,
+                        help='동시 전송 워커 수 (기본값: 1)')
+    common.add_argument('--list-workers', type=int, default=1,
+                        help='하위 프리픽스를 나눠 동시에 목록 조회할 스레드 수 (기본값: 1)')
+    common.add_argument('--fanout-depth', type=int, default=1,
+                        help='목록 조회를 나눌 폴더 깊이 (기본값: 1)')
+    common.add_argument('--cache', help='인벤토리 캐시(SQLite) 파일 경로')
+    common.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL,
+                        help='목록 조회/dry-run에서 캐시를 그대로 쓸 유효 시간(초) (기본값: 3600)')
+    common.add_argument('--refresh-cache', action='store_true',
+                        help='유효 시간과 관계없이 목록을 다시 조회해 캐시 갱신')
+    common.add_argument('--max-bandwidth', type=parse_size,
+                        help='모든 전송을 합친 초당 최대 바이트 (예: 50MB)')
+    common.add_argument('--max-requests', type=float,
+                        help='모든 스레드를 합친 초당 최대 요청 수')
+    common.add_argument('--retry-mode', choices=['standard', 'adaptive', 'legacy'], default='standard',
+                        help='요청 재시도 모드 (기본값: standard)')
+    common.add_argument('--max-attempts', type=int, default=5,
+                        help='요청 하나당 최대 시도 횟수 (기본값: 5)')
+    common.add_argument('--connect-timeout', type=float, default=60,
+                        help='연결 타임아웃 초 (기본값: 60)')
+    common.add_argument('--read-timeout', type=float, default=60,
+                        help='읽기 타임아웃 초 (기본값: 60)')
+    common.add_argument('--retry-failed', type=int, default=1,
+                        help='전송이 끝난 뒤 실패한 파일만 다시 시도할 횟수 (기본값: 1)')
+    common.add_argument('-v', '--verbose', action='store_true',
+                        help='전송한 파일마다 한 줄씩 출력')
+    common.add_argument('--progress-interval', type=float, default=PROGRESS_INTERVAL,
+                        help='진행 상황(files/s, MB/s, ETA) 갱신 간격 초, 0이면 표시 안 함 (기본값: 1)')
+    
+    # 이어하기(체크포인트 저널) 인자
+    journal_args = argparse.ArgumentParser(add_help=False)
+    journal_args.add_argument('--resume', action='store_true',
+                              help='체크포인트 저널을 기록하고, 중단된 작업이면 이어서 진행')
+    journal_args.add_argument('--output-dir', default='transfer_results',
+                              help='저널 저장 디렉토리 (기본값: transfer_results)')
+    
+    # 멀티파트 전송 설정 인자
+    transfer_args = argparse.ArgumentParser(add_help=False)
+    transfer_args.add_argument('--transfer-profile', choices=list(TRANSFER_PROFILES), default='default',
+                               help='멀티파트 전송 프로필 (기본값: default)')
+    transfer_args.add_argument('--multipart-threshold', type=parse_size,
+                               help='멀티파트 전송 기준 크기 (예: 64MB)')
+    transfer_args.add_argument('--multipart-chunksize', type=parse_size,
+                               help='멀티파트 파트 크기 (예: 64MB)')
+    transfer_args.add_argument('--max-concurrency', type=int,
+                               help='파일 하나당 동시 파트 전송 수')
+    transfer_args.add_argument('--max-io-queue', type=int,
+                               help='다운로드 시 디스크 쓰기 대기 큐 크기')
+    transfer_args.add_argument('--adaptive-chunksize', action='store_true',
+                               help='파일 크기에 따라 파트 크기 자동 선택')
+    transfer_args.add_argument('--metrics-json',
+                               help='객체별 전송 지표와 요약을 저장할 JSON 파일')
+    transfer_args.add_argument('--prometheus-textfile',
+                               help='Prometheus node_exporter textfile 형식 지표 파일 (.prom)')
+    transfer_args.add_argument('--ranged-threshold', type=parse_size, default=DEFAULT_RANGED_THRESHOLD,
+                               help='이 크기 이상 객체는 범위 분할 병렬 다운로드 (기본값: 1GB, 0이면 사용 안 함)')
+    
+    # 중복 제거 인자 (업로드하는 명령어)
+    dedup_args = argparse.ArgumentParser(add_help=False)
+    dedup_args.add_argument('--dedup-index',
+                            help='중복 제거 인덱스(SQLite) 경로. 같은 내용이 이미 업로드되어 있으면 서버 측 복사')
+    dedup_args.add_argument('--dedup-min-size', type=parse_size, default=DEFAULT_DEDUP_MIN_SIZE,
+                            help='이보다 작은 파일은 중복 확인 없이 업로드 (기본값: 1MB)')
+    
+    # 여러 호스트로 나눠 전송하는 샤드 인자 (upload/download/sync)
+    shard_args = argparse.ArgumentParser(add_help=False)
+    shard_args.add_argument('--shard-index', type=int, default=0,
+                            help='이 호스트가 맡을 샤드 번호 (0부터, 기본값: 0)')
+    shard_args.add_argument('--shard-count', type=int, default=1,
+                            help='전체 샤드 수. 키 해시로 나눠 이 호스트 몫만 전송 (기본값: 1)')
+    shard_args.add_argument('--report',
+                            help='merge-reports로 합칠 결과 파일 '
+                                 '(샤드를 나누면 기본값: {output-dir}/report_<명령>_shardNNNofMMM.json)')
+    
+    # 목록 정보로 객체를 고르는 필터 인자 (다운로드/목록 조회)
+    filter_args = argparse.ArgumentParser(add_help=False)
+    filter_args.add_argument('--include', action='append',
+                             help='받을 상대 경로 glob (여러 번 지정 가능, *는 /도 포함. 예: "*/manifests/*.json")')
+    filter_args.add_argument('--exclude', action='append',
+                             help='제외할 상대 경로 glob (여러 번 지정 가능)')
+    filter_args.add_argument('--ext', help='받을 확장자, 쉼표로 구분 (예: json,jsonl)')
+    filter_args.add_argument('--min-size', type=parse_size, help='이보다 작은 객체 제외 (예: 1KB)')
+    filter_args.add_argument('--max-size', type=parse_size, help='이보다 큰 객체 제외 (예: 100MB)')
+    filter_args.add_argument('--modified-after', type=parse_datetime,
+                             help='이 시각 이후 수정된 객체만 (예: 2025-01-01, 시간대 없으면 로컬 시간)')
+    filter_args.add_argument('--modified-before', type=parse_datetime,
+                             help='이 시각 이전에 수정된 객체만 (예: 2025-02-01T00:00)')
+    
+    # 압축 업로드 인자
+    compress_args = argparse.ArgumentParser(add_help=False)
+    compress_args.add_argument('--compress', choices=COMPRESSION_CODECS,
+                               help='조건에 맞는 파일을 압축해서 업로드 (Content-Encoding 설정, 다운로드 시 자동 해제)')
+    compress_args.add_argument('--compress-ext', default=DEFAULT_COMPRESS_EXTENSIONS,
+                               help='압축할 확장자, 쉼표로 구분 (기본값: .json,.jsonl, 빈 문자열이면 모든 파일)')
+    compress_args.add_argument('--compress-min-size', type=parse_size, default=DEFAULT_COMPRESS_MIN_SIZE,
+                               help='이보다 작은 파일은 압축하지 않음 (기본값: 4KB)')
     
     # upload 명령어
-    upload_parser = subparsers.add_parser('upload', parents=[common], help='파일/폴더 업로드')
-    upload_parser.add_argument('--local-path', required=True, help='로컬 경로')
+    upload_parser = subparsers.add_parser('upload', parents=[common, journal_args, transfer_args, dedup_args, compress_args, shard_args], help='파일/폴더 업로드')
+    upload_parser.add_argument('--local-path', required=True, help='로컬 경로 (-이면 표준 입력을 --s3-path 키로 업로드)')
     upload_parser.add_argument('--s3-path', required=True, help='S3 경로')
     upload_parser.add_argument('--folders', nargs='+', help='선택적 업로드할 폴더명')
+    upload_parser.add_argument('--pack-small-files', action='store_true',
+                               help='작은 파일을 tar 샤드로 묶어서 업로드')
+    upload_parser.add_argument('--pack-threshold', type=parse_size, default=DEFAULT_PACK_THRESHOLD,
+                               help='이 크기보다 작은 파일을 묶음 (기본값: 64KB)')
+    upload_parser.add_argument('--shard-size', type=parse_size, default=DEFAULT_SHARD_SIZE,
+                               help='tar 샤드 하나의 최대 크기 (기본값: 64MB)')
+    upload_parser.add_argument('--order', choices=PLAN_ORDERS, default='scan',
+                               help='전송 순서: scan(경로순), largest(큰 파일부터), smallest(작은 파일부터)')
+    upload_parser.add_argument('--plan-file',
+                               help='전송 계획을 저장할 파일 (execute-plan으로 나중에 실행)')
+    upload_parser.add_argument('--verify', action='store_true',
+                               help='업로드 후 로컬에서 계산한 ETag(멀티파트 포함)와 S3 ETag 비교')
+    
+    # execute-plan 명령어
+    plan_parser = subparsers.add_parser('execute-plan', parents=[common, journal_args, transfer_args, dedup_args, compress_args],
+                                        help='저장된 전송 계획 실행')
+    plan_parser.add_argument('--plan', required=True, help='upload --plan-file로 저장한 계획 파일')
+    plan_parser.add_argument('--order', choices=PLAN_ORDERS,
+                             help='계획의 전송 순서 대신 사용할 순서')
+    plan_parser.add_argument('--shard-size', type=parse_size, default=DEFAULT_SHARD_SIZE,
+                             help='tar 샤드 하나의 최대 크기 (기본값: 64MB)')
+    plan_parser.add_argument('--verify', action='store_true',
+                             help='업로드 후 ETag 검증')
+    
+    # verify 명령어
+    verify_parser = subparsers.add_parser('verify', parents=[common, transfer_args],
+                                          help='로컬 파일과 S3 객체의 ETag 비교 (업로드 때와 같은 전송 설정 사용)')
+    verify_parser.add_argument('--local-path', required=True, help='로컬 경로')
+    verify_parser.add_argument('--s3-path', required=True, help='S3 경로')
+    
+    # copy / move 명령어
+    for command, help_text in (('copy', 'S3 안에서 서버 측 복사'), ('move', 'S3 안에서 서버 측 이동 (복사 후 원본 삭제)')):
+        copy_parser = subparsers.add_parser(command, parents=[common, transfer_args], help=help_text)
+        copy_parser.add_argument('--s3-path', required=True, help='원본 S3 경로')
+        copy_parser.add_argument('--dest-path', required=True, help='대상 S3 경로')
+    
+    # delete 명령어
+    delete_parser = subparsers.add_parser('delete', parents=[common], help='S3 경로 아래 객체 일괄 삭제')
+    delete_parser.add_argument('--s3-path', required=True, help='삭제할 S3 경로')
     
     # download 명령어
-    download_parser = subparsers.add_parser('download', parents=[common], help='파일/폴더 다운로드')
+    download_parser = subparsers.add_parser('download', parents=[common, journal_args, transfer_args, filter_args, shard_args], help='파일/폴더 다운로드')
     download_parser.add_argument('--s3-path', required=True, help='S3 경로')
-    download_parser.add_argument('--local-path', required=True, help='로컬 저장 경로')
+    download_parser.add_argument('--local-path', required=True,
+                                 help='로컬 저장 경로 (-이면 객체/프리픽스 내용을 표준 출력으로)')
+    download_parser.add_argument('--no-unpack', action='store_true',
+                                 help='tar 샤드를 풀지 않고 그대로 다운로드')
+    
+    # sync 명령어
+    sync_parser = subparsers.add_parser('sync', parents=[common, journal_args, transfer_args, dedup_args, compress_args, shard_args], help='변경된 파일만 증분 동기화')
+    sync_parser.add_argument('--local-path', required=True, help='로컬 경로')
+    sync_parser.add_argument('--s3-path', required=True, help='S3 경로')
+    sync_parser.add_argument('--direction', choices=['upload', 'download'], default='upload',
+                             help='동기화 방향 (기본값: upload)')
+    sync_parser.add_argument('--checksum', action='store_true',
+                             help='크기가 같으면 수정 시각 대신 MD5/ETag로 비교')
+    sync_parser.add_argument('--delete', action='store_true',
+                             help='로컬에 없는 S3 객체 삭제 (upload 방향 미러링, 전송 실패 시 삭제 안 함)')
+    
+    # watch 명령어
+    watch_parser = subparsers.add_parser('watch', parents=[common, transfer_args, dedup_args, compress_args],
+                                         help='폴더를 감시하며 쓰기가 끝난 파일을 계속 업로드')
+    watch_parser.add_argument('--local-path', required=True, help='감시할 로컬 폴더')
+    watch_parser.add_argument('--s3-path', required=True, help='S3 경로')
+    watch_parser.add_argument('--debounce', type=float, default=DEFAULT_WATCH_DEBOUNCE,
+                              help='마지막 파일이 들어온 뒤 업로드를 시작하기까지 기다릴 초 (기본값: 2)')
+    watch_parser.add_argument('--polling', action='store_true',
+                              help='inotify 대신 주기적으로 폴더를 탐색 (NFS 등 inotify가 동작하지 않는 경우)')
+    watch_parser.add_argument('--poll-interval', type=float, default=DEFAULT_WATCH_POLL_INTERVAL,
+                              help='주기적 탐색 간격 초 (기본값: 5)')
+    watch_parser.add_argument('--state-file',
+                              help='high-water mark 상태 파일 (기본값: {output-dir}/watch_<작업ID>.json)')
+    watch_parser.add_argument('--output-dir', default='transfer_results',
+                              help='상태 파일 저장 디렉토리 (기본값: transfer_results)')
+    
+    # merge-reports 명령어
+    merge_parser = subparsers.add_parser('merge-reports', help='샤드별 결과 파일(--report)을 합쳐서 출력')
+    merge_parser.add_argument('reports', nargs='+', help='샤드별 결과 파일')
+    merge_parser.add_argument('--output', help='합친 결과를 저장할 JSON 파일')
     
     # list 명령어
-    list_parser = subparsers.add_parser('list', parents=[common], help='S3 객체 목록')
+    list_parser = subparsers.add_parser('list', parents=[common, filter_args], help='S3 객체 목록')
     list_parser.add_argument('--s3-path', default='', help='S3 경로')
     list_parser.add_argument('--recursive', action='store_true', help='재귀적으로 모든 파일 출력')
+    list_parser.add_argument('--format', choices=['text', 'jsonl', 'csv'], default='text',
+                             help='출력 형식 (기본값: text)')
+    list_parser.add_argument('--output', help='jsonl/csv 결과 파일 (기본값: 표준 출력)')
     
     args = parser.parse_args()
     
@@ -522,41 +5518,28 @@ def main():
         parser.print_help()
         return
     
+    if getattr(args, 'shard_count', 1) > 1:
+        if not 0 <= args.shard_index < args.shard_count:
+            parser.error(f"--shard-index는 0 ~ {args.shard_count - 1} 사이여야 합니다")
+        if args.local_path == '-':
+            parser.error("--shard-count는 표준 입력/출력 스트림 전송과 함께 쓸 수 없습니다")
+        if getattr(args, 'pack_small_files', False):
+            # 호스트마다 같은 이름(shard-00000.tar, index.json)의 샤드를 만들게 되므로
+            parser.error("--shard-count와 --pack-small-files는 함께 쓸 수 없습니다")
+    
+    if getattr(args, 'compress', None) == 'zstd' and zstandard is None:
+        parser.error("--compress zstd에는 zstandard 패키지가 필요합니다 (pip install zstandard)")
+    
+    # 기계 판독용 목록이나 객체 내용을 표준 출력으로 내보낼 때는 안내 메시지를 stderr로 보냄
+    data_stream = sys.stdout
+    log_to_stderr = (
+        (args.command == 'list' and args.format != 'text' and not args.output)
+        or (args.command == 'download' and args.local_path == '-')
+    )
+    
     try:
-        # S3 클라이언트 생성
-        transfer = S3FileTransfer(
-            endpoint_url=args.endpoint_url,
-            region=args.region,
-            bucket_name=args.bucket
-        )
-        
-        # 명령어 실행
-        if args.command == 'upload':
-            if args.folders:
-                # 선택적 폴더 업로드
-                transfer.upload_specific_folders(
-                    args.local_path,
-                    args.folders,
-                    args.s3_path,
-                    args.dry_run
-                )
-            else:
-                # 전체 폴더 업로드
-                transfer.upload_folder(
-                    args.local_path,
-                    args.s3_path,
-                    args.dry_run
-                )
-        
-        elif args.command == 'download':
-            transfer.download_folder(
-                args.s3_path,
-                args.local_path,
-                args.dry_run
-            )
-        
-        elif args.command == 'list':
-            transfer.list_objects(args.s3_path, args.recursive)
+        with contextlib.redirect_stdout(sys.stderr) if log_to_stderr else contextlib.nullcontext():
+            run_command(args, data_stream)
     
     except ValueError as e:
         print(f"❌ 설정 오류: {e}")